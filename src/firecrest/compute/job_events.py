@@ -0,0 +1,177 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+import json
+import logging
+import time
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from lib.scheduler_clients.scheduler_base_client import SchedulerBaseClient
+
+
+logger = logging.getLogger(__name__)
+
+# Events pending per subscriber, slower subscribers are dropped
+EVENTS_QUEUE_SIZE = 100
+
+
+class JobEventsPoller:
+    """Polls the jobs of a user and publishes their state transitions.
+
+    One poller runs per system and user, whatever the number of open event
+    streams. It is started by the first subscriber and stopped when the last
+    one leaves. The first poll only records the current states.
+    """
+
+    pollers: Dict[Tuple[str, str], "JobEventsPoller"] = {}
+
+    @classmethod
+    def subscribe(
+        cls,
+        system_name: str,
+        username: str,
+        jwt_token: str,
+        scheduler_client: SchedulerBaseClient,
+        interval: float,
+    ) -> asyncio.Queue:
+        key = (system_name, username)
+        poller = cls.pollers.get(key)
+        if poller is None:
+            poller = JobEventsPoller(system_name, username, scheduler_client, interval)
+            cls.pollers[key] = poller
+        # Polls are done with the most recent token of the user
+        poller.jwt_token = jwt_token
+        queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        poller.subscribers.add(queue)
+        poller.start()
+        return queue
+
+    @classmethod
+    def unsubscribe(cls, system_name: str, username: str, queue: asyncio.Queue):
+        key = (system_name, username)
+        poller = cls.pollers.get(key)
+        if poller is None:
+            return
+        poller.subscribers.discard(queue)
+        if not poller.subscribers:
+            poller.stop()
+            del cls.pollers[key]
+
+    @classmethod
+    def stop_pollers(cls):
+        for poller in cls.pollers.values():
+            poller.stop()
+        cls.pollers.clear()
+
+    def __init__(
+        self,
+        system_name: str,
+        username: str,
+        scheduler_client: SchedulerBaseClient,
+        interval: float,
+    ):
+        self.system_name = system_name
+        self.username = username
+        self.scheduler_client = scheduler_client
+        self.interval = interval
+        self.jwt_token: Optional[str] = None
+        self.subscribers: Set[asyncio.Queue] = set()
+        # Job state by job id, None before the first poll
+        self.states: Optional[Dict[int, str]] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self):
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.warning(
+                    f"Unable to poll the jobs of {self.username} on "
+                    f"{self.system_name}: {e}"
+                )
+                self.publish({"event": "error", "data": {"message": str(e)}})
+            await asyncio.sleep(self.interval)
+
+    async def poll(self):
+        jobs = await self.scheduler_client.get_jobs(
+            username=self.username, jwt_token=self.jwt_token
+        )
+        states = {job.job_id: job.status.state for job in jobs or []}
+        if self.states is not None:
+            for event in self.transitions(self.states, states):
+                self.publish({"event": "job", "data": event})
+        self.states = states
+
+    def transitions(
+        self, previous: Dict[int, str], current: Dict[int, str]
+    ) -> List[dict]:
+        # Jobs that left the accounting window are not reported
+        now = int(time.time())
+        return [
+            {
+                "jobId": job_id,
+                "state": state,
+                "previousState": previous.get(job_id),
+                "time": now,
+            }
+            for job_id, state in current.items()
+            if previous.get(job_id) != state
+        ]
+
+    def publish(self, event: dict):
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # The oldest event makes room for the end of stream marker
+                self.subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+
+
+def format_event(event: dict) -> str:
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+async def stream_events(
+    queue: asyncio.Queue, expires_at: Optional[float], keepalive: float
+) -> AsyncIterator[str]:
+    # The stream ends when the access token expires, so that clients
+    # reconnect with a new one, or when the subscriber has been dropped
+    while True:
+        timeout = keepalive
+        if expires_at is not None:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                yield format_event(
+                    {"event": "expired", "data": {"message": "Access token expired"}}
+                )
+                return
+            timeout = min(timeout, remaining)
+        try:
+            event = await asyncio.wait_for(queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            # Keeps idle connections open through proxies
+            yield ": keepalive\n\n"
+            continue
+        if event is None:
+            yield format_event(
+                {
+                    "event": "error",
+                    "data": {"message": "Events not consumed fast enough"},
+                }
+            )
+            return
+        yield format_event(event)
@@ -3,8 +3,8 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
-from typing import List, Optional
-from pydantic import Field
+from typing import Annotated, List, Optional
+from pydantic import Field, StringConstraints
 
 # models
 from lib.models import CamelModel
@@ -58,6 +58,10 @@ class PostJobSubmitRequest(JobSubmitRequestModel):
 
 class GetJobResponse(CamelModel):
     jobs: Optional[List[JobModel]] = None
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor of the next page, `null` when the listing is complete",
+    )
 
 
 class GetJobMetadataResponse(CamelModel):
@@ -75,3 +79,36 @@ class PostJobAttachRequest(CamelModel):
             "examples": [{"command": "echo 'Attached with success' > $HOME/attach.out"}]
         }
     }
+
+
+class PostJobSubmitBatchRequest(JobSubmitRequestModel):
+    jobs: List[JobDescriptionModel] = Field(
+        ..., min_length=1, max_length=1000, description="Jobs to submit"
+    )
+
+
+class JobBatchResult(CamelModel):
+    job_id: Optional[int] = Field(
+        default=None, description="Id of the submitted or cancelled job"
+    )
+    status_code: int = Field(..., description="HTTP status code of the operation")
+    error: Optional[str] = Field(default=None, description="Error message")
+
+
+class PostJobSubmitBatchResponse(CamelModel):
+    results: List[JobBatchResult] = Field(
+        ..., description="Result of every job, in the order of the request"
+    )
+
+
+class DeleteJobBatchRequest(CamelModel):
+    job_ids: List[Annotated[str, StringConstraints(pattern=r"^[0-9]+$")]] = Field(
+        ..., min_length=1, max_length=1000, description="Ids of the jobs to cancel"
+    )
+    model_config = {"json_schema_extra": {"examples": [{"jobIds": ["1", "2"]}]}}
+
+
+class DeleteJobBatchResponse(CamelModel):
+    results: List[JobBatchResult] = Field(
+        ..., description="Result of every job, in the order of the request"
+    )
@@ -4,31 +4,48 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from fastapi import status, Path, HTTPException, Depends, Query
-from typing import Any, Annotated
+from fastapi.responses import StreamingResponse
+from typing import Any, Annotated, List
+from pydantic import StringConstraints
 
 # helpers
 from lib.helpers.api_auth_helper import ApiAuthHelper
+from lib.models.apis.api_response_model import ApiResponseError
 
 
 from lib.helpers.router_helper import create_router
 
 # dependencies
+from firecrest.config import HPCCluster, HealthCheckType
 from firecrest.dependencies import (
     APIAuthDependency,
     SchedulerClientDependency,
+    ServiceAvailabilityDependency,
 )
+from firecrest.compute.job_events import JobEventsPoller, stream_events
 
 
 # clients
+from lib.scheduler_clients.models import JobFilters
 from lib.scheduler_clients.scheduler_base_client import SchedulerBaseClient
 from firecrest.compute.models import (
+    DeleteJobBatchRequest,
+    DeleteJobBatchResponse,
     GetJobMetadataResponse,
+    PostJobSubmitBatchRequest,
+    PostJobSubmitBatchResponse,
     PostJobAttachRequest,
     PostJobSubmissionResponse,
     GetJobResponse,
     PostJobSubmitRequest,
 )
 
+# Partition, job name and account filters are passed quoted to the scheduler
+FILTER_PATTERN = r"^[a-zA-Z0-9_.+-]+$"
+
+# Seconds between keepalive comments of idle event streams
+EVENTS_KEEPALIVE = 15
+
 router = create_router(
     prefix="/compute/{system_name}/jobs",
     tags=["compute"],
@@ -66,6 +83,85 @@ async def post_job_submit(
     return {"jobId": job_id}
 
 
+@router.post(
+    ":batch",
+    description=(
+        "Submit many jobs. Jobs are submitted concurrently (with bounded "
+        "concurrency) over the same connection, and the result of every job "
+        "is reported in the order of the request."
+    ),
+    status_code=status.HTTP_200_OK,
+    response_model=PostJobSubmitBatchResponse,
+    response_description="Jobs submission results",
+)
+async def post_job_submit_batch(
+    job_requests: PostJobSubmitBatchRequest,
+    scheduler_client: Annotated[
+        SchedulerBaseClient,
+        Path(alias="system_name", description="Target system"),
+        Depends(SchedulerClientDependency()),
+    ],
+) -> Any:
+    username = ApiAuthHelper.get_auth().username
+    access_token = ApiAuthHelper.get_access_token()
+    job_ids = await scheduler_client.submit_jobs(
+        job_descriptions=job_requests.jobs,
+        username=username,
+        jwt_token=access_token,
+    )
+    results = []
+    for job_id in job_ids:
+        if job_id is None:
+            job_id = HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Unable to submit new job",
+            )
+        results.append(_batch_result(job_id, status.HTTP_201_CREATED))
+    return {"results": results}
+
+
+@router.delete(
+    ":batch",
+    description=(
+        "Cancel many jobs, with a single scheduler command where the scheduler "
+        "allows it. The result of every job is reported in the order of the "
+        "request."
+    ),
+    status_code=status.HTTP_200_OK,
+    response_model=DeleteJobBatchResponse,
+    response_description="Jobs cancellation results",
+)
+async def delete_job_cancel_batch(
+    cancel_request: DeleteJobBatchRequest,
+    scheduler_client: Annotated[
+        SchedulerBaseClient,
+        Path(alias="system_name", description="Target system"),
+        Depends(SchedulerClientDependency()),
+    ],
+) -> Any:
+    username = ApiAuthHelper.get_auth().username
+    access_token = ApiAuthHelper.get_access_token()
+    cancelled = await scheduler_client.cancel_jobs(
+        job_ids=cancel_request.job_ids,
+        username=username,
+        jwt_token=access_token,
+    )
+    results = []
+    for job_id, result in zip(cancel_request.job_ids, cancelled, strict=True):
+        batch_result = _batch_result(result, status.HTTP_204_NO_CONTENT)
+        batch_result["job_id"] = job_id
+        results.append(batch_result)
+    return {"results": results}
+
+
+def _batch_result(result: Any, success_status_code: int) -> dict:
+    if isinstance(result, Exception):
+        # Same status code and message as the error of a single operation
+        error, status_code = ApiResponseError.build_http_error_from_exception(result)
+        return {"job_id": None, "status_code": status_code, "error": error.message}
+    return {"job_id": result, "status_code": success_status_code, "error": None}
+
+
 @router.get(
     "",
     description="Get status of all jobs",
@@ -79,16 +175,144 @@ async def get_jobs(
         Path(alias="system_name", description="Target system"),
         Depends(SchedulerClientDependency()),
     ],
-    allusers: Annotated[bool, Query(description="If set to `true` returns all jobs visible by the current user, otherwise only the current user owned jobs")] = False
+    allusers: Annotated[bool, Query(description="If set to `true` returns all jobs visible by the current user, otherwise only the current user owned jobs")] = False,
+    state: Annotated[
+        List[Annotated[str, StringConstraints(pattern=r"^[a-zA-Z_]+$")]],
+        Query(
+            description=(
+                "Only jobs in these states, as reported in `status.state` "
+                "(e.g. `RUNNING` for Slurm, `R` for PBS). Without `startTime`, "
+                "Slurm only matches the jobs currently in these states."
+            ),
+        ),
+    ] = None,
+    start_time: Annotated[
+        int,
+        Query(
+            alias="startTime",
+            ge=0,
+            description="Only jobs active after this time (Unix timestamp)",
+        ),
+    ] = None,
+    end_time: Annotated[
+        int,
+        Query(
+            alias="endTime",
+            ge=0,
+            description="Only jobs active before this time (Unix timestamp)",
+        ),
+    ] = None,
+    partition: Annotated[
+        str, Query(pattern=FILTER_PATTERN, description="Only jobs in this partition")
+    ] = None,
+    name: Annotated[
+        str, Query(pattern=FILTER_PATTERN, description="Only jobs with this name")
+    ] = None,
+    account: Annotated[
+        str, Query(pattern=FILTER_PATTERN, description="Only jobs of this account")
+    ] = None,
+    limit: Annotated[
+        int,
+        Query(
+            ge=1,
+            description=(
+                "Maximum number of jobs to return. When set (or when `cursor` is "
+                "set), jobs are sorted by descending job id."
+            ),
+        ),
+    ] = None,
+    cursor: Annotated[
+        str,
+        Query(
+            pattern=r"^\d+$",
+            description="The `nextCursor` returned by the previous page",
+        ),
+    ] = None,
 ) -> Any:
     username = ApiAuthHelper.get_auth().username
     access_token = ApiAuthHelper.get_access_token()
+    filters = None
+    if any(
+        value is not None
+        for value in [state, start_time, end_time, partition, name, account]
+    ):
+        filters = JobFilters(
+            states=tuple(state) if state else None,
+            start_time=start_time,
+            end_time=end_time,
+            partition=partition,
+            name=name,
+            account=account,
+        )
+    # Pages are cut from the (coalesced) listing, so that following pages
+    # requested shortly after are served without querying the scheduler again
     jobs = await scheduler_client.get_jobs(
         username=username,
         jwt_token=access_token,
-        allusers=allusers
+        allusers=allusers,
+        filters=filters,
+    )
+    if jobs is None or (limit is None and cursor is None):
+        return {"jobs": jobs}
+
+    jobs = sorted(jobs, key=lambda job: job.job_id, reverse=True)
+    if cursor is not None:
+        jobs = [job for job in jobs if job.job_id < int(cursor)]
+    next_cursor = None
+    if limit is not None and len(jobs) > limit:
+        jobs = jobs[:limit]
+        next_cursor = str(jobs[-1].job_id)
+    return {"jobs": jobs, "next_cursor": next_cursor}
+
+
+@router.get(
+    "/events",
+    description=(
+        "Stream the state transitions of the current user jobs as server-sent "
+        "events. Jobs are polled once per user every `scheduler.eventsInterval` "
+        "seconds, whatever the number of open streams. The stream ends with an "
+        "`expired` event when the access token expires, clients reconnect with "
+        "a new one."
+    ),
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    response_description="Stream of `job` events (`jobId`, `state`, `previousState`, `time`)",
+)
+async def get_job_events(
+    scheduler_client: Annotated[
+        SchedulerBaseClient,
+        Path(alias="system_name", description="Target system"),
+        Depends(SchedulerClientDependency()),
+    ],
+    system: HPCCluster = Depends(
+        ServiceAvailabilityDependency(service_type=HealthCheckType.scheduler),
+        use_cache=False,
+    ),
+) -> StreamingResponse:
+    username = ApiAuthHelper.get_auth().username
+    access_token = ApiAuthHelper.get_access_token()
+    queue = JobEventsPoller.subscribe(
+        system.name,
+        username,
+        access_token,
+        scheduler_client,
+        system.scheduler.events_interval,
+    )
+
+    expires_at = ApiAuthHelper.get_auth().expires_at
+
+    async def events():
+        try:
+            async for event in stream_events(queue, expires_at, EVENTS_KEEPALIVE):
+                yield event
+        finally:
+            JobEventsPoller.unsubscribe(system.name, username, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return {"jobs": jobs}
 
 
 @router.get(
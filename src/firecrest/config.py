@@ -53,6 +53,15 @@ class MultipartUpload(BaseModel):
         "tmp",
         description="Temporary folder used for storing split parts during upload.",
     )
+    max_part_urls: Optional[int] = Field(
+        None,
+        description=(
+            "Maximum number of part upload URLs returned when an upload is "
+            "created. The other URLs are requested page by page from "
+            "`GET /filesystem/{system}/transfer/upload/parts`. By default all "
+            "the URLs are returned."
+        ),
+    )
 
 
 class BucketLifecycleConfiguration(BaseModel):
@@ -83,6 +92,13 @@ class SchedulerType(str, Enum):
     pbs = "pbs"
 
 
+class FileSystemEngine(str, Enum):
+    """Engines executing the filesystem operations on a cluster."""
+
+    cli = "cli"
+    sftp = "sftp"
+
+
 class FileSystemDataType(str, Enum):
     """Data types for cluster file systems."""
 
@@ -104,6 +120,21 @@ class Scheduler(CamelModel):
     timeout: Optional[int] = Field(
         10, description="Timeout in seconds for scheduler communication with the API."
     )
+    coalescing_max_age: float = Field(
+        2,
+        description=(
+            "Time in seconds the result of a job or status query is shared "
+            "with identical queries of the same user. With `0` only concurrent "
+            "queries are coalesced."
+        ),
+    )
+    events_interval: int = Field(
+        10,
+        description=(
+            "Interval in seconds between the polls of the jobs of a user with "
+            "an open `GET /compute/{system}/jobs/events` stream."
+        ),
+    )
 
     model_config = ConfigDict(use_enum_values=True)
 
@@ -190,6 +221,25 @@ class Probing(CamelModel):
     timeout: int = Field(..., description="Maximum time in seconds allowed per check.")
 
 
+class StatusSnapshots(CamelModel):
+    """Shared snapshots of the nodes, partitions and reservations of a cluster."""
+
+    interval: int = Field(
+        60,
+        description=(
+            "Interval in seconds between refreshes of the snapshots, done "
+            "with the service account."
+        ),
+    )
+    max_age: int = Field(
+        300,
+        description=(
+            "Maximum age in seconds of a snapshot. Older snapshots are not "
+            "served and requests query the scheduler directly."
+        ),
+    )
+
+
 class Storage(BaseModel):
     """Object storage configuration, including credentials, endpoints, and upload behavior."""
 
@@ -231,6 +281,20 @@ class Storage(BaseModel):
     probing: Optional[Probing] = Field(
         None, description="Configuration for probing storage availability."
     )
+    max_pool_connections: int = Field(
+        50,
+        description=(
+            "Maximum number of connections kept open to each storage endpoint. "
+            "The connections are shared by all the requests."
+        ),
+    )
+    keepalive_timeout: int = Field(
+        12,
+        description=(
+            "Time (in seconds) an idle connection to the storage is kept open "
+            "for reuse."
+        ),
+    )
     servicesHealth: Optional[List[S3ServiceHealth]] = Field(
         None,
         description="Optional health information for different services in the cluster.",
@@ -265,6 +329,13 @@ class SSHTimeouts(CamelModel):
     keep_alive: int = Field(
         5, description="Interval (seconds) for sending keep-alive messages."
     )
+    queue: int = Field(
+        5,
+        description=(
+            "Max time (seconds) a request waits for a free SSH channel when "
+            "all the user's connections are saturated."
+        ),
+    )
 
 
 class SSHClientPool(CamelModel):
@@ -279,6 +350,16 @@ class SSHClientPool(CamelModel):
     max_clients: int = Field(
         100, description="Maximum number of concurrent SSH clients."
     )
+    max_clients_per_user: int = Field(
+        4, description="Maximum number of concurrent SSH clients for a single user."
+    )
+    max_channels_per_client: int = Field(
+        10,
+        description=(
+            "Maximum number of concurrent channels (commands) on a single SSH "
+            "client. It should not exceed the `MaxSessions` setting of sshd."
+        ),
+    )
     timeout: SSHTimeouts = Field(
         default_factory=SSHTimeouts, description="SSH timeout settings."
     )
@@ -321,6 +402,25 @@ class HPCCluster(CamelModel):
         default_factory=list,
         description="Custom scheduler flags passed to data transfer jobs (e.g. `-pxfer` for a dedicated partition).",
     )
+    status_snapshots: Optional[StatusSnapshots] = Field(
+        None,
+        description=(
+            "When set, the nodes, partitions and reservations of the cluster "
+            "are served from snapshots refreshed in background, instead of "
+            "querying the scheduler as the calling user. Note that the "
+            "snapshots show what the service account can see."
+        ),
+    )
+    file_system_engine: FileSystemEngine = Field(
+        FileSystemEngine.cli,
+        description=(
+            "Engine used for the filesystem operations: `cli` runs the "
+            "command line utilities over SSH, `sftp` uses the SFTP subsystem "
+            "of the SSH server when the operation supports it. Note that over "
+            "SFTP user and group names are reported as numeric IDs when the "
+            "server doesn't provide them."
+        ),
+    )
 
 
 class OpenFGA(CamelModel):
@@ -335,6 +435,17 @@ class OpenFGA(CamelModel):
         100,
         description="Max HTTP connections per host. When set to `0`, there is no limit.",
     )
+    cache_ttl: int = Field(
+        60,
+        description=(
+            "Time (seconds) a granted access to a system is cached for a user. "
+            "When set to `0`, every request is authorized by OpenFGA."
+        ),
+    )
+    negative_cache_ttl: int = Field(
+        10,
+        description="Time (seconds) a denied access to a system is cached for a user.",
+    )
 
 
 class SSHKeysService(CamelModel):
@@ -4,14 +4,21 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import asyncio
+from contextlib import AsyncExitStack
+from typing import Dict, List
 from enum import Enum
 from fastapi import Request, status, HTTPException
+from aiobotocore.client import AioBaseClient
 from aiobotocore.config import AioConfig
 from aiobotocore.session import get_session
+from botocore.client import BaseClient
+from botocore.config import Config
 from botocore.handlers import validate_bucket_name
+from botocore.session import get_session as get_sync_session
 
 # extensions
 from firecrest.config import (
+    FileSystemEngine,
     HPCCluster,
     HealthCheckType,
     SSHKeysService,
@@ -30,6 +37,9 @@ from lib.dependencies import AuthDependency
 # clients
 from lib.ssh_clients.ssh_client import SSHClientPool
 from lib.helpers.api_auth_helper import ApiAuthHelper
+from lib.scheduler_clients.coalescing_scheduler_client import (
+    CoalescingSchedulerClient,
+)
 from lib.scheduler_clients.pbs.pbs_client import PbsClient
 from lib.scheduler_clients.slurm.slurm_client import SlurmClient
 from lib.ssh_clients.ssh_keygen_client import SSHKeygenClient
@@ -49,7 +59,9 @@ class APIAuthDependency(AuthDependency):
         # Init sigleton authN services
         if not hasattr(APIAuthDependency, "globalAuthN"):
             APIAuthDependency.globalAuthN = OIDCTokenAuth(
-                public_certs=settings.auth.authentication.public_certs
+                public_certs=settings.auth.authentication.public_certs,
+                min_refresh_interval=settings.auth.authentication.keys_min_refresh_interval,
+                token_cache_size=settings.auth.authentication.token_cache_size,
             )
 
         # Init sigleton authZ services
@@ -59,6 +71,8 @@ class APIAuthDependency(AuthDependency):
                     url=settings.auth.authorization.url,
                     timeout=settings.auth.authorization.timeout,
                     max_connections=settings.auth.authorization.max_connections,
+                    cache_ttl=settings.auth.authorization.cache_ttl,
+                    negative_cache_ttl=settings.auth.authorization.negative_cache_ttl,
                 )
             else:
                 APIAuthDependency.globalAuthZ = None
@@ -92,20 +106,36 @@ class ServiceAvailabilityDependency:
         self.service_type = service_type
 
     def __file_system_health(self, system: HPCCluster, request: Request):
+        paths: List[str] = None
         path: str = request.query_params.get("path")
         # if path is not defined as a query param extract it from the request body
         if path is None:
             try:
                 json = asyncio.run(request.json())
-                path = FilesystemRequestBase(**json).path
+                # batch requests list many paths, all of them must be served
+                if isinstance(json.get("paths"), list):
+                    paths = [str(path) for path in json["paths"]] or None
+                elif isinstance(json.get("operations"), list):
+                    paths = [
+                        FilesystemRequestBase(**operation).path
+                        for operation in json["operations"]
+                    ] or None
+                else:
+                    path = FilesystemRequestBase(**json).path
             except Exception:
                 pass
 
-        if path is None:
+        if path is not None:
+            paths = [path]
+        if paths is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="All filesystem requests require a path or source_path parameter.",
             )
+        for path in paths:
+            self.__file_system_path_health(system, path)
+
+    def __file_system_path_health(self, system: HPCCluster, path: str):
         service = None
         if system.servicesHealth:
             service = next(
@@ -248,6 +278,10 @@ class SSHClientDependency:
                 idle_timeout=system.ssh.timeout.idle_timeout,
                 max_clients=system.ssh.max_clients,
                 keep_alive=system.ssh.timeout.keep_alive,
+                max_clients_per_user=system.ssh.max_clients_per_user,
+                max_channels_per_client=system.ssh.max_channels_per_client,
+                queue_timeout=system.ssh.timeout.queue,
+                use_sftp=system.file_system_engine == FileSystemEngine.sftp,
             )
             SSHClientDependency.client_pools[system_name] = client_pool
             return client_pool
@@ -287,14 +321,14 @@ class SchedulerClientDependency:
         )(system_name=system_name)
         match system.scheduler.type:
             case SchedulerType.slurm:
-                return SlurmClient(
+                client = SlurmClient(
                     await self._get_ssh_client(system_name),
                     system.scheduler.version,
                     system.scheduler.api_version,
                     system.scheduler.api_url,
                     system.scheduler.timeout)
             case SchedulerType.pbs:
-                return PbsClient(
+                client = PbsClient(
                     await self._get_ssh_client(system_name),
                     system.scheduler.version,
                     system.scheduler.timeout)
@@ -303,6 +337,10 @@ class SchedulerClientDependency:
                     status_code=status.HTTP_501_NOT_IMPLEMENTED,
                     detail="The requested scheduler type is not implemented",
                 )
+        # Identical queries of concurrent requests share one scheduler call
+        return CoalescingSchedulerClient(
+            client, system_name, system.scheduler.coalescing_max_age
+        )
 
     # To allow for dependency override eq checks for class equality
     def __eq__(self, other):
@@ -321,6 +359,13 @@ class S3ClientConnectionType(str, Enum):
 
 
 class S3ClientDependency:
+    # One client (and connection pool) per endpoint, shared by all requests
+    clients: Dict[str, AioBaseClient] = {}
+    # Synchronous clients of the same endpoints, used only to sign URLs in
+    # bulk without an await per URL (signing doesn't need a connection)
+    signers: Dict[str, BaseClient] = {}
+    exit_stack: AsyncExitStack = AsyncExitStack()
+
     def __init__(
         self, connection: S3ClientConnectionType = S3ClientConnectionType.public
     ):
@@ -329,22 +374,72 @@ class S3ClientDependency:
             if connection == S3ClientConnectionType.private:
                 self.url = settings.storage.private_url.get_secret_value()
 
-    async def __call__(self):
-        async with get_session().create_client(
-            "s3",
-            region_name=settings.storage.region,
-            aws_secret_access_key=settings.storage.secret_access_key.get_secret_value(),
-            aws_access_key_id=settings.storage.access_key_id.get_secret_value(),
-            endpoint_url=self.url,
-            config=AioConfig(signature_version="s3v4"),
-        ) as client:
-            # This is required because botocore library bucket_name validation is not compliant
-            # with ceph multi tenancy bucket names
-            if settings.storage.tenant:
-                client.meta.events.unregister(
-                    "before-parameter-build.s3", validate_bucket_name
+    @staticmethod
+    def _client_args(url: str) -> dict:
+        return {
+            "region_name": settings.storage.region,
+            "aws_secret_access_key": settings.storage.secret_access_key.get_secret_value(),
+            "aws_access_key_id": settings.storage.access_key_id.get_secret_value(),
+            "endpoint_url": url,
+        }
+
+    @staticmethod
+    def _allow_tenant_buckets(client) -> None:
+        # This is required because botocore library bucket_name validation is not compliant
+        # with ceph multi tenancy bucket names
+        if settings.storage.tenant:
+            client.meta.events.unregister(
+                "before-parameter-build.s3", validate_bucket_name
+            )
+
+    @classmethod
+    async def get_s3_client(cls, url: str):
+        if url not in cls.clients:
+            client = await cls.exit_stack.enter_async_context(
+                get_session().create_client(
+                    "s3",
+                    **cls._client_args(url),
+                    config=AioConfig(
+                        signature_version="s3v4",
+                        max_pool_connections=settings.storage.max_pool_connections,
+                        connector_args={
+                            "keepalive_timeout": settings.storage.keepalive_timeout
+                        },
+                    ),
                 )
-            return client
+            )
+            cls._allow_tenant_buckets(client)
+            cls.clients[url] = client
+        return cls.clients[url]
+
+    @classmethod
+    def get_s3_signer(cls, url: str) -> BaseClient:
+        if url not in cls.signers:
+            signer = get_sync_session().create_client(
+                "s3",
+                **cls._client_args(url),
+                config=Config(signature_version="s3v4"),
+            )
+            cls._allow_tenant_buckets(signer)
+            cls.signers[url] = signer
+        return cls.signers[url]
+
+    @classmethod
+    async def open_s3_clients(cls) -> None:
+        for connection in S3ClientConnectionType:
+            url = S3ClientDependency(connection).url
+            await cls.get_s3_client(url)
+            cls.get_s3_signer(url)
+
+    @classmethod
+    async def close_s3_clients(cls) -> None:
+        await cls.exit_stack.aclose()
+        cls.exit_stack = AsyncExitStack()
+        cls.clients = {}
+        cls.signers = {}
+
+    async def __call__(self):
+        return await S3ClientDependency.get_s3_client(self.url)
 
     # To allow for dependency override eq checks for class equality
     def __eq__(self, other):
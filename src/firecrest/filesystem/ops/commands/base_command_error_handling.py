@@ -3,6 +3,16 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
+from asyncssh import (
+    SFTPError,
+    SFTPFileAlreadyExists,
+    SFTPGroupInvalid,
+    SFTPNoSuchFile,
+    SFTPNoSuchPath,
+    SFTPOwnerInvalid,
+    SFTPPermissionDenied,
+    SFTPWriteProtect,
+)
 from fastapi import HTTPException, status
 
 
@@ -58,3 +68,28 @@ class BaseCommandErrorHandling:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error_mess
         )
+
+    def sftp_error_handling(self, error: SFTPError):
+
+        error_mess = f"Remote SFTP operation failed with error code:{error.code}"
+        if error.reason:
+            error_mess += f" and error message:{error.reason}"
+
+        if isinstance(error, (SFTPNoSuchFile, SFTPNoSuchPath)):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=error_mess
+            )
+        if isinstance(error, (SFTPPermissionDenied, SFTPWriteProtect)):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail=error_mess
+            )
+        if isinstance(
+            error, (SFTPFileAlreadyExists, SFTPOwnerInvalid, SFTPGroupInvalid)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=error_mess
+            )
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error_mess
+        )
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from asyncssh import SFTPError
 from fastapi import HTTPException, status
 from firecrest.filesystem.ops.commands.base_command_error_handling import (
     BaseCommandErrorHandling,
@@ -36,3 +37,8 @@ class BaseCommandWithTimeout(BaseCommand, BaseCommandWithTimeoutErrorHandling):
     @abstractmethod
     def parse_output(self, stdout: str, stderr: str, exit_status: int):
         pass
+
+    def parse_sftp_error(self, error: SFTPError):
+        # Note: the timeout utility doesn't apply to SFTP operations, they
+        # are bounded by the SSH client execution timeout
+        self.sftp_error_handling(error)
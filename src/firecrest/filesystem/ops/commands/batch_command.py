@@ -0,0 +1,81 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+from typing import List
+
+from asyncssh import SFTPClient, SFTPError
+from fastapi import HTTPException
+
+# commands
+from firecrest.filesystem.ops.commands.base_command_with_timeout import (
+    BaseCommandWithTimeout,
+)
+from lib.ssh_clients.framed_command import FramedCommand
+from lib.ssh_clients.ssh_client import BaseCommand, BaseSFTPCommand
+
+
+class BatchCommand(FramedCommand, BaseSFTPCommand):
+    """Runs a sequence of filesystem commands in a single remote shell.
+
+    Errors are reported per command, as the status code of the
+    HTTPException raised by its parser.
+    """
+
+    def __init__(
+        self, commands: List[BaseCommandWithTimeout], continue_on_error: bool = False
+    ) -> None:
+        super().__init__(commands, continue_on_error)
+
+    def parse_output(self, stdout: str, stderr: str, exit_status: int = 0):
+        results = []
+        for command, section in zip(
+            self.commands, self.sections(stdout, stderr), strict=True
+        ):
+            if section is None:
+                # Not executed because of a previous error
+                results.append({"status_code": None, "output": None, "error": None})
+                continue
+            results.append(self.command_result(command, *section))
+        return results
+
+    def command_result(
+        self, command: BaseCommand, stdout: str, stderr: str, exit_status: int
+    ) -> dict:
+        try:
+            output = command.parse_output(stdout, stderr, exit_status)
+            return {"status_code": 200, "output": output, "error": None}
+        except HTTPException as e:
+            return {"status_code": e.status_code, "output": None, "error": e.detail}
+
+    def sftp_supported(self) -> bool:
+        return all(
+            isinstance(command, BaseSFTPCommand) and command.sftp_supported()
+            for command in self.commands
+        )
+
+    async def execute_sftp(self, sftp: SFTPClient, stdin=None):
+        # The commands share the SFTP session and are run in order
+        results = []
+        failed = False
+        for command in self.commands:
+            if failed and not self.continue_on_error:
+                results.append({"status_code": None, "output": None, "error": None})
+                continue
+            try:
+                try:
+                    output = await command.execute_sftp(sftp)
+                except SFTPError as e:
+                    command.parse_sftp_error(e)
+                results.append({"status_code": 200, "output": output, "error": None})
+            except HTTPException as e:
+                failed = True
+                results.append(
+                    {"status_code": e.status_code, "output": None, "error": e.detail}
+                )
+        return results
+
+    def parse_sftp_error(self, error: SFTPError):
+        # Errors are handled per command in execute_sftp
+        raise error
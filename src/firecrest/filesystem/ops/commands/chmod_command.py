@@ -3,14 +3,18 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
+import re
+from asyncssh import SFTPClient
+
 # commands
 from firecrest.filesystem.ops.commands.base_command_with_timeout import (
     BaseCommandWithTimeout,
 )
 from firecrest.filesystem.ops.commands.ls_base_command import LsBaseCommand
+from lib.ssh_clients.ssh_client import BaseSFTPCommand
 
 
-class ChmodCommand(BaseCommandWithTimeout):
+class ChmodCommand(BaseCommandWithTimeout, BaseSFTPCommand):
 
     def __init__(self, target_path: str = None, mode: str = None) -> None:
         self.target_path = target_path
@@ -26,3 +30,11 @@ class ChmodCommand(BaseCommandWithTimeout):
             super().error_handling(stderr, exit_status)
 
         return self.ls_command.parse_output(stdout, stderr, exit_status)
+
+    def sftp_supported(self) -> bool:
+        # Symbolic modes (e.g. `u+x`) are only supported by the chmod utility
+        return re.fullmatch(r"[0-7]{1,4}", self.mode) is not None
+
+    async def execute_sftp(self, sftp: SFTPClient, stdin=None):
+        await sftp.chmod(self.target_path, int(self.mode, base=8))
+        return await self.ls_command.execute_sftp(sftp)
@@ -3,14 +3,17 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
+from asyncssh import SFTPClient
+
 # commands
 from firecrest.filesystem.ops.commands.base_command_with_timeout import (
     BaseCommandWithTimeout,
 )
 from firecrest.filesystem.ops.commands.ls_base_command import LsBaseCommand
+from lib.ssh_clients.ssh_client import BaseSFTPCommand
 
 
-class ChownCommand(BaseCommandWithTimeout):
+class ChownCommand(BaseCommandWithTimeout, BaseSFTPCommand):
 
     def __init__(
         self, target_path: str = None, owner: str = None, group: str = None
@@ -29,3 +32,17 @@ class ChownCommand(BaseCommandWithTimeout):
             super().error_handling(stderr, exit_status)
 
         return self.ls_command.parse_output(stdout, stderr, exit_status)
+
+    def sftp_supported(self) -> bool:
+        # SFTP v3 servers only accept numeric user and group IDs, names are
+        # resolved by the chown utility
+        return all(not value or value.isdigit() for value in (self.owner, self.group))
+
+    async def execute_sftp(self, sftp: SFTPClient, stdin=None):
+        attrs = await sftp.stat(self.target_path)
+        await sftp.chown(
+            self.target_path,
+            uid=int(self.owner) if self.owner else attrs.uid,
+            gid=int(self.group) if self.group else attrs.gid,
+        )
+        return await self.ls_command.execute_sftp(sftp)
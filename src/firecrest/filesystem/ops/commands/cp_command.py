@@ -0,0 +1,47 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+from asyncssh import SFTPClient
+from fastapi import HTTPException, status
+
+from firecrest.filesystem.ops.commands.base_command_with_timeout import (
+    BaseCommandWithTimeout,
+)
+from lib.ssh_clients.ssh_client import STREAM_CHUNK_SIZE, BaseSFTPCommand
+
+
+class CpCommand(BaseCommandWithTimeout, BaseSFTPCommand):
+    # Copies the content of a file over the target. An existing target is
+    # written in place, through symbolic links, keeping its mode, owner, ACLs
+    # and hard links.
+
+    def __init__(self, source_path: str = None, target_path: str = None) -> None:
+        super().__init__()
+        self.source_path = source_path
+        self.target_path = target_path
+
+    def get_command(self) -> str:
+        return f"{super().get_command()} cp -T -- '{self.source_path}' '{self.target_path}'"
+
+    def parse_output(self, stdout: str, stderr: str, exit_status: int = 0):
+        if exit_status != 0:
+            if "cannot overwrite directory" in stderr:
+                self._directory_error()
+            super().error_handling(stderr, exit_status)
+
+    def _directory_error(self):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Target path '{self.target_path}' is a directory.",
+        )
+
+    async def execute_sftp(self, sftp: SFTPClient, stdin=None):
+        if await sftp.isdir(self.target_path):
+            self._directory_error()
+
+        async with sftp.open(self.source_path, "rb") as source:
+            async with sftp.open(self.target_path, "wb") as target:
+                while chunk := await source.read(STREAM_CHUNK_SIZE):
+                    await target.write(chunk)
@@ -0,0 +1,77 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+from asyncssh import SFTPClient
+
+from firecrest.filesystem.ops.commands.base_command_with_timeout import (
+    BaseCommandWithTimeout,
+)
+from lib.ssh_clients.ssh_client import STREAM_CHUNK_SIZE, BaseSFTPCommand
+
+
+class DdCommand(BaseCommandWithTimeout, BaseSFTPCommand):
+
+    def __init__(
+        self,
+        target_path: str | None = None,
+        offset: int = 0,
+        length: int | None = None,
+        write: bool = False,
+    ) -> None:
+        super().__init__()
+        self.target_path = target_path
+        self.offset = offset
+        self.length = length
+        self.write = write
+
+    def get_command(self) -> str:
+        # Streamed content can take longer than the utilities timeout, it's
+        # bound by the SSH client per chunk instead
+        if self.write:
+            # Note: the target file is truncated
+            return f"dd of='{self.target_path}' bs=64K status=none"
+
+        options = "iflag=skip_bytes,count_bytes bs=64K status=none "
+        if self.offset:
+            options += f"skip={self.offset} "
+        if self.length is not None:
+            options += f"count={self.length} "
+
+        return f"dd if='{self.target_path}' {options}"
+
+    def parse_output(self, stdout: str, stderr: str, exit_status: int = 0):
+        if exit_status != 0:
+            super().error_handling(stderr, exit_status)
+
+        return stdout
+
+    async def execute_sftp(self, sftp: SFTPClient, stdin=None):
+        if self.write:
+            async with sftp.open(self.target_path, "wb") as file:
+                async for chunk in stdin:
+                    await file.write(chunk)
+            return None
+
+        # The file is opened before streaming, so that errors are raised
+        # before the first chunk
+        file = await sftp.open(self.target_path, "rb")
+
+        async def content():
+            try:
+                await file.seek(self.offset)
+                remaining = self.length
+                while remaining is None or remaining > 0:
+                    size = STREAM_CHUNK_SIZE
+                    if remaining is not None:
+                        size = min(size, remaining)
+                        remaining -= size
+                    chunk = await file.read(size)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                await file.close()
+
+        return content()
@@ -3,8 +3,13 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
+import asyncio
+import posixpath
 import re
 import shlex
+import stat
+from datetime import datetime
+from asyncssh import SFTPAttrs, SFTPClient
 from fastapi import HTTPException, status
 
 # commands
@@ -12,9 +17,10 @@ from firecrest.filesystem.ops.commands.base_command_with_timeout import (
     BaseCommandWithTimeout,
 )
 from firecrest.filesystem.ops.models import File
+from lib.ssh_clients.ssh_client import BaseSFTPCommand
 
 
-class LsBaseCommand(BaseCommandWithTimeout):
+class LsBaseCommand(BaseCommandWithTimeout, BaseSFTPCommand):
 
     def __init__(
         self,
@@ -133,3 +139,85 @@ class LsBaseCommand(BaseCommandWithTimeout):
                     )
                 )
         return file_list
+
+    async def execute_sftp(self, sftp: SFTPClient, stdin=None):
+        stat_path = sftp.stat if self.dereference else sftp.lstat
+        attrs = await stat_path(self.target_path)
+
+        if self.no_recursion or not stat.S_ISDIR(attrs.permissions):
+            # Like `ls` the entry is named after the given path
+            file = await self.sftp_file(
+                sftp, self.target_path, self.target_path, attrs
+            )
+            return file if self.no_recursion else [file]
+
+        return await self.sftp_list_folder(sftp, self.target_path.rstrip("/") or "/")
+
+    async def sftp_list_folder(self, sftp: SFTPClient, folder: str, path: str = ""):
+        entries = [
+            entry
+            for entry in await sftp.readdir(folder)
+            if entry.filename not in (".", "..")
+            and (self.show_hidden or not entry.filename.startswith("."))
+        ]
+        entries.sort(key=lambda entry: entry.filename)
+
+        async def entry_file(entry):
+            full_path = posixpath.join(folder, entry.filename)
+            attrs = entry.attrs
+            if self.dereference and stat.S_ISLNK(attrs.permissions):
+                attrs = await sftp.stat(full_path)
+            return await self.sftp_file(
+                sftp, full_path, path + entry.filename, attrs, entry.longname
+            )
+
+        file_list = list(await asyncio.gather(*[entry_file(e) for e in entries]))
+
+        if self.recursion:
+            # Note: only actual directories are traversed, symbolic links to
+            # directories are not followed to avoid loops
+            for entry in entries:
+                if stat.S_ISDIR(entry.attrs.permissions):
+                    file_list += await self.sftp_list_folder(
+                        sftp,
+                        posixpath.join(folder, entry.filename),
+                        f"{path}{entry.filename}/",
+                    )
+        return file_list
+
+    async def sftp_file(
+        self,
+        sftp: SFTPClient,
+        full_path: str,
+        name: str,
+        attrs: SFTPAttrs,
+        longname: str = None,
+    ) -> File:
+        # SFTP v3 servers provide user and group names only in the `ls -l`
+        # like longname of directory entries
+        user, group = str(attrs.uid), str(attrs.gid)
+        if not self.numeric_uid:
+            if attrs.owner is not None and attrs.group is not None:
+                user, group = attrs.owner, attrs.group
+            elif longname:
+                fields = longname.split()
+                if len(fields) > 3:
+                    user, group = fields[2], fields[3]
+
+        link_target = None
+        if stat.S_ISLNK(attrs.permissions):
+            link_target = await sftp.readlink(full_path)
+
+        mode = stat.filemode(attrs.permissions)
+        return File(
+            name=name,
+            type=mode[0],
+            link_target=link_target,
+            user=user,
+            group=group,
+            permissions=mode[1:],
+            last_modified=datetime.fromtimestamp(attrs.mtime).strftime(
+                "%Y-%m-%dT%H:%M:%S"
+            ),
+            size=str(attrs.size),
+        )
@@ -0,0 +1,117 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+from typing import AsyncIterator, Iterator, List
+
+# commands
+from firecrest.filesystem.ops.commands.base_command_with_timeout import (
+    BaseCommandWithTimeout,
+)
+from firecrest.filesystem.ops.models import File
+
+
+# Relative paths never contain "//", which ends the name of each record
+NAME_SEPARATOR = "//"
+# mode, user, group, size and last modified don't contain "/", the link target
+# is the rest of the record
+FIND_FIELDS = 6
+
+
+class LsFindCommand(BaseCommandWithTimeout):
+    """Lists a directory with NUL delimited `find -printf` records sorted by
+    name.
+
+    Each record starts with the relative path of the entry, so the listing is
+    sorted (in byte order) by `sort -z` and can be resumed after the name of
+    the last entry returned. Unlike `ls`, the output doesn't need to be
+    quoted, so it can be parsed incrementally while it is streamed.
+    """
+
+    def __init__(
+        self,
+        target_path: str = None,
+        show_hidden: bool = False,
+        numeric_uid: bool = False,
+        recursive: bool = False,
+        dereference: bool = False,
+    ) -> None:
+        super().__init__()
+        self.target_path = target_path
+        self.show_hidden = show_hidden
+        self.numeric_uid = numeric_uid
+        self.recursive = recursive
+        self.dereference = dereference
+
+    def get_command(self) -> str:
+        owner = "%U/%G" if self.numeric_uid else "%u/%g"
+        printf = f"-printf '%P{NAME_SEPARATOR}%M/{owner}/%s/%TY-%Tm-%TdT%TH:%TM:%TS/%l\\0'"
+        find = f"{super().get_command()} find "
+        if self.dereference:
+            find += "-L "
+        find += f"'{self.target_path}'"
+
+        options = "-mindepth 1 "
+        if not self.recursive:
+            options += "-maxdepth 1 "
+        if not self.show_hidden:
+            # Hidden folders are not traversed
+            options += "-name '.*' -prune -o "
+
+        # Like `ls`, a path that is not a directory lists the file itself
+        return (
+            f"{find} -maxdepth 0 ! -type d {printf} && "
+            f"{find} {options}{printf} | LC_ALL=C sort -z"
+        )
+
+    def parse_output(self, stdout: str, stderr: str, exit_status: int = 0):
+        if exit_status != 0:
+            super().error_handling(stderr, exit_status)
+
+        # Drop the empty record after the trailing NUL
+        records = stdout.split("\0")[:-1]
+        return list(self.parse_records(records))
+
+    def parse_records(self, records: List[str]) -> Iterator[File]:
+        for record in records:
+            name, fields = record.split(NAME_SEPARATOR, 1)
+            mode, user, group, size, last_modified, link_target = fields.split(
+                "/", FIND_FIELDS - 1
+            )
+            yield File(
+                # The listed path itself has an empty relative path
+                name=name or self.target_path,
+                type=mode[0],
+                link_target=link_target or None,
+                user=user,
+                group=group,
+                permissions=mode[1:],
+                # Drop the fractional seconds
+                last_modified=last_modified[:19],
+                size=size,
+            )
+
+    async def parse_stream(
+        self, stdout: AsyncIterator[bytes], after: str | None = None
+    ) -> AsyncIterator[File]:
+        # Records up to the name `after` are skipped without being parsed.
+        # Names are compared with their separator, like `sort` compares the
+        # records
+        separator = NAME_SEPARATOR.encode()
+        after_key = None if after is None else after.encode() + separator
+        buffer = b""
+        async for chunk in stdout:
+            buffer += chunk
+            # The last record is incomplete (or empty after a trailing NUL)
+            *records, buffer = buffer.split(b"\0")
+            if after_key is not None:
+                records = [
+                    record
+                    for record in records
+                    if record[: record.find(separator) + len(separator)] > after_key
+                ]
+            for file in self.parse_records(
+                [record.decode(errors="replace") for record in records]
+            ):
+                yield file
@@ -3,16 +3,18 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
-# commands
-
+from asyncssh import SFTPClient, SFTPFailure
+from fastapi import HTTPException, status
 
+# commands
 from firecrest.filesystem.ops.commands.base_command_with_timeout import (
     BaseCommandWithTimeout,
 )
 from firecrest.filesystem.ops.commands.ls_base_command import LsBaseCommand
+from lib.ssh_clients.ssh_client import BaseSFTPCommand
 
 
-class MkdirCommand(BaseCommandWithTimeout):
+class MkdirCommand(BaseCommandWithTimeout, BaseSFTPCommand):
 
     def __init__(self, target_path: str = None, parent: bool = False) -> None:
         self.target_path = target_path
@@ -32,3 +34,20 @@ class MkdirCommand(BaseCommandWithTimeout):
             super().error_handling(stderr, exit_status)
 
         return self.ls_command.parse_output(stdout, stderr, exit_status)
+
+    async def execute_sftp(self, sftp: SFTPClient, stdin=None):
+        if self.parent:
+            await sftp.makedirs(self.target_path, exist_ok=True)
+        else:
+            try:
+                await sftp.mkdir(self.target_path)
+            except SFTPFailure as e:
+                # SFTP v3 servers report existing directories as a generic failure
+                if await sftp.exists(self.target_path):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"cannot create directory '{self.target_path}': File exists",
+                    ) from e
+                raise
+
+        return await self.ls_command.execute_sftp(sftp)
@@ -3,15 +3,17 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
-# commands
-
+import stat
+from asyncssh import SFTPClient
 
+# commands
 from firecrest.filesystem.ops.commands.base_command_with_timeout import (
     BaseCommandWithTimeout,
 )
+from lib.ssh_clients.ssh_client import BaseSFTPCommand
 
 
-class RmCommand(BaseCommandWithTimeout):
+class RmCommand(BaseCommandWithTimeout, BaseSFTPCommand):
 
     def __init__(self, target_path: str = None) -> None:
         super().__init__()
@@ -25,3 +27,10 @@ class RmCommand(BaseCommandWithTimeout):
     def parse_output(self, stdout: str, stderr: str, exit_status: int = 0):
         if exit_status != 0:
             super().error_handling(stderr, exit_status)
+
+    async def execute_sftp(self, sftp: SFTPClient, stdin=None):
+        attrs = await sftp.lstat(self.target_path)
+        if stat.S_ISDIR(attrs.permissions):
+            await sftp.rmtree(self.target_path)
+        else:
+            await sftp.remove(self.target_path)
@@ -0,0 +1,78 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+from typing import List
+
+from asyncssh import SFTPClient, SFTPError
+from fastapi import HTTPException
+
+# commands
+from firecrest.filesystem.ops.commands.base_command_with_timeout import (
+    BaseCommandWithTimeout,
+)
+from firecrest.filesystem.ops.commands.stat_command import (
+    STAT_FORMAT,
+    parse_stat,
+    sftp_stat,
+)
+from lib.ssh_clients.ssh_client import BaseSFTPCommand
+
+
+class StatBatchCommand(BaseCommandWithTimeout, BaseSFTPCommand):
+
+    def __init__(self, target_paths: List[str] = None, dereference: bool = False):
+        super().__init__()
+        self.target_paths = target_paths
+        self.dereference = dereference
+
+    def get_command(self) -> str:
+        deref = ""
+        if self.dereference:
+            deref = "--dereference"
+        paths = " ".join(f"'{path}'" for path in self.target_paths)
+        # Every successful stat prints the path and its values, NUL delimited
+        return f"{super().get_command()} stat {deref} --printf '%n\\0{STAT_FORMAT}\\0' -- {paths}"
+
+    def parse_output(self, stdout: str, stderr: str, exit_status: int = 0):
+        # A non zero exit status only means that at least one path failed,
+        # unless no output was produced at all (e.g. timeout)
+        if exit_status == 124 or (exit_status != 0 and not stderr):
+            super().error_handling(stderr, exit_status)
+
+        # stat processes the paths in order: paths missing from stdout are
+        # the ones that failed, with one error line each in stderr
+        fields = stdout.split("\0")
+        stats = iter(zip(fields[0:-1:2], fields[1::2], strict=False))
+        errors = iter(stderr.splitlines())
+        results = []
+        name, values = next(stats, (None, None))
+        for path in self.target_paths:
+            if name == path:
+                results.append({"path": path, "stat": parse_stat(values)})
+                name, values = next(stats, (None, None))
+            else:
+                results.append(self.path_error(path, next(errors, ""), exit_status))
+        return results
+
+    def path_error(self, path: str, stderr: str, exit_status: int) -> dict:
+        try:
+            super().error_handling(stderr, exit_status or 1)
+        except HTTPException as e:
+            return {"path": path, "status_code": e.status_code, "error": e.detail}
+
+    async def execute_sftp(self, sftp: SFTPClient, stdin=None):
+        # All the paths are requested concurrently on the shared SFTP session
+        async def path_stat(path: str):
+            try:
+                attrs = await sftp.stat(path, follow_symlinks=self.dereference)
+                return {"path": path, "stat": sftp_stat(attrs)}
+            except SFTPError as error:
+                try:
+                    self.sftp_error_handling(error)
+                except HTTPException as e:
+                    return {"path": path, "status_code": e.status_code, "error": e.detail}
+
+        return list(await asyncio.gather(*[path_stat(p) for p in self.target_paths]))
@@ -3,16 +3,44 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
+from asyncssh import SFTPAttrs, SFTPClient
+
 # commands
 from firecrest.filesystem.ops.commands.base_command_with_timeout import (
     BaseCommandWithTimeout,
 )
+from lib.ssh_clients.ssh_client import BaseSFTPCommand
 
 
 ID = 0
 
+STAT_FORMAT = "%f %i %d %h %u %g %s %X %Y %Z"
+
+
+def parse_stat(stdout: str) -> dict:
+    output = dict(
+        zip(
+            [
+                "mode",
+                "ino",
+                "dev",
+                "nlink",
+                "uid",
+                "gid",
+                "size",
+                "atime",
+                "mtime",
+                "ctime",
+            ],
+            stdout.split(),
+        )
+    )
+    output["mode"] = int(output["mode"], base=16)
+    output = {key: int(value) for key, value in output.items()}
+    return output
+
 
-class StatCommand(BaseCommandWithTimeout):
+class StatCommand(BaseCommandWithTimeout, BaseSFTPCommand):
 
     def __init__(self, target_path: str = None, dereference: bool = False) -> None:
         super().__init__()
@@ -25,7 +53,7 @@ class StatCommand(BaseCommandWithTimeout):
         deref = ""
         if self.dereference:
             deref = "--dereference"
-        return f"{super().get_command()} stat {deref} -c '%f %i %d %h %u %g %s %X %Y %Z' -- '{self.target_path}'"
+        return f"{super().get_command()} stat {deref} -c '{STAT_FORMAT}' -- '{self.target_path}'"
 
     def parse_output(self, stdout: str, stderr: str, exit_status: int = 0):
         if exit_status != 0:
@@ -43,23 +71,25 @@ class StatCommand(BaseCommandWithTimeout):
         # Modify: 2023-05-31 09:24:00.804840000 +0200
         # Change: 2023-05-31 09:24:00.804742840 +0200
         #  Birth: -
-        output = dict(
-            zip(
-                [
-                    "mode",
-                    "ino",
-                    "dev",
-                    "nlink",
-                    "uid",
-                    "gid",
-                    "size",
-                    "atime",
-                    "mtime",
-                    "ctime",
-                ],
-                stdout.split(),
-            )
-        )
-        output["mode"] = int(output["mode"], base=16)
-        output = {key: int(value) for key, value in output.items()}
-        return output
+        return parse_stat(stdout)
+
+    async def execute_sftp(self, sftp: SFTPClient, stdin=None):
+        attrs = await sftp.stat(self.target_path, follow_symlinks=self.dereference)
+        return sftp_stat(attrs)
+
+
+def sftp_stat(attrs: SFTPAttrs) -> dict:
+    # Note: inode, device and number of hard links are not provided by
+    # SFTP v3 servers and are reported as 0, like ctime when missing
+    return {
+        "mode": attrs.permissions,
+        "ino": 0,
+        "dev": 0,
+        "nlink": attrs.nlink or 0,
+        "uid": attrs.uid,
+        "gid": attrs.gid,
+        "size": attrs.size,
+        "atime": attrs.atime,
+        "mtime": attrs.mtime,
+        "ctime": attrs.ctime or 0,
+    }
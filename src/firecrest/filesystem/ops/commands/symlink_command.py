@@ -3,14 +3,16 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
+from asyncssh import SFTPClient
 
 from firecrest.filesystem.ops.commands.base_command_with_timeout import (
     BaseCommandWithTimeout,
 )
 from firecrest.filesystem.ops.commands.ls_base_command import LsBaseCommand
+from lib.ssh_clients.ssh_client import BaseSFTPCommand
 
 
-class SymlinkCommand(BaseCommandWithTimeout):
+class SymlinkCommand(BaseCommandWithTimeout, BaseSFTPCommand):
 
     def __init__(self, target_path: str = None, link_path: str = None) -> None:
         self.target_path = target_path
@@ -26,3 +28,7 @@ class SymlinkCommand(BaseCommandWithTimeout):
             super().error_handling(stderr, exit_status)
 
         return self.ls_command.parse_output(stdout, stderr, exit_status)
+
+    async def execute_sftp(self, sftp: SFTPClient, stdin=None):
+        await sftp.symlink(self.target_path, self.link_path)
+        return await self.ls_command.execute_sftp(sftp)
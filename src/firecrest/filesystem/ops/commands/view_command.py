@@ -3,18 +3,19 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
-# commands
-
+from asyncssh import SFTPClient
 
+# commands
 from firecrest.filesystem.ops.commands.base_command_with_timeout import (
     BaseCommandWithTimeout,
 )
+from lib.ssh_clients.ssh_client import BaseSFTPCommand
 
 
 SIZE_LIMIT = 5 * 1024 * 1024
 
 
-class ViewCommand(BaseCommandWithTimeout):
+class ViewCommand(BaseCommandWithTimeout, BaseSFTPCommand):
 
     def __init__(self, target_path: str = None) -> None:
         super().__init__()
@@ -30,3 +31,8 @@ class ViewCommand(BaseCommandWithTimeout):
             super().error_handling(stderr, exit_status)
 
         return stdout
+
+    async def execute_sftp(self, sftp: SFTPClient, stdin=None):
+        async with sftp.open(self.target_path, "rb") as file:
+            content = await file.read(SIZE_LIMIT)
+        return content.decode(errors="replace")
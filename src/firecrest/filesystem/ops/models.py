@@ -4,7 +4,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from enum import Enum
-from typing import Optional
+from typing import Annotated, List, Literal, Optional, Union
 
 # models
 from firecrest.filesystem.models import FilesystemRequestBase
@@ -55,6 +55,15 @@ class FileStat(CamelModel):
     # birthtime: int
 
 
+class FileStatResult(CamelModel):
+    path: str
+    stat: Optional[FileStat] = None
+    status_code: int = Field(
+        default=200, description="HTTP status code of the operation on this path"
+    )
+    error: Optional[str] = None
+
+
 class PatchFile(CamelModel):
     message: str
     new_filepath: str
@@ -70,6 +79,10 @@ class PatchFileMetadataRequest(CamelModel):
 
 class GetDirectoryLsResponse(CamelModel):
     output: Optional[list[File]]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor of the next page, `null` when the listing is complete",
+    )
 
 
 class GetFileHeadResponse(CamelModel):
@@ -92,6 +105,29 @@ class GetFileStatResponse(CamelModel):
     output: Optional[FileStat]
 
 
+class PostFileStatBatchRequest(CamelModel):
+    paths: List[str] = Field(
+        ..., min_length=1, max_length=1000, description="File or folder paths"
+    )
+    dereference: Optional[bool] = Field(
+        default=False, description="Follow symbolic links"
+    )
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "paths": ["/home/user/dir/file.out", "/home/user/dir"],
+                    "dereference": False,
+                }
+            ]
+        }
+    }
+
+
+class PostFileStatBatchResponse(CamelModel):
+    output: List[FileStatResult]
+
+
 class PatchFileMetadataResponse(CamelModel):
     output: Optional[PatchFile]
 
@@ -204,3 +240,97 @@ class PostExtractRequest(FilesystemRequestBase):
             ]
         }
     }
+
+
+class BatchOperationType(str, Enum):
+    mkdir = "mkdir"
+    chmod = "chmod"
+    chown = "chown"
+    symlink = "symlink"
+    rm = "rm"
+
+
+class BatchMkdirOperation(PostMakeDirRequest):
+    operation: Literal[BatchOperationType.mkdir]
+
+
+class BatchChmodOperation(PutFileChmodRequest):
+    operation: Literal[BatchOperationType.chmod]
+
+
+class BatchChownOperation(PutFileChownRequest):
+    operation: Literal[BatchOperationType.chown]
+
+
+class BatchSymlinkOperation(PostFileSymlinkRequest):
+    operation: Literal[BatchOperationType.symlink]
+
+
+class BatchRmOperation(FilesystemRequestBase):
+    operation: Literal[BatchOperationType.rm]
+
+
+BatchOperation = Annotated[
+    Union[
+        BatchMkdirOperation,
+        BatchChmodOperation,
+        BatchChownOperation,
+        BatchSymlinkOperation,
+        BatchRmOperation,
+    ],
+    Field(discriminator="operation"),
+]
+
+
+class PostBatchRequest(CamelModel):
+    operations: List[BatchOperation] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Operations to run in order with a single remote command",
+    )
+    continue_on_error: Optional[bool] = Field(
+        default=False,
+        description="If set to `true`, the operations following a failed one are still run",
+    )
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "operations": [
+                        {
+                            "operation": "mkdir",
+                            "path": "/home/user/dir/newdir",
+                            "parent": "true",
+                        },
+                        {
+                            "operation": "chmod",
+                            "path": "/home/user/dir/newdir",
+                            "mode": "750",
+                        },
+                        {
+                            "operation": "symlink",
+                            "path": "/home/user/dir/newdir",
+                            "link_path": "/home/user/newlink",
+                        },
+                    ],
+                    "continue_on_error": "false",
+                }
+            ]
+        }
+    }
+
+
+class BatchOperationResult(CamelModel):
+    operation: BatchOperationType
+    path: str
+    status_code: Optional[int] = Field(
+        default=None,
+        description="HTTP status code of the operation, `null` if it wasn't run because of a previous error",
+    )
+    output: Optional[File] = None
+    error: Optional[str] = None
+
+
+class PostBatchResponse(CamelModel):
+    output: List[BatchOperationResult]
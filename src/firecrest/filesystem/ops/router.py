@@ -3,19 +3,22 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
-import sys
+import re
+import secrets
+import stat as stat_mode
+from contextlib import aclosing
 from fastapi import (
     Depends,
     File,
+    Header,
     HTTPException,
     Path,
-    Response,
     UploadFile,
     status,
     Query,
 )
-from typing import Any, Annotated
-from base64 import b64decode, b64encode
+from fastapi.responses import StreamingResponse
+from typing import Any, Annotated, AsyncIterator, Tuple
 
 # configs
 from firecrest.config import HPCCluster, HealthCheckType
@@ -30,7 +33,9 @@ from firecrest.dependencies import (
 )
 
 # helpers
-from firecrest.filesystem.ops.commands.base64_command import Base64Command
+from firecrest.filesystem.ops.commands.batch_command import BatchCommand
+from firecrest.filesystem.ops.commands.cp_command import CpCommand
+from firecrest.filesystem.ops.commands.dd_command import DdCommand
 from firecrest.filesystem.ops.commands.file_command import FileCommand
 from firecrest.filesystem.ops.commands.rm_command import RmCommand
 from firecrest.filesystem.ops.commands.view_command import ViewCommand
@@ -38,13 +43,15 @@ from lib.helpers.api_auth_helper import ApiAuthHelper
 from lib.helpers.router_helper import create_router
 
 # clients
-from lib.ssh_clients.ssh_client import SSHClientPool
+from lib.ssh_clients.ssh_client import STREAM_CHUNK_SIZE, BaseCommand, SSHClientPool
 
 # commands
 from firecrest.filesystem.ops.commands.ls_command import LsCommand
+from firecrest.filesystem.ops.commands.ls_find_command import LsFindCommand
 from firecrest.filesystem.ops.commands.mkdir_command import MkdirCommand
 from firecrest.filesystem.ops.commands.checksum_command import ChecksumCommand
 from firecrest.filesystem.ops.commands.stat_command import StatCommand
+from firecrest.filesystem.ops.commands.stat_batch_command import StatBatchCommand
 from firecrest.filesystem.ops.commands.head_command import HeadCommand
 from firecrest.filesystem.ops.commands.tail_command import TailCommand
 from firecrest.filesystem.ops.commands.chmod_command import ChmodCommand
@@ -54,13 +61,19 @@ from firecrest.filesystem.ops.commands.symlink_command import SymlinkCommand
 
 # models
 from firecrest.filesystem.ops.models import (
+    BatchOperation,
+    BatchOperationType,
     GetDirectoryLsResponse,
     GetFileHeadResponse,
     GetFileTailResponse,
     GetFileChecksumResponse,
     GetFileTypeResponse,
     GetFileStatResponse,
+    PostFileStatBatchRequest,
+    PostFileStatBatchResponse,
     GetViewFileResponse,
+    PostBatchRequest,
+    PostBatchResponse,
     PostCompressRequest,
     PostExtractRequest,
     PostMakeDirRequest,
@@ -81,6 +94,58 @@ router = create_router(
 )
 
 
+async def _stream_command(
+    ssh_client: SSHClientPool, username: str, access_token: str, command: BaseCommand
+) -> AsyncIterator[bytes]:
+    # The SSH client is held until the whole output is consumed
+    async with ssh_client.get_client(username, access_token) as client:
+        async for chunk in client.execute_stream(command):
+            yield chunk
+
+
+async def _streaming_response(
+    stream: AsyncIterator[bytes], **kwargs
+) -> StreamingResponse:
+    # The first chunk is read before sending the response headers, so that
+    # remote errors are still reported with the proper status code
+    first_chunk = await anext(stream, b"")
+
+    async def content():
+        if first_chunk:
+            yield first_chunk
+        async for chunk in stream:
+            yield chunk
+
+    return StreamingResponse(content(), **kwargs)
+
+
+def _parse_range(range_header: str | None, size: int) -> Tuple[int, int] | None:
+    # Only single byte ranges are supported, other range requests are
+    # served with the whole file (RFC 9110, section 14.2)
+    if range_header is None:
+        return None
+    match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", range_header)
+    if match is None or match.group(1) == match.group(2) == "":
+        return None
+
+    if match.group(1) == "":
+        # Suffix range: the last N bytes
+        start = max(size - int(match.group(2)), 0)
+        end = size - 1
+    else:
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else size - 1
+        end = min(end, size - 1)
+
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable.",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
 @router.put(
     "/chmod",
     description="Change the permission mode of a file(`chmod`)",
@@ -178,15 +243,69 @@ async def get_ls(
             description="Show information for the file the link references.",
         ),
     ] = False,
+    limit: Annotated[
+        int,
+        Query(
+            ge=1,
+            description=(
+                "Maximum number of entries to return. When set (or when `cursor` "
+                "is set), entries are sorted by the byte order of their names "
+                "instead of by the locale. Each page lists the whole directory, "
+                "which must complete within the command timeout."
+            ),
+        ),
+    ] = None,
+    cursor: Annotated[
+        str,
+        Query(
+            description=(
+                "The `nextCursor` returned by the previous page: the name of "
+                "the last entry returned, the listing resumes after it"
+            ),
+        ),
+    ] = None,
 ) -> Any:
     username = ApiAuthHelper.get_auth().username
     access_token = ApiAuthHelper.get_access_token()
+    if limit is not None or cursor is not None:
+        ls = LsFindCommand(path, show_hidden, numeric_uid, recursive, dereference)
+        return await _ls_page(ssh_client, ls, username, access_token, limit, cursor)
+
     ls = LsCommand(path, show_hidden, numeric_uid, recursive, dereference)
     async with ssh_client.get_client(username, access_token) as client:
         output = await client.execute(ls)
         return {"output": output}
 
 
+async def _ls_page(
+    ssh_client: SSHClientPool,
+    ls: LsFindCommand,
+    username: str,
+    access_token: str,
+    limit: int | None,
+    cursor: str | None,
+):
+    # The cursor is the name of the last entry returned: the listing is
+    # sorted by name, so entries added or removed between pages are neither
+    # repeated nor skipped. It's parsed while it is streamed and the remote
+    # command is stopped as soon as the page (plus one entry to know if there
+    # are more) is complete
+    output = []
+    next_cursor = None
+    async with ssh_client.get_client(username, access_token) as client:
+        stdout = client.execute_stream(ls)
+        async with aclosing(stdout), aclosing(
+            ls.parse_stream(stdout, after=cursor)
+        ) as files:
+            async for file in files:
+                if limit is not None and len(output) == limit:
+                    next_cursor = output[-1].name
+                    break
+                output.append(file)
+
+    return {"output": output, "next_cursor": next_cursor}
+
+
 @router.get(
     "/head",
     description="Output the first part of file/s (`head`)",
@@ -444,6 +563,36 @@ async def get_stat(
         return {"output": output}
 
 
+@router.post(
+    "/stat:batch",
+    description=(
+        "Output the `stat` of many files with a single remote command. Errors "
+        "are reported per path."
+    ),
+    status_code=status.HTTP_200_OK,
+    response_model=PostFileStatBatchResponse,
+    response_description="Stat returned successfully",
+)
+async def post_stat_batch(
+    request_model: PostFileStatBatchRequest,
+    ssh_client: Annotated[
+        SSHClientPool,
+        Path(alias="system_name", description="Target system"),
+        Depends(SSHClientDependency()),
+    ],
+    system: HPCCluster = Depends(
+        ServiceAvailabilityDependency(service_type=HealthCheckType.filesystem),
+        use_cache=False,
+    ),
+) -> Any:
+    username = ApiAuthHelper.get_auth().username
+    access_token = ApiAuthHelper.get_access_token()
+    stat = StatBatchCommand(request_model.paths, request_model.dereference)
+    async with ssh_client.get_client(username, access_token) as client:
+        output = await client.execute(stat)
+        return {"output": output}
+
+
 @router.delete(
     "/rm",
     description="Delete file or directory operation (`rm`)",
@@ -525,12 +674,77 @@ async def post_symlink(
         return {"output": output}
 
 
+def _batch_operation_command(operation: BatchOperation):
+    match operation.operation:
+        case BatchOperationType.mkdir:
+            return MkdirCommand(target_path=operation.path, parent=operation.parent)
+        case BatchOperationType.chmod:
+            return ChmodCommand(target_path=operation.path, mode=operation.mode)
+        case BatchOperationType.chown:
+            return ChownCommand(
+                target_path=operation.path,
+                owner=operation.owner,
+                group=operation.group,
+            )
+        case BatchOperationType.symlink:
+            return SymlinkCommand(operation.path, operation.link_path)
+        case BatchOperationType.rm:
+            return RmCommand(operation.path)
+
+
+@router.post(
+    "/batch",
+    description=(
+        "Run a sequence of operations (`mkdir`, `chmod`, `chown`, `symlink`, `rm`) "
+        "in order with a single remote command. By default, the operations "
+        "following a failed one are not run."
+    ),
+    status_code=status.HTTP_200_OK,
+    response_model=PostBatchResponse,
+    response_description="Operations run, see the status of each of them",
+)
+async def post_batch(
+    request_model: PostBatchRequest,
+    ssh_client: Annotated[
+        SSHClientPool,
+        Path(alias="system_name", description="Target system"),
+        Depends(SSHClientDependency()),
+    ],
+    system: HPCCluster = Depends(
+        ServiceAvailabilityDependency(service_type=HealthCheckType.filesystem),
+        use_cache=False,
+    ),
+) -> Any:
+    username = ApiAuthHelper.get_auth().username
+    access_token = ApiAuthHelper.get_access_token()
+    batch = BatchCommand(
+        [_batch_operation_command(op) for op in request_model.operations],
+        request_model.continue_on_error,
+    )
+    async with ssh_client.get_client(username, access_token) as client:
+        results = await client.execute(batch)
+
+    return {
+        "output": [
+            {"operation": operation.operation, "path": operation.path, **result}
+            for operation, result in zip(
+                request_model.operations, results, strict=True
+            )
+        ]
+    }
+
+
 @router.get(
     "/download",
     description=f"Download a small file (max {settings.storage.max_ops_file_size if settings.storage else 'undef.'} Bytes)",
     status_code=status.HTTP_200_OK,
     response_model=None,
-    response_description="File downloaded successfully"
+    response_description="File downloaded successfully",
+    responses={
+        status.HTTP_206_PARTIAL_CONTENT: {
+            "description": "Requested byte range downloaded successfully"
+        }
+    },
 )
 async def get_download(
     ssh_client: Annotated[
@@ -543,15 +757,51 @@ async def get_download(
         ServiceAvailabilityDependency(service_type=HealthCheckType.filesystem),
         use_cache=False,
     ),
+    range_header: Annotated[
+        str | None,
+        Header(
+            alias="Range",
+            description="Download only the given byte range (e.g. `bytes=0-1023`)",
+        ),
+    ] = None,
 ) -> Any:
     username = ApiAuthHelper.get_auth().username
     access_token = ApiAuthHelper.get_access_token()
-    base64 = Base64Command(path)
+    stat = StatCommand(path, dereference=True)
     async with ssh_client.get_client(username, access_token) as client:
-        output = await client.execute(base64)
-        return Response(
-            content=b64decode(output), media_type="application/octet-stream"
+        file_stat = await client.execute(stat)
+
+    if not stat_mode.S_ISREG(file_stat["mode"]):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"`{path}` is not a regular file.",
         )
+    size = file_stat["size"]
+    if size > settings.storage.max_ops_file_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File to download is too large.",
+        )
+
+    headers = {"Accept-Ranges": "bytes"}
+    status_code = status.HTTP_200_OK
+    dd = DdCommand(path)
+    byte_range = _parse_range(range_header, size)
+    if byte_range is not None:
+        start, end = byte_range
+        dd = DdCommand(path, offset=start, length=end - start + 1)
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+    else:
+        headers["Content-Length"] = str(size)
+
+    return await _streaming_response(
+        _stream_command(ssh_client, username, access_token, dd),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/octet-stream",
+    )
 
 
 @router.post(
@@ -578,24 +828,49 @@ async def post_upload(
 ) -> Any:
     username = ApiAuthHelper.get_auth().username
     access_token = ApiAuthHelper.get_access_token()
-    base64 = Base64Command(f"{path}/{file.filename}", decode=True)
-
-    raw_content = file.file.read()
-    if sys.getsizeof(raw_content) > settings.storage.max_ops_file_size:
+    target_path = f"{path}/{file.filename}"
+    # The file is written next to the target and copied over it once
+    # complete, so that a failed upload doesn't truncate an existing file.
+    # The copy writes the target in place like a direct write would
+    temp_path = f"{target_path}.{secrets.token_hex(8)}"
+    dd = DdCommand(temp_path, write=True)
+
+    max_size = settings.storage.max_ops_file_size
+    if file.size is not None and file.size > max_size:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail="Uploaded file is too large.",
         )
 
+    async def content():
+        # Stream the spooled file in chunks, enforcing the size limit also
+        # when the size of the upload is not known in advance
+        uploaded = 0
+        while chunk := await file.read(STREAM_CHUNK_SIZE):
+            uploaded += len(chunk)
+            if uploaded > max_size:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="Uploaded file is too large.",
+                )
+            yield chunk
+
     # Note about overwrite
     # Providing a setting to control the overwrite behavior is non trivial.
     # To be reliable this setting should be implemented via an atomic operation (no multiple commands)
     # This could be accived by changing the default bash behavior with "set -o noclobber;"
-    # The idea is to append "set -o noclobber;" to the bas64 command and relax the ssh wrapper to allow it.
+    # The idea is to append "set -o noclobber;" to the dd command and relax the ssh wrapper to allow it.
 
-    content = b64encode(raw_content).decode("utf-8")
     async with ssh_client.get_client(username, access_token) as client:
-        await client.execute(base64, content)
+        try:
+            await client.execute_stdin_stream(dd, content())
+            await client.execute(CpCommand(temp_path, target_path))
+        finally:
+            try:
+                await client.execute(RmCommand(temp_path))
+            except Exception:
+                # The outcome of the upload is reported
+                pass
         return None
 
 
@@ -3,7 +3,7 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
-from typing import Any, Optional
+from typing import Any, List, Optional
 from pydantic import Field
 
 # models
@@ -63,6 +63,26 @@ class UploadFileResponse(CamelModel):
     complete_upload_url: str
     max_part_size: int
     transfer_job: TransferJob
+    upload_id: Optional[str] = Field(default=None, description="Multipart upload id")
+    object_key: Optional[str] = Field(
+        default=None, description="Key of the uploaded object in the staging area"
+    )
+    num_parts: Optional[int] = Field(default=None, description="Number of parts")
+    next_parts_cursor: Optional[str] = Field(
+        default=None,
+        description=(
+            "Cursor of the next page of part upload URLs (see "
+            "`GET /transfer/upload/parts`), `null` when all of them are returned"
+        ),
+    )
+
+
+class GetUploadPartsResponse(CamelModel):
+    parts_upload_urls: List[str]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor of the next page, `null` when the page is the last one",
+    )
 
 
 class DownloadFileResponse(CamelModel):
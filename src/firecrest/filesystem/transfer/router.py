@@ -3,13 +3,15 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
+import asyncio
 from math import ceil
 import uuid
 import os
 from fastapi import Depends, Path, Query, status, HTTPException
-from typing import Annotated, Any, List, Optional
+from typing import Annotated, Any, List, Optional, Set
 from importlib import resources as imp_resources
 from jinja2 import Environment, FileSystemLoader
+from botocore.exceptions import ClientError
 
 
 # plugins
@@ -49,6 +51,7 @@ from firecrest.filesystem.transfer.models import (
     PostFileDownloadRequest,
     PostFileUploadRequest,
     DownloadFileResponse,
+    GetUploadPartsResponse,
     TransferJob,
     TransferJobLogs,
     CompressRequest,
@@ -59,6 +62,12 @@ from firecrest.filesystem.transfer.models import (
 from lib.ssh_clients.ssh_client import SSHClientPool
 
 
+# Maximum number of parts of a S3 multipart upload
+MAX_PARTS = 10000
+
+# Buckets known to exist with the configured lifecycle
+known_buckets: Set[str] = set()
+
 router = create_router(
     prefix="/{system_name}/transfer",
     tags=["filesystem"],
@@ -101,6 +110,52 @@ def _build_script(filename: str, parameters):
     return script_code
 
 
+async def _has_lifecycle(client, bucket: str) -> bool:
+    lifecycle = settings.storage.bucket_lifecycle_configuration.to_json()
+    try:
+        response = await client.get_bucket_lifecycle_configuration(Bucket=bucket)
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "NoSuchLifecycleConfiguration":
+            return False
+        raise
+    expected = lifecycle["Rules"][0]
+    return any(
+        rule.get("ID") == expected["ID"]
+        and rule.get("Status") == expected["Status"]
+        and rule.get("Expiration") == expected["Expiration"]
+        for rule in response.get("Rules", [])
+    )
+
+
+async def _ensure_bucket(client, bucket: str):
+    # Buckets are cached only once their lifecycle is confirmed
+    if bucket in known_buckets:
+        return
+    try:
+        await client.create_bucket(**{"Bucket": bucket})
+    except client.exceptions.BucketAlreadyOwnedByYou:
+        if await _has_lifecycle(client, bucket):
+            known_buckets.add(bucket)
+            return
+    await client.put_bucket_lifecycle_configuration(
+        Bucket=bucket,
+        LifecycleConfiguration=settings.storage.bucket_lifecycle_configuration.to_json(),
+    )
+    known_buckets.add(bucket)
+
+
+async def _create_multipart_upload(client, bucket: str, key: str) -> str:
+    await _ensure_bucket(client, bucket)
+    try:
+        response = await client.create_multipart_upload(Bucket=bucket, Key=key)
+    except client.exceptions.NoSuchBucket:
+        # The bucket was deleted after it was cached
+        known_buckets.discard(bucket)
+        await _ensure_bucket(client, bucket)
+        response = await client.create_multipart_upload(Bucket=bucket, Key=key)
+    return response["UploadId"]
+
+
 async def _generate_presigned_url(client, action, params, method=None):
     if settings.storage.tenant:
         if "Bucket" in params:
@@ -114,6 +169,34 @@ async def _generate_presigned_url(client, action, params, method=None):
     return url
 
 
+async def _generate_part_upload_urls(
+    client, bucket: str, key: str, upload_id: str, part_numbers: range
+) -> List[str]:
+    # Part URLs are signed in bulk by a synchronous client of the same
+    # endpoint, in a worker thread so that the event loop isn't blocked by
+    # large uploads
+    signer = S3ClientDependency.get_s3_signer(client.meta.endpoint_url)
+    if settings.storage.tenant:
+        bucket = f"{settings.storage.tenant}:{bucket}"
+
+    def sign() -> List[str]:
+        return [
+            signer.generate_presigned_url(
+                ClientMethod="upload_part",
+                Params={
+                    "Bucket": bucket,
+                    "Key": key,
+                    "UploadId": upload_id,
+                    "PartNumber": part_number,
+                },
+                ExpiresIn=settings.storage.ttl,
+            )
+            for part_number in part_numbers
+        ]
+
+    return await asyncio.to_thread(sign)
+
+
 def _format_directives(directives: List[str], account: str):
 
     directives_str = "\n".join(directives)
@@ -163,80 +246,69 @@ async def post_upload(
             f"The system {system_name} has no filesystem defined as default_work_dir"
         )
 
-    async with s3_client_private:
-        try:
-            await s3_client_private.create_bucket(**{"Bucket": username})
-            # Update lifecycle only for new buckets (not throwing the BucketAlreadyOwnedByYou exception)
-            await s3_client_private.put_bucket_lifecycle_configuration(
-                Bucket=username,
-                LifecycleConfiguration=settings.storage.bucket_lifecycle_configuration.to_json(),
-            )
-        except s3_client_private.exceptions.BucketAlreadyOwnedByYou:
-            pass
+    upload_id = await _create_multipart_upload(s3_client_private, username, object_name)
 
-        upload_id = (
-            await s3_client_private.create_multipart_upload(
-                Bucket=username, Key=object_name
-            )
-        )["UploadId"]
-
-        post_external_upload_urls = []
-        for part_number in range(
-            1,
-            ceil(upload_request.file_size / settings.storage.multipart.max_part_size)
-            + 1,
-        ):
-            post_external_upload_urls.append(
-                await _generate_presigned_url(
-                    s3_client_public,
-                    "upload_part",
-                    {
-                        "Bucket": username,
-                        "Key": object_name,
-                        "UploadId": upload_id,
-                        "PartNumber": part_number,
-                    },
-                )
-            )
+    num_parts = ceil(
+        upload_request.file_size / settings.storage.multipart.max_part_size
+    )
+    # Large uploads return only the first part URLs, the others are
+    # requested page by page
+    num_part_urls = num_parts
+    if settings.storage.multipart.max_part_urls is not None:
+        num_part_urls = min(num_parts, settings.storage.multipart.max_part_urls)
+    post_external_upload_urls = await _generate_part_upload_urls(
+        s3_client_public,
+        username,
+        object_name,
+        upload_id,
+        range(1, num_part_urls + 1),
+    )
 
-        complete_external_multipart_upload_url = await _generate_presigned_url(
-            s3_client_public,
-            "complete_multipart_upload",
-            {"Bucket": username, "Key": object_name, "UploadId": upload_id},
-            "POST",
-        )
+    complete_external_multipart_upload_url = await _generate_presigned_url(
+        s3_client_public,
+        "complete_multipart_upload",
+        {"Bucket": username, "Key": object_name, "UploadId": upload_id},
+        "POST",
+    )
 
-        get_download_url = await _generate_presigned_url(
-            s3_client_private, "get_object", {"Bucket": username, "Key": object_name}
-        )
+    get_download_url = await _generate_presigned_url(
+        s3_client_private, "get_object", {"Bucket": username, "Key": object_name}
+    )
 
-        head_download_url = await _generate_presigned_url(
-            s3_client_private, "head_object", {"Bucket": username, "Key": object_name}
-        )
+    head_download_url = await _generate_presigned_url(
+        s3_client_private, "head_object", {"Bucket": username, "Key": object_name}
+    )
 
-        parameters = {
-            "sbatch_directives": _format_directives(
-                system.datatransfer_jobs_directives, upload_request.account
-            ),
-            "download_head_url": head_download_url,
-            "download_url": get_download_url,
-            "target_path": f"{upload_request.path}/{upload_request.file_name}",
-            "max_part_size": str(settings.storage.multipart.max_part_size),
-        }
+    parameters = {
+        "sbatch_directives": _format_directives(
+            system.datatransfer_jobs_directives, upload_request.account
+        ),
+        "download_head_url": head_download_url,
+        "download_url": get_download_url,
+        "target_path": f"{upload_request.path}/{upload_request.file_name}",
+        "max_part_size": str(settings.storage.multipart.max_part_size),
+        "parallel_runs": str(settings.storage.multipart.parallel_runs),
+    }
 
-        job_script = _build_script("slurm_job_downloader.sh", parameters)
-        job = JobHelper(f"{work_dir}/{username}", job_script, "IngressFileTransfer")
+    job_script = _build_script("slurm_job_downloader.sh", parameters)
+    job = JobHelper(f"{work_dir}/{username}", job_script, "IngressFileTransfer")
 
-        job_id = await scheduler_client.submit_job(
-            job_description=JobDescriptionModel(**job.job_param),
-            username=username,
-            jwt_token=access_token,
-        )
+    job_id = await scheduler_client.submit_job(
+        job_description=JobDescriptionModel(**job.job_param),
+        username=username,
+        jwt_token=access_token,
+    )
 
     return {
         "partsUploadUrls": post_external_upload_urls,
         "completeUploadUrl": complete_external_multipart_upload_url,
         "maxPartSize": settings.storage.multipart.max_part_size,
+        "uploadId": upload_id,
+        "objectKey": object_name,
+        "numParts": num_parts,
+        "nextPartsCursor": (
+            str(num_part_urls + 1) if num_part_urls < num_parts else None
+        ),
         "transferJob": TransferJob(
             job_id=job_id,
             system=system_name,
@@ -249,6 +321,65 @@ async def post_upload(
     }
 
 
+@router.get(
+    "/upload/parts",
+    description="Get a page of part upload URLs of an upload operation",
+    status_code=status.HTTP_200_OK,
+    response_model=GetUploadPartsResponse,
+    response_description="Part upload URLs returned successfully",
+)
+async def get_upload_parts(
+    object_key: Annotated[
+        str,
+        Query(alias="objectKey", description="The `objectKey` of the upload"),
+    ],
+    upload_id: Annotated[
+        str, Query(alias="uploadId", description="The `uploadId` of the upload")
+    ],
+    num_parts: Annotated[
+        int,
+        Query(
+            alias="numParts",
+            ge=1,
+            le=MAX_PARTS,
+            description="The `numParts` of the upload",
+        ),
+    ],
+    s3_client_public=Depends(
+        S3ClientDependency(connection=S3ClientConnectionType.public)
+    ),
+    limit: Annotated[
+        int,
+        Query(ge=1, le=1000, description="Maximum number of URLs to return"),
+    ] = 100,
+    cursor: Annotated[
+        str,
+        Query(
+            pattern=r"^\d+$",
+            description=(
+                "The `nextPartsCursor` of the upload or the `nextCursor` returned "
+                "by the previous page"
+            ),
+        ),
+    ] = "1",
+) -> Any:
+    # URLs are signed for the bucket of the current user only
+    username = ApiAuthHelper.get_auth().username
+    first_part = max(int(cursor), 1)
+    last_part = min(first_part + limit - 1, num_parts)
+    urls = await _generate_part_upload_urls(
+        s3_client_public,
+        username,
+        object_key,
+        upload_id,
+        range(first_part, last_part + 1),
+    )
+    return {
+        "partsUploadUrls": urls,
+        "nextCursor": str(last_part + 1) if last_part < num_parts else None,
+    }
+
+
 @router.post(
     "/download",
     description=f"Create asynchronous download operation (for files larger than {settings.storage.max_ops_file_size if settings.storage else 'undef.'} Bytes)",
@@ -294,83 +425,61 @@ async def post_download(
     async with ssh_client.get_client(username, access_token) as client:
         stat_output = await client.execute(stat)
 
-    async with s3_client_private:
-        try:
-            await s3_client_private.create_bucket(**{"Bucket": username})
-            # Update lifecycle only for new buckets (not throwing the BucketAlreadyOwnedByYou exception)
-            await s3_client_private.put_bucket_lifecycle_configuration(
-                Bucket=username,
-                LifecycleConfiguration=settings.storage.bucket_lifecycle_configuration.to_json(),
-            )
-        except s3_client_private.exceptions.BucketAlreadyOwnedByYou:
-            pass
-        upload_id = (
-            await s3_client_private.create_multipart_upload(
-                Bucket=username, Key=object_name
-            )
-        )["UploadId"]
+    upload_id = await _create_multipart_upload(s3_client_private, username, object_name)
 
-        post_upload_urls = []
-        for part_number in range(
+    post_upload_urls = await _generate_part_upload_urls(
+        s3_client_private,
+        username,
+        object_name,
+        upload_id,
+        range(
             1,
             ceil(stat_output["size"] / settings.storage.multipart.max_part_size) + 1,
-        ):
-            post_upload_urls.append(
-                await _generate_presigned_url(
-                    s3_client_private,
-                    "upload_part",
-                    {
-                        "Bucket": username,
-                        "Key": object_name,
-                        "UploadId": upload_id,
-                        "PartNumber": part_number,
-                    },
-                )
-            )
+        ),
+    )
 
-        complete_multipart_url = await _generate_presigned_url(
-            s3_client_private,
-            "complete_multipart_upload",
-            {"Bucket": username, "Key": object_name, "UploadId": upload_id},
-            "POST",
-        )
+    complete_multipart_url = await _generate_presigned_url(
+        s3_client_private,
+        "complete_multipart_upload",
+        {"Bucket": username, "Key": object_name, "UploadId": upload_id},
+        "POST",
+    )
 
-        parameters = {
-            "sbatch_directives": _format_directives(
-                system.datatransfer_jobs_directives, download_request.account
-            ),
-            "F7T_MAX_PART_SIZE": str(settings.storage.multipart.max_part_size),
-            "F7T_MP_USE_SPLIT": (
-                "true" if settings.storage.multipart.use_split else "false"
-            ),
-            "F7T_TMP_FOLDER": f"{settings.storage.multipart.tmp_folder}/{str(uuid.uuid1())}/",
-            "F7T_MP_PARALLEL_RUN": str(settings.storage.multipart.parallel_runs),
-            "F7T_MP_PARTS_URL": " ".join(f'"{url}"' for url in post_upload_urls),
-            "F7T_MP_NUM_PARTS": str(len(post_upload_urls)),
-            "F7T_MP_INPUT_FILE": download_request.path,
-            "F7T_MP_COMPLETE_URL": complete_multipart_url,
-        }
+    parameters = {
+        "sbatch_directives": _format_directives(
+            system.datatransfer_jobs_directives, download_request.account
+        ),
+        "F7T_MAX_PART_SIZE": str(settings.storage.multipart.max_part_size),
+        "F7T_MP_USE_SPLIT": (
+            "true" if settings.storage.multipart.use_split else "false"
+        ),
+        "F7T_TMP_FOLDER": f"{settings.storage.multipart.tmp_folder}/{str(uuid.uuid1())}/",
+        "F7T_MP_PARALLEL_RUN": str(settings.storage.multipart.parallel_runs),
+        "F7T_MP_PARTS_URL": " ".join(f'"{url}"' for url in post_upload_urls),
+        "F7T_MP_NUM_PARTS": str(len(post_upload_urls)),
+        "F7T_MP_INPUT_FILE": download_request.path,
+        "F7T_MP_COMPLETE_URL": complete_multipart_url,
+    }
 
-        job = JobHelper(
-            f"{work_dir}/{username}",
-            _build_script(
-                "slurm_job_uploader_multipart.sh",
-                parameters,
-            ),
-            "OutgressFileTransfer",
-        )
-        get_download_url = None
-        job_id = await scheduler_client.submit_job(
-            job_description=JobDescriptionModel(**job.job_param),
-            username=username,
-            jwt_token=access_token,
-        )
-    async with s3_client_public:
-        get_download_url = await _generate_presigned_url(
-            s3_client_public,
-            "get_object",
-            {"Bucket": username, "Key": object_name},
-        )
+    job = JobHelper(
+        f"{work_dir}/{username}",
+        _build_script(
+            "slurm_job_uploader_multipart.sh",
+            parameters,
+        ),
+        "OutgressFileTransfer",
+    )
+    get_download_url = None
+    job_id = await scheduler_client.submit_job(
+        job_description=JobDescriptionModel(**job.job_param),
+        username=username,
+        jwt_token=access_token,
+    )
+    get_download_url = await _generate_presigned_url(
+        s3_client_public,
+        "get_object",
+        {"Bucket": username, "Key": object_name},
+    )
     return {
         "downloadUrl": get_download_url,
         "transferJob": TransferJob(
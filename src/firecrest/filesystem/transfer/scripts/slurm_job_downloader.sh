@@ -7,6 +7,69 @@
 
 {{ sbatch_directives }}
 
+# Download attempts per part, and delay (doubled after each failure) in seconds
+MAX_ATTEMPTS=5
+RETRY_DELAY=2
+
+# Download a byte range of the file and write it in place in the target file
+# Parameters:
+# $1: part id (the first part is 1)
+function download_part() {
+    local part_i=$1
+    local headers_file="$work_dir/$part_i.headers"
+    local dd_file="$work_dir/$part_i.dd"
+    local range_from=$(( (part_i - 1) * range_length ))
+    local range_to=$(( range_from + range_length - 1 ))
+    local attempt=1
+    local delay=$RETRY_DELAY
+    local content_range
+    local range
+    local first
+    local last
+    local written
+
+    while true
+    do
+        curl --silent --fail -D "$headers_file" --range "$range_from-$range_to" "{{ download_url | safe }}" \
+            | LC_ALL=C dd of="$target_file" bs=1M oflag=seek_bytes seek="$range_from" conv=notrunc 2> "$dd_file"
+        if [[ ${PIPESTATUS[0]} -eq 0 && ${PIPESTATUS[1]} -eq 0 ]];
+        then
+            written=$(awk '/bytes/ { print $1 }' "$dd_file")
+            content_range=$(grep -i "^Content-Range:" "$headers_file" | tr -d '\r')
+            if [[ -z "$content_range" ]];
+            then
+                # Ranges not supported: the whole file is received with the first part
+                if [[ "$part_i" -eq 1 ]];
+                then
+                    echo "$written" > "$work_dir/$part_i.ok"
+                    return 0
+                fi
+            else
+                # Content-Range: bytes <first>-<last>/<size>
+                range=${content_range##* }
+                first=${range%%-*}
+                last=${range#*-}
+                last=${last%%/*}
+                if [[ "$first" -eq "$range_from" && "$written" -eq $(( last - first + 1 )) ]];
+                then
+                    # Bytes written, added up to verify the size of the file
+                    echo "$written" > "$work_dir/$part_i.ok"
+                    return 0
+                fi
+            fi
+        fi
+        if [ "$attempt" -ge "$MAX_ATTEMPTS" ];
+        then
+            echo $(date -u) "Download failed: part $part_i" >&2
+            return 1
+        fi
+        echo $(date -u) "Download of part $part_i failed (attempt $attempt), retrying in ${delay}s"
+        sleep "$delay"
+        attempt=$(( attempt + 1 ))
+        delay=$(( delay * 2 ))
+    done
+}
+
 echo $(date -u) "Ingress File Transfer Job (id:${SLURM_JOB_ID:-${PBS_JOBID:-unknown}})"
 echo $(date -u) "Waiting till file to tranfer is available..."
 for i in `seq 1440`
@@ -18,44 +81,61 @@ do
             echo $(date -u) "Downloading file to: {{ target_path }} ..."
 
             range_length={{ max_part_size }}
+            parallel_run={{ parallel_runs }}
             target_file="{{ target_path }}"
-
-            download_complete="false"
-            downloaded_data_count=0
-            range_from=0
-            part_i=1
-            headers_file=$(mktemp)
+            work_dir=$(mktemp -d)
 
             if [[ -e "$target_file" ]]; then rm "$target_file"; fi
 
-            while [[ "$download_complete" != "true" ]];
-            do
-                part_file="$target_file.$part_i"
-                range_to=$(( range_from + range_length - 1 ))
-
-                http_code=$(curl --compressed --silent -D "$headers_file" --output "$part_file" --range "$range_from-$range_to" -w "%{http_code}" "{{ download_url | safe }}")
-                content_range=$(grep -i "Content-Range" "$headers_file")
+            # The first part gives the size of the file
+            if ! download_part 1;
+            then
+                rm -r "$work_dir"
+                exit 1
+            fi
+            content_range=$(grep -i "^Content-Range:" "$work_dir/1.headers" | tr -d '\r')
+            if [[ -n "$content_range" ]];
+            then
                 file_length=$(echo ${content_range##*/} | tr -cd '[:digit:]')
-                content_length=$(grep -i "Content-Length" "$headers_file")
-                data_length=$(echo ${content_length##*:} | tr -cd '[:digit:]')
+                num_parts=$(( (file_length + range_length - 1) / range_length ))
+            else
+                # The whole file was received with the first part
+                file_length=$(cat "$work_dir/1.ok")
+                num_parts=1
+            fi
+            echo $(date -u) "Downloading $file_length bytes in $num_parts parts"
 
-                if [[ "$http_code" == "200" || "$http_code" == "206" ]]; then
-                    downloaded_data_count=$(( downloaded_data_count + data_length ))
-                    remaining=$(( file_length - downloaded_data_count ))
-                    if [[ "$remaining" -le "0" ]]; then download_complete="true" ; fi
-                    # enqueue file, remove part
-                    cat "$part_file" >> "$target_file"
-                    rm "$part_file"
-                else
-                    echo $(date -u) "Download failed: part $part_i" >&2
-                    rm "$headers_file"
-                    exit 1
-                fi
-                range_from=$(( range_to + 1 ))
-                part_i=$(( part_i + 1 ))
+            # Preallocate the target file, the other parts are written in place
+            fallocate -l "$file_length" "$target_file" 2>/dev/null || truncate -s "$file_length" "$target_file"
+
+            # Sliding window: a new part starts as soon as any other ends
+            for part_i in $(seq 2 "$num_parts")
+            do
+                ( download_part "$part_i" || touch "$work_dir/$part_i.failed" ) &
+                while [[ $(jobs -rp | wc -l) -ge $parallel_run ]]
+                do
+                    # wait -n requires bash 4.3, older versions poll
+                    wait -n 2>/dev/null || sleep 1
+                done
             done
+            wait
+
+            if compgen -G "$work_dir/*.failed" > /dev/null;
+            then
+                rm -r "$work_dir"
+                exit 1
+            fi
+            # The target file was preallocated, its size is the sum of the
+            # bytes written by every part
+            downloaded_data_count=$(cat "$work_dir"/*.ok | awk '{ total += $1 } END { print total + 0 }')
+            if [[ "$downloaded_data_count" -ne "$file_length" ]];
+            then
+                echo $(date -u) "Download failed: received $downloaded_data_count of $file_length bytes" >&2
+                rm -r "$work_dir"
+                exit 1
+            fi
             echo $(date -u) "Received $downloaded_data_count bytes"
-            rm "$headers_file"
+            rm -r "$work_dir"
 
             # Convert to MB to make logs more readable
             download_bytes=$(echo | awk -v download_bytes="$downloaded_data_count" ' { printf "%0.3f\n", (download_bytes/1024/1024); } ')
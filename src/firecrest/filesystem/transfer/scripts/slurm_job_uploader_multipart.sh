@@ -12,6 +12,9 @@
 # GLOBAL CONFIGURATION
 BLOCK_SIZE=1048576
 MAX_PART_SIZE={{ F7T_MAX_PART_SIZE }}
+# Upload attempts per part, and delay (doubled after each failure) in seconds
+MAX_ATTEMPTS=5
+RETRY_DELAY=2
 
 # Global parts array
 parts_url=({{ F7T_MP_PARTS_URL | safe }})
@@ -98,24 +101,64 @@ function job_upload() {
     local part_id=$2
     local part_url=$3
     local data
-    
+    local attempt=1
+    local delay=$RETRY_DELAY
+
     echo "[INFO] Uploading part $part_id..."
 
-    # Upload data with curl and extract ETag
-    if ! data=$(curl -s -D - --upload-file "$part_file" "$part_url" | grep -i "^ETag: ");
-    then
-        # Non-blocking error notification
-        # (.result file not generated and evaluated later, part file still in transfer directory)
-        >&2 echo "error_curl part $part_id"
-    else
-        # Create .result file and remove uploaded part file
-        echo "$data" > "$(get_part_result_filename "$part_file")"
-        rm "$part_file"
-    fi
+    while true
+    do
+        # Upload data with curl and extract ETag
+        if data=$(curl -s -D - -o /dev/null --upload-file "$part_file" "$part_url" | grep -i "^ETag: ");
+        then
+            # Create .result file and remove uploaded part file
+            echo "$data" > "$(get_part_result_filename "$part_file")"
+            rm "$part_file"
+            return 0
+        fi
+        if [ "$attempt" -ge "$MAX_ATTEMPTS" ];
+        then
+            # Non-blocking error notification
+            # (.result file not generated and evaluated later, part file still in transfer directory)
+            >&2 echo "error_curl part $part_id"
+            return 1
+        fi
+        echo "[INFO] Upload of part $part_id failed (attempt $attempt), retrying in ${delay}s"
+        sleep "$delay"
+        attempt=$(( attempt + 1 ))
+        delay=$(( delay * 2 ))
+    done
+}
+
+# Wait until less than the given number of upload jobs are running, reporting
+# the progress every time an upload ends (in the caller's "reported" variable)
+# Parameters:
+# $1: maximum number of running jobs
+# $2: number of started jobs
+# $3: number of jobs to start
+function wait_for_slot() {
+    local max_running=$1
+    local started=$2
+    local total=$3
+    local running
+
+    while true
+    do
+        running=$(jobs -rp | wc -l)
+        if [[ $(( started - running )) -gt $reported ]];
+        then
+            reported=$(( started - running ))
+            echo "[INFO] Progress: $reported/$total parts processed (${SECONDS}s)"
+        fi
+        [[ $running -lt $max_running ]] && break
+        # wait -n requires bash 4.3, older versions poll
+        wait -n 2>/dev/null || sleep 1
+    done
 }
 
 # Upload control loop
-# Execute concurrent upload based on the selection (with or without generation of part files).
+# Execute concurrent upload based on the selection (with or without generation of part files),
+# keeping up to the given number of uploads running.
 # Parameters:
 # $1: input file
 # $2: number of parts
@@ -133,37 +176,44 @@ function upload_loop() {
     local parallel_run=$6
     local blocks_per_part=$7 # requested only if part_file_generated == false
     local p
-    local i
     local part_url
+    local started=0
+    local reported=0
+    local total=$num_parts
 
-    p=1
-    while [[ $p -le $num_parts ]]
-    do
-        i=0
-        while [[ $i -lt $parallel_run && $p -le $num_parts ]]
+    if [ "$part_file_generated" = true ];
+    then
+        # Only the existing part files are uploaded
+        total=0
+        for p in $(seq 1 "$num_parts")
         do
-            # Unique name for temporary part
-            part_file=$(get_part_filename "$part_path" "$padding" $p)
-            part_url="${parts_url[$(( p - 1 ))]}"
-            if [ "$part_file_generated" = false ];
-            then
-                # Generate part file and upload
-                job_dd "$input_file" "$part_file" "$blocks_per_part" $p "$part_url" &
-            else
-                # Process upload only if part file exists
-                if [ -f "$part_file" ];
-                then
-                    # Launch upload job for existing parts
-                    job_upload "$part_file" $p "$part_url" &
-                fi
-            fi
-            # Next part
-            ((i++))
-            ((p++))
+            [ -f "$(get_part_filename "$part_path" "$padding" "$p")" ] && total=$(( total + 1 ))
         done
-        # Sync concurrent running upload background jobs
-        wait
+    fi
+
+    # Sliding window: a new upload starts as soon as any other ends
+    for p in $(seq 1 "$num_parts")
+    do
+        # Unique name for temporary part
+        part_file=$(get_part_filename "$part_path" "$padding" "$p")
+        part_url="${parts_url[$(( p - 1 ))]}"
+        if [ "$part_file_generated" = false ];
+        then
+            # Generate part file and upload
+            job_dd "$input_file" "$part_file" "$blocks_per_part" "$p" "$part_url" &
+        elif [ -f "$part_file" ];
+        then
+            # Launch upload job for existing parts
+            job_upload "$part_file" "$p" "$part_url" &
+        else
+            continue
+        fi
+        started=$(( started + 1 ))
+        wait_for_slot "$parallel_run" "$started" "$total"
     done
+    # Sync the remaining upload background jobs
+    wait_for_slot 1 "$started" "$total"
+    wait
 }
 
 # ----------------------------------------------------------------------- #
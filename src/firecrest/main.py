@@ -19,6 +19,8 @@ from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from firecrest.status.health_check.health_checker_cluster import ClusterHealthChecker
 from firecrest.status.health_check.health_checker_storage import StorageHealthChecker
+from firecrest.compute.job_events import JobEventsPoller
+from firecrest.status.status_snapshots import StatusSnapshots
 from starlette_context import plugins
 from starlette_context.middleware import RawContextMiddleware
 
@@ -35,7 +37,9 @@ from lib.handlers.api_response_handler import (
     meta_headers_handler,
 )
 from lib.ssh_clients.ssh_keygen_client import SSHKeygenClient
-from firecrest.dependencies import SSHClientDependency
+from lib.auth.authN.jwks_store import JWKSStore
+from lib.auth.authZ.open_fga_client import OpenFGAClient
+from firecrest.dependencies import S3ClientDependency, SSHClientDependency
 
 # routers
 from firecrest.status.router import (
@@ -101,14 +105,22 @@ async def lifespan(app: FastAPI):
     # Init Slurm REST Client
     await SlurmRestClient.get_aiohttp_client()
     await SSHKeygenClient.get_aiohttp_client()
+    if settings.auth.authorization:
+        await OpenFGAClient.get_aiohttp_client()
+    if settings.storage:
+        await S3ClientDependency.open_s3_clients()
     async with app.state.scheduler as scheduler:
         await schedule_tasks(scheduler)
         await scheduler.start_in_background()
         yield
         await scheduler.stop()
+    JobEventsPoller.stop_pollers()
     # Clean up Slurm REST Client
     await SlurmRestClient.close_aiohttp_client()
     await SSHKeygenClient.close_aiohttp_client()
+    await JWKSStore.close_stores()
+    await OpenFGAClient.close_aiohttp_client()
+    await S3ClientDependency.close_s3_clients()
 
 
 async def schedule_tasks(scheduler: AsyncScheduler):
@@ -119,12 +131,24 @@ async def schedule_tasks(scheduler: AsyncScheduler):
                 IntervalTrigger(seconds=cluster.probing.interval),
                 id=f"check-cluster-{cluster.name}",
             )
+        if cluster.status_snapshots:
+            await scheduler.add_schedule(
+                StatusSnapshots(cluster).refresh,
+                IntervalTrigger(seconds=cluster.status_snapshots.interval),
+                id=f"refresh-status-{cluster.name}",
+            )
     if settings.storage and settings.storage.probing:
         await scheduler.add_schedule(
             StorageHealthChecker(settings.storage).check,
             IntervalTrigger(seconds=settings.storage.probing.interval),
             id="check-storage",
         )
+    # The first run loads the public keys in background at startup
+    await scheduler.add_schedule(
+        JWKSStore.refresh_stores,
+        IntervalTrigger(seconds=settings.auth.authentication.keys_refresh_interval),
+        id="refresh-public-keys",
+    )
     await scheduler.add_schedule(
         SSHClientDependency.prune_client_pools,
         IntervalTrigger(seconds=5),
@@ -24,11 +24,10 @@ class S3HealthCheck(HealthCheckBase):
         health = S3ServiceHealth(service_type="s3")
         health.healthy = True
 
-        async with await S3ClientDependency(
+        s3_client = await S3ClientDependency(
             connection=S3ClientConnectionType.private
-        )() as s3_client:
-
-            await s3_client.list_buckets(MaxBuckets=1)
+        )()
+        await s3_client.list_buckets(MaxBuckets=1)
 
         return health
 
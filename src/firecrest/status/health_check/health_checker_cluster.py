@@ -20,7 +20,7 @@ from firecrest.status.health_check.checks.health_check_ssh import (
 )
 from lib.auth.authN.OIDC_token_auth import OIDCTokenAuth
 from lib.scheduler_clients.scheduler_base_client import SchedulerBaseClient
-from authlib.integrations.httpx_client import AsyncOAuth2Client
+from firecrest.status.service_account import fetch_service_account_token
 from firecrest.plugins import settings
 
 
@@ -34,23 +34,16 @@ class ClusterHealthChecker:
         self.cluster = cluster
         if token_decoder is None:
             self.token_decoder = OIDCTokenAuth(
-                settings.auth.authentication.public_certs
+                settings.auth.authentication.public_certs,
+                settings.auth.authentication.keys_min_refresh_interval,
             )
         else:
             self.token_decoder = token_decoder
 
     async def check(self) -> None:
         try:
-            client = AsyncOAuth2Client(
-                self.cluster.service_account.client_id,
-                self.cluster.service_account.secret.get_secret_value(),
-            )
-
-            token = await client.fetch_token(
-                url=settings.auth.authentication.token_url,
-                grant_type="client_credentials",
-            )
-            auth = self.token_decoder.auth_from_token(token["access_token"])
+            token = await fetch_service_account_token(self.cluster)
+            auth = await self.token_decoder.auth_from_token(token["access_token"])
             checks = []
             sechedulerCheck = SchedulerHealthCheck(
                 system=self.cluster,
@@ -18,9 +18,29 @@ from lib.scheduler_clients.models import (
 )
 
 
+class SSHPoolStats(CamelModel):
+    users: int
+    clients: int
+    max_clients: int
+    connecting: int
+    open_channels: int
+    max_channels: int
+    waiting: int
+    evictions: int
+
+
+class TokenCacheStats(CamelModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+
+
 class GetLiveness(CamelModel):
     healthcheck_runs: Dict[str, datetime] = None
     last_update: int = None
+    ssh_pools: Dict[str, SSHPoolStats] = None
+    token_cache: Optional[TokenCacheStats] = None
 
 
 class GetSystemsResponse(CamelModel):
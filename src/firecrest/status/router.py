@@ -4,15 +4,17 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from datetime import datetime, timezone
-from fastapi import Depends, HTTPException, Path, status
+from fastapi import Depends, HTTPException, Path, Query, Response, status
 from typing import Annotated, Any
 
 # configs
 from firecrest.config import HPCCluster, HealthCheckType
 from firecrest.status.commands.id_command import IdCommand
+from firecrest.status.status_snapshots import StatusSnapshots
 from firecrest.plugins import settings
 
 # helpers
+from lib.auth.authN.OIDC_token_auth import OIDCTokenAuth
 from lib.helpers.api_auth_helper import ApiAuthHelper
 from lib.helpers.router_helper import create_router
 
@@ -54,6 +56,30 @@ router_liveness = create_router(
 )
 
 
+FRESH_DESCRIPTION = (
+    "Query the scheduler as the calling user instead of serving the shared "
+    "snapshot of the system (when configured)"
+)
+
+
+def _status_snapshot(system_name: str, kind: str, fresh: bool, response: Response):
+    # The age of the snapshot (seconds) is reported in the `Age` header
+    if fresh:
+        return None
+    cluster = next(
+        (cluster for cluster in settings.clusters if cluster.name == system_name),
+        None,
+    )
+    if cluster is None:
+        return None
+    snapshot = StatusSnapshots.get(cluster, kind)
+    if snapshot is None:
+        return None
+    data, age = snapshot
+    response.headers["Age"] = str(age)
+    return data
+
+
 @router.get(
     "/systems",
     description="Get the list of systems and health status",
@@ -73,12 +99,23 @@ async def get_systems() -> Any:
     response_description="Nodes list returned successfully",
 )
 async def get_system_nodes(
+    response: Response,
+    system_name: Annotated[str, Path(description="Target system")],
     scheduler_client: Annotated[
         SchedulerBaseClient,
         Path(alias="system_name", description="Target system"),
         Depends(SchedulerClientDependency(ignore_health=True)),
     ] = None,
+    fresh: Annotated[
+        bool,
+        Query(description=FRESH_DESCRIPTION),
+    ] = False,
 ) -> Any:
+    snapshot = _status_snapshot(system_name, "nodes", fresh, response)
+    # Note: an empty snapshot falls back to the scheduler, like for a 404
+    if snapshot:
+        return {"nodes": snapshot}
+
     username = ApiAuthHelper.get_auth().username
     access_token = ApiAuthHelper.get_access_token()
     try:
@@ -104,12 +141,22 @@ async def get_system_nodes(
     response_description="Reservations list returned successfully",
 )
 async def get_system_reservations(
+    response: Response,
+    system_name: Annotated[str, Path(description="Target system")],
     scheduler_client: Annotated[
         SchedulerBaseClient,
         Path(alias="system_name", description="Target system"),
         Depends(SchedulerClientDependency(ignore_health=True)),
     ] = None,
+    fresh: Annotated[
+        bool,
+        Query(description=FRESH_DESCRIPTION),
+    ] = False,
 ) -> Any:
+    snapshot = _status_snapshot(system_name, "reservations", fresh, response)
+    if snapshot is not None:
+        return {"reservations": snapshot}
+
     username = ApiAuthHelper.get_auth().username
     access_token = ApiAuthHelper.get_access_token()
     try:
@@ -131,12 +178,22 @@ async def get_system_reservations(
     response_description="Partitions list returned successfully",
 )
 async def get_system_partitions(
+    response: Response,
+    system_name: Annotated[str, Path(description="Target system")],
     scheduler_client: Annotated[
         SchedulerBaseClient,
         Path(alias="system_name", description="Target system"),
         Depends(SchedulerClientDependency(ignore_health=True)),
     ] = None,
+    fresh: Annotated[
+        bool,
+        Query(description=FRESH_DESCRIPTION),
+    ] = False,
 ) -> Any:
+    snapshot = _status_snapshot(system_name, "partitions", fresh, response)
+    if snapshot is not None:
+        return {"partitions": snapshot}
+
     username = ApiAuthHelper.get_auth().username
     access_token = ApiAuthHelper.get_access_token()
     try:
@@ -200,4 +257,19 @@ async def get_liveness() -> Any:
                 oldest_check = time_difference
             healthcheck_runs[cluster.name] = cluster.servicesHealth[0].last_checked
 
-    return {"healthcheck_runs": healthcheck_runs, "last_update": oldest_check}
+    ssh_pools = {
+        system_name: client_pool.stats()
+        for system_name, client_pool in SSHClientDependency.client_pools.items()
+    }
+
+    token_cache = None
+    authN = getattr(APIAuthDependency, "globalAuthN", None)
+    if isinstance(authN, OIDCTokenAuth):
+        token_cache = authN.cache_stats()
+
+    return {
+        "healthcheck_runs": healthcheck_runs,
+        "last_update": oldest_check,
+        "ssh_pools": ssh_pools,
+        "token_cache": token_cache,
+    }
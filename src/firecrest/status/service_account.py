@@ -0,0 +1,20 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+from authlib.integrations.httpx_client import AsyncOAuth2Client
+
+from firecrest.config import HPCCluster
+from firecrest.plugins import settings
+
+
+async def fetch_service_account_token(cluster: HPCCluster) -> dict:
+    client = AsyncOAuth2Client(
+        cluster.service_account.client_id,
+        cluster.service_account.secret.get_secret_value(),
+    )
+    return await client.fetch_token(
+        url=settings.auth.authentication.token_url,
+        grant_type="client_credentials",
+    )
@@ -0,0 +1,83 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from firecrest.config import HPCCluster
+from firecrest.dependencies import SchedulerClientDependency
+from firecrest.plugins import settings
+from firecrest.status.service_account import fetch_service_account_token
+from lib.auth.authN.OIDC_token_auth import OIDCTokenAuth
+
+
+logger = logging.getLogger(__name__)
+
+
+class StatusSnapshots:
+    """Nodes, partitions and reservations of a cluster, shared by all users.
+
+    The snapshots are refreshed in background with the service account, by
+    the same scheduler running the health checks.
+    """
+
+    # Snapshots (data, timestamp) by system name and kind
+    snapshots: Dict[str, Dict[str, Tuple[Any, float]]] = {}
+
+    @classmethod
+    def get(cls, cluster: HPCCluster, kind: str) -> Optional[Tuple[Any, int]]:
+        # Returns the snapshot data and its age in seconds
+        if cluster.status_snapshots is None:
+            return None
+        snapshot = cls.snapshots.get(cluster.name, {}).get(kind)
+        if snapshot is None:
+            return None
+        data, timestamp = snapshot
+        age = int(time.time() - timestamp)
+        if age > cluster.status_snapshots.max_age:
+            return None
+        return data, age
+
+    def __init__(self, cluster: HPCCluster, token_decoder: OIDCTokenAuth = None):
+        self.cluster = cluster
+        if token_decoder is None:
+            self.token_decoder = OIDCTokenAuth(
+                settings.auth.authentication.public_certs,
+                settings.auth.authentication.keys_min_refresh_interval,
+            )
+        else:
+            self.token_decoder = token_decoder
+
+    async def refresh(self) -> None:
+        token = await fetch_service_account_token(self.cluster)
+        auth = await self.token_decoder.auth_from_token(token["access_token"])
+        scheduler_client = await SchedulerClientDependency(ignore_health=True)(
+            system_name=self.cluster.name
+        )
+
+        queries = {
+            "nodes": scheduler_client.get_nodes,
+            "partitions": scheduler_client.get_partitions,
+            "reservations": scheduler_client.get_reservations,
+        }
+        results = await asyncio.gather(
+            *[
+                query(username=auth.username, jwt_token=token["access_token"])
+                for query in queries.values()
+            ],
+            return_exceptions=True,
+        )
+
+        snapshots = StatusSnapshots.snapshots.setdefault(self.cluster.name, {})
+        for kind, result in zip(queries.keys(), results, strict=True):
+            # A failed query keeps the previous snapshot until it is too old
+            if isinstance(result, Exception):
+                logger.warning(
+                    f"Unable to refresh the {kind} of {self.cluster.name}: {result}"
+                )
+                continue
+            snapshots[kind] = (result, time.time())
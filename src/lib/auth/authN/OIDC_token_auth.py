@@ -3,56 +3,80 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
-from typing import List
-from jose import jwt, ExpiredSignatureError, JWTError, jwk
+import hashlib
+from collections import OrderedDict
+from time import time
+from typing import List, Tuple
+from jose import jwt, ExpiredSignatureError, JWTError
 from fastapi import HTTPException, status
-import requests
-from requests.adapters import HTTPAdapter, Retry
-from requests_file import FileAdapter
 
 
 # models
 from lib.auth.authN.authentication_service import AuthenticationService
+from lib.auth.authN.jwks_store import JWKSStore
 from lib.models import ApiAuthModel
 
 
 class OIDCTokenAuth(AuthenticationService):
 
-    public_keys = {}
+    def __init__(
+        self,
+        public_certs: List[str] = None,
+        min_refresh_interval: int = 10,
+        token_cache_size: int = 10000,
+    ):
+        # Public keys are loaded on first use and shared by all the
+        # decoders using the same certificates
+        self.jwks_store = JWKSStore.get_store(public_certs, min_refresh_interval)
+        # Verified tokens by digest, kept (LRU) until they expire
+        self.token_cache: OrderedDict[bytes, Tuple[ApiAuthModel, float]] = (
+            OrderedDict()
+        )
+        self.token_cache_size = token_cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
 
-    def __init__(self, public_certs: List[str] = None):
-        keys = []
-        s = requests.Session()
-        retries = Retry(total=6, backoff_factor=0.22)
-        s.mount("http://", HTTPAdapter(max_retries=retries))
-        s.mount("https://", HTTPAdapter(max_retries=retries))
-        s.mount("file://", FileAdapter())
+    def cache_stats(self):
+        return {
+            "size": len(self.token_cache),
+            "max_size": self.token_cache_size,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+        }
 
-        for url in public_certs:
-            try:
-                cert = s.get(url, timeout=2)
-                keys += cert.json()["keys"]
-            except Exception:
-                pass
+    async def auth_from_token(self, access_token: str):
+        digest = hashlib.sha256(access_token.encode()).digest()
+        cached = self.token_cache.get(digest)
+        if cached is not None:
+            auth, expiration = cached
+            if time() < expiration:
+                self.token_cache.move_to_end(digest)
+                self.cache_hits += 1
+                return auth
+            del self.token_cache[digest]
+        self.cache_misses += 1
 
-        for key in keys:
-            identifier = key.get("kid", None) or key.get("x5t", None)
-            if identifier:
-                self.public_keys[identifier] = jwk.construct(key)
+        auth, expiration = await self.verify_token(access_token)
+        if self.token_cache_size > 0 and expiration is not None:
+            self.token_cache[digest] = (auth, expiration)
+            if len(self.token_cache) > self.token_cache_size:
+                self.token_cache.popitem(last=False)
+        return auth
 
-    def auth_from_token(self, access_token: str):
+    async def verify_token(self, access_token: str):
         token_header = jwt.get_unverified_header(access_token)
         identifier = token_header.get("kid", None) or token_header.get("x5t", None)
         # Note: if kid not found throws KeyError catched by authenticate method
-        public_key = self.public_keys[identifier]
+        public_key = await self.jwks_store.get_key(identifier)
 
         options = {"verify_signature": True, "verify_aud": False, "verify_exp": True}
         decoded_token = jwt.decode(token=access_token, key=public_key, options=options)
-        return ApiAuthModel.build_from_oidc_decoded_token(decoded_token=decoded_token)
+        auth = ApiAuthModel.build_from_oidc_decoded_token(decoded_token=decoded_token)
+        return auth, decoded_token.get("exp")
 
     async def authenticate(self, access_token: str):
         try:
-            auth = self.auth_from_token(access_token)
+            auth = await self.auth_from_token(access_token)
             if not auth.is_active():
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
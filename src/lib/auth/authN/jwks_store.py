@@ -0,0 +1,130 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+import json
+import logging
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import aiohttp
+from jose import jwk
+
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSStore:
+    """Public keys of the OIDC provider, shared by every token decoder.
+
+    Keys are loaded lazily (and refreshed in background by the scheduler),
+    so that startup doesn't depend on the provider. Tokens signed with an
+    unknown key trigger a refresh, at most once every `min_refresh_interval`
+    seconds, and concurrent refreshes share the same request.
+    """
+
+    stores: Dict[Tuple[str, ...], "JWKSStore"] = {}
+
+    @classmethod
+    def get_store(
+        cls,
+        public_certs: List[str],
+        min_refresh_interval: int = 10,
+        timeout: int = 2,
+    ) -> "JWKSStore":
+        key = tuple(public_certs or [])
+        if key not in cls.stores:
+            cls.stores[key] = JWKSStore(list(key), min_refresh_interval, timeout)
+        return cls.stores[key]
+
+    @classmethod
+    async def refresh_stores(cls) -> None:
+        await asyncio.gather(*[store.refresh() for store in cls.stores.values()])
+
+    @classmethod
+    async def close_stores(cls) -> None:
+        for store in cls.stores.values():
+            await store.close()
+
+    def __init__(
+        self, public_certs: List[str], min_refresh_interval: int = 10, timeout: int = 2
+    ):
+        self.public_certs = public_certs
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        # Keys by certificate URL, a failed download keeps the previous keys
+        self.url_keys: Dict[str, Dict[str, jwk.Key]] = {}
+        self.public_keys: Dict[str, jwk.Key] = {}
+        self.last_refresh: Optional[float] = None
+        self.refreshing: Optional[asyncio.Future] = None
+        self.aiohttp_client: Optional[aiohttp.ClientSession] = None
+
+    async def get_key(self, identifier: str) -> jwk.Key:
+        if identifier not in self.public_keys:
+            await self.refresh(min_interval=self.min_refresh_interval)
+        # Note: if kid not found throws KeyError
+        return self.public_keys[identifier]
+
+    async def refresh(self, min_interval: float = 0) -> None:
+        if self.refreshing is None:
+            if (
+                self.last_refresh is not None
+                and monotonic() - self.last_refresh < min_interval
+            ):
+                return
+            self.refreshing = asyncio.ensure_future(self._load())
+        await asyncio.shield(self.refreshing)
+
+    async def close(self) -> None:
+        if self.aiohttp_client:
+            await self.aiohttp_client.close()
+            self.aiohttp_client = None
+
+    async def _load(self) -> None:
+        try:
+            results = await asyncio.gather(
+                *[self._fetch(url) for url in self.public_certs],
+                return_exceptions=True,
+            )
+            for url, result in zip(self.public_certs, results, strict=True):
+                if isinstance(result, Exception):
+                    logger.warning(
+                        f"Unable to load public certificates from {url}: {result}"
+                    )
+                    continue
+                self.url_keys[url] = result
+            self.public_keys = {
+                identifier: key
+                for keys in self.url_keys.values()
+                for identifier, key in keys.items()
+            }
+            self.last_refresh = monotonic()
+        finally:
+            self.refreshing = None
+
+    async def _fetch(self, url: str) -> Dict[str, jwk.Key]:
+        parsed_url = urlparse(url)
+        if parsed_url.scheme == "file":
+            certs = await asyncio.to_thread(self._read_file, unquote(parsed_url.path))
+        else:
+            if self.aiohttp_client is None:
+                self.aiohttp_client = aiohttp.ClientSession(
+                    timeout=aiohttp.ClientTimeout(total=self.timeout)
+                )
+            async with self.aiohttp_client.get(url) as response:
+                response.raise_for_status()
+                certs = await response.json(content_type=None)
+
+        keys = {}
+        for key in certs["keys"]:
+            identifier = key.get("kid", None) or key.get("x5t", None)
+            if identifier:
+                keys[identifier] = jwk.construct(key)
+        return keys
+
+    def _read_file(self, path: str) -> dict:
+        with open(path) as file:
+            return json.load(file)
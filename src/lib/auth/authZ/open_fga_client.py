@@ -3,14 +3,24 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
+import asyncio
 from socket import AF_INET
+from time import monotonic
+from typing import Dict, Optional, Tuple
 import aiohttp
 from fastapi import HTTPException, status
 
 from lib.auth.authZ.authorization_service import AuthorizationService
 
 
+# Expired decisions are purged when the cache grows above this size
+DECISIONS_PURGE_SIZE = 10000
+
+
 class OpenFGAClient(AuthorizationService):
+    aiohttp_client: Optional[aiohttp.ClientSession] = None
+    timeout: int = None
+    max_connections: int = 0
 
     class BearerAuth(aiohttp.BasicAuth):
         def __init__(self, token: str):
@@ -19,45 +29,99 @@ class OpenFGAClient(AuthorizationService):
         def encode(self) -> str:
             return f"Bearer {self.token}"
 
+    @classmethod
+    async def get_aiohttp_client(cls) -> aiohttp.ClientSession:
+        if cls.aiohttp_client is None:
+            timeout = aiohttp.ClientTimeout(total=cls.timeout)
+            connector = aiohttp.TCPConnector(
+                family=AF_INET, limit_per_host=cls.max_connections
+            )
+            cls.aiohttp_client = aiohttp.ClientSession(
+                timeout=timeout, connector=connector
+            )
+        return cls.aiohttp_client
+
+    @classmethod
+    async def close_aiohttp_client(cls) -> None:
+        if cls.aiohttp_client:
+            await cls.aiohttp_client.close()
+            cls.aiohttp_client = None
+
     def __init__(
-        self, url: str = None, timeout: int = None, max_connections: int = 0
+        self,
+        url: str = None,
+        timeout: int = None,
+        max_connections: int = 0,
+        cache_ttl: int = 60,
+        negative_cache_ttl: int = 10,
     ) -> None:
         self.url = url
-        self.timeout = timeout
-        self.max_connections = max_connections
+        OpenFGAClient.timeout = timeout
+        OpenFGAClient.max_connections = max_connections
+        self.cache_ttl = cache_ttl
+        self.negative_cache_ttl = negative_cache_ttl
+        # Decisions (allowed, expiration) by (username, resource_name)
+        self.decisions: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+        self.pending: Dict[Tuple[str, str], asyncio.Future] = {}
 
     async def authorize(self, username: str, resource_name: str, access_token: str):
 
         if self.url is None:
             return
 
-        auth_token = OpenFGAClient.BearerAuth(access_token)
+        key = (username, resource_name)
+        decision = self.decisions.get(key)
+        if decision is None or monotonic() >= decision[1]:
+            # Concurrent checks of the same user and resource share a request
+            if key not in self.pending:
+                self.pending[key] = asyncio.ensure_future(
+                    self._check(key, access_token)
+                )
+            decision = await asyncio.shield(self.pending[key])
 
-        try:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            connector = aiohttp.TCPConnector(
-                family=AF_INET, limit_per_host=self.max_connections
+        allowed, _ = decision
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access system",
             )
 
-            async with aiohttp.ClientSession(
-                timeout=timeout, connector=connector
-            ) as session:
-                async with session.post(
-                    url=self.url,
-                    auth=auth_token,
-                    json={
-                        "user": f"user:{username}",
-                        "relation": "member",
-                        "object": f"vcluster:{resource_name}",
-                    },
-                ) as response:
-                    if response.status != 200:
-                        raise HTTPException(
-                            status_code=status.HTTP_403_FORBIDDEN,
-                            detail="Not authorized to access system",
-                        )
+    async def _check(self, key: Tuple[str, str], access_token: str):
+        username, resource_name = key
+        try:
+            session = await self.get_aiohttp_client()
+            async with session.post(
+                url=self.url,
+                auth=OpenFGAClient.BearerAuth(access_token),
+                json={
+                    "user": f"user:{username}",
+                    "relation": "member",
+                    "object": f"vcluster:{resource_name}",
+                },
+            ) as response:
+                # Only a 200 response holds a decision, errors (e.g. an
+                # unavailable OpenFGA) are not denials
+                if response.status != 200:
+                    raise HTTPException(
+                        status_code=response.status,
+                        detail=await response.text(),
+                    )
+                allowed = (await response.json()).get("allowed") is True
         except Exception as exc:
+            # Failed checks are not cached
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Unable to verify system access authorization",
             ) from exc
+        finally:
+            del self.pending[key]
+
+        ttl = self.cache_ttl if allowed else self.negative_cache_ttl
+        decision = (allowed, monotonic() + ttl)
+        if len(self.decisions) >= DECISIONS_PURGE_SIZE:
+            now = monotonic()
+            self.decisions = {
+                key: value for key, value in self.decisions.items() if value[1] > now
+            }
+        self.decisions[key] = decision
+        return decision
@@ -4,6 +4,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from enum import Enum
+from typing import Optional
 
 from fastapi import HTTPException, status
 
@@ -20,6 +21,8 @@ class ApiAuthModel(CamelModel):
     type: ApiAuthType
     active: bool = False
     username: str = None
+    # Expiration (seconds since epoch) of the access token
+    expires_at: Optional[int] = None
 
     @staticmethod
     def build_from_oidc_decoded_token(decoded_token: dict):
@@ -37,6 +40,7 @@ class ApiAuthModel(CamelModel):
                 type=ApiAuthType.service_account,
                 username=username,
                 active=True,
+                expires_at=decoded_token.get("exp"),
             )
         return ApiAuthUser(
             type=ApiAuthType.user,
@@ -44,6 +48,7 @@ class ApiAuthModel(CamelModel):
             email=decoded_token.get("email"),
             first_name=decoded_token.get("given_name"),
             active=True,
+            expires_at=decoded_token.get("exp"),
         )
 
     def is_active(self):
@@ -33,6 +33,27 @@ class Oidc(CamelModel):
             "to verify the OIDC token."
         ),
     )
+    keys_refresh_interval: int = Field(
+        3600,
+        description=(
+            "Interval (seconds) to refresh the public certificates in background."
+        ),
+    )
+    keys_min_refresh_interval: int = Field(
+        10,
+        description=(
+            "Minimum time (seconds) between two refreshes of the public "
+            "certificates triggered by tokens signed with an unknown key."
+        ),
+    )
+    token_cache_size: int = Field(
+        10000,
+        description=(
+            "Maximum number of verified access tokens kept in memory until "
+            "they expire, to skip the signature verification of reused "
+            "tokens. When set to `0`, tokens are always verified."
+        ),
+    )
 
 
 class LoadFileSecretStr(SecretStr):
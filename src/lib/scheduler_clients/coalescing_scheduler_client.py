@@ -0,0 +1,148 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Awaitable, Callable, Tuple
+
+from lib.scheduler_clients.models import JobFilters
+from lib.scheduler_clients.scheduler_base_client import SchedulerBaseClient
+
+
+class CoalescingSchedulerClient(SchedulerBaseClient):
+    """Shares the result of identical scheduler queries.
+
+    Queries are identified by system, user, method and parameters (the access
+    token is not part of the key). Concurrent identical queries await the same
+    backend call, and its result is reused for `max_age` seconds. Job
+    submissions and cancellations drop the results cached for the user, and
+    are never coalesced.
+    """
+
+    # (system, username, method, parameters) -> (future, completion time)
+    queries: "OrderedDict[Tuple, Tuple[asyncio.Future, float | None]]" = OrderedDict()
+    max_size: int = 1000
+
+    def __init__(self, client: SchedulerBaseClient, system_name: str, max_age: float):
+        self.client = client
+        self.system_name = system_name
+        self.max_age = max_age
+
+    # Other methods (e.g. ping) are forwarded as they are
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    async def _coalesce(
+        self,
+        username: str,
+        query: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> Any:
+        key = (self.system_name, username, query.__name__, args)
+        cls = CoalescingSchedulerClient
+
+        entry = cls.queries.get(key)
+        if entry is not None:
+            future, completed = entry
+            if completed is not None and monotonic() - completed > self.max_age:
+                del cls.queries[key]
+                entry = None
+
+        if entry is None:
+            future = asyncio.ensure_future(query(*args))
+            cls.queries[key] = (future, None)
+            future.add_done_callback(lambda done: self._completed(key, done))
+            while len(cls.queries) > cls.max_size:
+                cls.queries.popitem(last=False)
+        else:
+            cls.queries.move_to_end(key)
+
+        return await asyncio.shield(future)
+
+    def _completed(self, key: Tuple, future: asyncio.Future) -> None:
+        queries = CoalescingSchedulerClient.queries
+        entry = queries.get(key)
+        if entry is None or entry[0] is not future:
+            return
+        # Failures are shared only by the queries that were waiting for them
+        if future.cancelled() or future.exception() is not None or self.max_age <= 0:
+            del queries[key]
+        else:
+            queries[key] = (future, monotonic())
+
+    def _invalidate(self, username: str) -> None:
+        queries = CoalescingSchedulerClient.queries
+        for key in [
+            key
+            for key, (_future, completed) in queries.items()
+            if key[:2] == (self.system_name, username) and completed is not None
+        ]:
+            del queries[key]
+
+    async def submit_job(self, job_description, username: str, jwt_token: str):
+        self._invalidate(username)
+        return await self.client.submit_job(job_description, username, jwt_token)
+
+    async def attach_command(
+        self, command: str, job_id: str, username: str, jwt_token: str
+    ):
+        return await self.client.attach_command(command, job_id, username, jwt_token)
+
+    async def cancel_job(self, job_id: str, username: str, jwt_token: str) -> bool:
+        self._invalidate(username)
+        return await self.client.cancel_job(job_id, username, jwt_token)
+
+    async def submit_jobs(self, job_descriptions, username: str, jwt_token: str):
+        self._invalidate(username)
+        return await self.client.submit_jobs(job_descriptions, username, jwt_token)
+
+    async def cancel_jobs(self, job_ids, username: str, jwt_token: str):
+        self._invalidate(username)
+        return await self.client.cancel_jobs(job_ids, username, jwt_token)
+
+    async def get_job(
+        self, job_id: str, username: str, jwt_token: str, allusers: bool = True
+    ):
+        async def get_job(job_id, allusers):
+            return await self.client.get_job(job_id, username, jwt_token, allusers)
+
+        return await self._coalesce(username, get_job, job_id, allusers)
+
+    async def get_job_metadata(self, job_id: str, username: str, jwt_token: str):
+        async def get_job_metadata(job_id):
+            return await self.client.get_job_metadata(job_id, username, jwt_token)
+
+        return await self._coalesce(username, get_job_metadata, job_id)
+
+    async def get_jobs(
+        self,
+        username: str,
+        jwt_token: str,
+        allusers: bool = False,
+        filters: JobFilters | None = None,
+    ):
+        async def get_jobs(allusers, filters):
+            return await self.client.get_jobs(username, jwt_token, allusers, filters)
+
+        return await self._coalesce(username, get_jobs, allusers, filters)
+
+    async def get_nodes(self, username: str, jwt_token: str):
+        async def get_nodes():
+            return await self.client.get_nodes(username, jwt_token)
+
+        return await self._coalesce(username, get_nodes)
+
+    async def get_reservations(self, username: str, jwt_token: str):
+        async def get_reservations():
+            return await self.client.get_reservations(username, jwt_token)
+
+        return await self._coalesce(username, get_reservations)
+
+    async def get_partitions(self, username: str, jwt_token: str):
+        async def get_partitions():
+            return await self.client.get_partitions(username, jwt_token)
+
+        return await self._coalesce(username, get_partitions)
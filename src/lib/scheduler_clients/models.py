@@ -4,10 +4,10 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 # models
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from lib.models import CamelModel
 
-from pydantic import Field
+from pydantic import ConfigDict, Field
 
 
 class SchedPing(CamelModel):
@@ -57,6 +57,20 @@ class JobModel(CamelModel):
     priority: Optional[int] = None
 
 
+class JobFilters(CamelModel):
+    """Job listing filters, applied by the scheduler."""
+
+    states: Optional[Tuple[str, ...]] = None
+    start_time: Optional[int] = None
+    end_time: Optional[int] = None
+    partition: Optional[str] = None
+    name: Optional[str] = None
+    account: Optional[str] = None
+
+    # Hashable, so that identical listings can be coalesced
+    model_config = ConfigDict(frozen=True)
+
+
 class JobMetadataModel(CamelModel):
     job_id: int
     script: Optional[str] = None
@@ -0,0 +1,44 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import re
+from typing import List
+from lib.exceptions import PbsError
+from lib.ssh_clients.ssh_client import BaseCommand
+
+
+class QdelBatchCommand(BaseCommand):
+    """Deletes many jobs with a single `qdel`, reporting errors per job."""
+
+    def __init__(self, username: str, job_ids: List[str]) -> None:
+        super().__init__()
+        self.username = username
+        self.job_ids = job_ids
+
+    def get_command(self) -> str:
+        cmd = ["qdel"]
+        cmd += self.job_ids
+        return " ".join(cmd)
+
+    def parse_output(self, stdout: str, stderr: str, exit_status: int = 0):
+        # e.g. "qdel: Unknown Job Id 124.pbs"
+        errors = {}
+        for line in stderr.splitlines():
+            error = re.search(r"^qdel: .* (\d+)(\.\S*)?$", line)
+            if error:
+                errors[error.group(1)] = line
+        if exit_status != 0 and not errors:
+            raise PbsError(
+                f"Unexpected PBS qdel response. exit_status:{exit_status} std_err:{stderr}"
+            )
+
+        return [
+            (
+                PbsError(f"Unexpected PBS qdel response. std_err:{errors[job_id]}")
+                if job_id.split(".")[0] in errors
+                else True
+            )
+            for job_id in self.job_ids
+        ]
@@ -3,23 +3,65 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
+from datetime import datetime, timezone
+from typing import List, Optional
 from lib.exceptions import PbsError
+from lib.scheduler_clients.models import JobFilters
 import json
 
 
 from lib.scheduler_clients.pbs.cli_commands.qstat_base import QstatBaseCommand
 
 
+def _format_utc(timestamp: int):
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y%m%d%H%M.%S")
+
+
 class QstatCommand(QstatBaseCommand):
 
+    def __init__(
+        self,
+        username: str = None,
+        ids: Optional[List[str]] = None,
+        allusers: bool = True,
+        filters: Optional[JobFilters] = None,
+    ) -> None:
+        super().__init__(username, ids, allusers)
+        self.filters = filters
+
     def get_command(self):
         cmd = super().get_command() + " -x"
         # For some reason qstat ignores the json format when using the -u
-        # option, so we have to filter the output ourselves during the
-        # parsing.
-        # if not self.allusers:
-        #     cmd += f" -u {self.username}"
-        return cmd
+        # option, so the jobs of a listing are selected with qselect and
+        # the output is still filtered by owner during the parsing.
+        if self.ids or (self.allusers and self.filters is None):
+            return cmd
+
+        qselect = ["qselect", "-x"]
+        if not self.allusers:
+            qselect += [f"-u '{self.username}'"]
+        filters = self.filters or JobFilters()
+        if filters.states:
+            qselect += [f"-s '{''.join(filters.states)}'"]
+        if filters.partition:
+            qselect += [f"-q '{filters.partition}'"]
+        if filters.name:
+            qselect += [f"-N '{filters.name}'"]
+        if filters.account:
+            qselect += [f"-A '{filters.account}'"]
+        # Jobs modified after the start of the window and queued before its end
+        if filters.start_time is not None:
+            qselect += [f"-tm.ge.{_format_utc(filters.start_time)}"]
+        if filters.end_time is not None:
+            qselect += [f"-tq.le.{_format_utc(filters.end_time)}"]
+        if filters.start_time is not None or filters.end_time is not None:
+            qselect.insert(0, "TZ=UTC")
+
+        return (
+            f"ids=$({' '.join(qselect)}) && "
+            f"if [ -n \"$ids\" ]; then {super().get_command()} $ids -x; "
+            "else echo '{}'; fi"
+        )
 
     def parse_output(self, stdout: str, stderr: str, exit_status: int = 0):
         if exit_status != 0:
@@ -14,6 +14,9 @@ from lib.scheduler_clients.pbs.cli_commands.qstat_job_metadata_command import (
 )
 
 from lib.scheduler_clients.pbs.cli_commands.qdel_command import QdelCommand
+from lib.scheduler_clients.pbs.cli_commands.qdel_batch_command import (
+    QdelBatchCommand,
+)
 from lib.scheduler_clients.pbs.cli_commands.pbsnodes_command import PbsnodesCommand
 
 from lib.scheduler_clients.pbs.cli_commands.rstat_reservations_command import (
@@ -26,6 +29,7 @@ from lib.scheduler_clients.pbs.cli_commands.pbs_partitions_command import (
 from lib.scheduler_clients.pbs.cli_commands.ping_command import PbsPingCommand
 
 # models
+from lib.scheduler_clients.models import JobFilters
 from lib.scheduler_clients.pbs.models import (
     PbsJob,
     PbsJobDescription,
@@ -104,16 +108,29 @@ class PbsClient(SchedulerBaseClient):
         return result
 
     async def get_jobs(
-        self, username: str, jwt_token: str, allusers: bool = False
+        self,
+        username: str,
+        jwt_token: str,
+        allusers: bool = False,
+        filters: JobFilters | None = None,
     ) -> List[PbsJob] | None:
-        return await self.get_job(
-            job_id=None, username=username, allusers=allusers, jwt_token=jwt_token
-        )
+        qstat = QstatCommand(username, None, allusers, filters)
+        result = await self.__executed_ssh_cmd(username, jwt_token, qstat)
+        # Apply PBS model
+        if result:
+            result = [PbsJob.model_validate(job) for job in result]
+        return result
 
     async def cancel_job(self, job_id: str, username: str, jwt_token: str) -> bool:
         qdel = QdelCommand(username=username, job_id=job_id)
         return await self.__executed_ssh_cmd(username, jwt_token, qdel)
 
+    async def cancel_jobs(
+        self, job_ids: List[str], username: str, jwt_token: str
+    ) -> List[bool | Exception]:
+        qdel = QdelBatchCommand(username=username, job_ids=job_ids)
+        return await self.__executed_ssh_cmd(username, jwt_token, qdel)
+
     async def get_nodes(self, username: str, jwt_token: str) -> List[PbsNode] | None:
         nodes = PbsnodesCommand()
         res = await self.__executed_ssh_cmd(username, jwt_token, nodes)
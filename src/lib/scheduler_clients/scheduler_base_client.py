@@ -3,11 +3,13 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
-from typing import List
+import asyncio
+from typing import Any, List
 from abc import ABC, abstractmethod
 
 # models
 from lib.scheduler_clients.models import (
+    JobFilters,
     JobMetadataModel,
     JobModel,
     JobDescriptionModel,
@@ -16,6 +18,9 @@ from lib.scheduler_clients.models import (
     ReservationModel,
 )
 
+# Maximum number of concurrent scheduler calls of a batch request
+BATCH_CONCURRENCY = 8
+
 
 class SchedulerBaseClient(ABC):
 
@@ -61,7 +66,8 @@ class SchedulerBaseClient(ABC):
         self,
         username: str,
         jwt_token: str,
-        allusers: bool = False
+        allusers: bool = False,
+        filters: JobFilters | None = None,
     ) -> List[JobModel] | None:
         pass
 
@@ -84,3 +90,39 @@ class SchedulerBaseClient(ABC):
         self, username: str, jwt_token: str
     ) -> List[PartitionModel] | None:
         pass
+
+    # Batch operations return the result of every item, or the exception it
+    # raised. By default the items are processed with bounded concurrency
+    # over the same (per-user) connection.
+
+    async def submit_jobs(
+        self,
+        job_descriptions: List[JobDescriptionModel],
+        username: str,
+        jwt_token: str,
+    ) -> List[int | str | None | Exception]:
+        return await _bounded_gather(
+            [
+                self.submit_job(job_description, username, jwt_token)
+                for job_description in job_descriptions
+            ]
+        )
+
+    async def cancel_jobs(
+        self, job_ids: List[str], username: str, jwt_token: str
+    ) -> List[bool | Exception]:
+        return await _bounded_gather(
+            [self.cancel_job(job_id, username, jwt_token) for job_id in job_ids]
+        )
+
+
+async def _bounded_gather(coroutines: List) -> List[Any]:
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def bounded(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(
+        *[bounded(coroutine) for coroutine in coroutines], return_exceptions=True
+    )
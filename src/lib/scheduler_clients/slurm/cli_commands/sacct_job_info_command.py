@@ -4,8 +4,10 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 # commands
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import List
 from lib.exceptions import SlurmError
+from lib.scheduler_clients.models import JobFilters
 from lib.scheduler_clients.slurm.cli_commands.sacct_base import SacctCommandBase
 
 
@@ -26,8 +28,24 @@ def _parse_timestamp(timestr: str):
         return None
 
 
+def _format_utc(timestamp: int):
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%S"
+    )
+
+
 class SacctCommand(SacctCommandBase):
 
+    def __init__(
+        self,
+        username: str = None,
+        job_ids: List[str] = None,
+        allusers: bool = False,
+        filters: JobFilters = None,
+    ) -> None:
+        super().__init__(username, job_ids, allusers)
+        self.filters = filters
+
     def get_command(self) -> str:
         cmd = [super().get_command()]
         cmd += [
@@ -36,6 +54,25 @@ class SacctCommand(SacctCommandBase):
                 "Priority,State,Reason,ElapsedRaw,Submit,Start,End,Suspended,TimelimitRaw,User,WorkDir'"
             )
         ]
+        filters = self.filters
+        if filters is None:
+            return " ".join(cmd)
+
+        if filters.states:
+            cmd += [f"--state='{','.join(filters.states)}'"]
+        if filters.start_time is not None:
+            cmd += [f"--starttime='{_format_utc(filters.start_time)}'"]
+        if filters.end_time is not None:
+            cmd += [f"--endtime='{_format_utc(filters.end_time)}'"]
+        if filters.partition:
+            cmd += [f"--partition='{filters.partition}'"]
+        if filters.name:
+            cmd += [f"--name='{filters.name}'"]
+        if filters.account:
+            cmd += [f"--accounts='{filters.account}'"]
+        if filters.start_time is not None or filters.end_time is not None:
+            # Times are given in UTC, whatever the timezone of the cluster
+            cmd.insert(0, "TZ=UTC")
         return " ".join(cmd)
 
     def parse_output(self, stdout: str, stderr: str, exit_status: int = 0):
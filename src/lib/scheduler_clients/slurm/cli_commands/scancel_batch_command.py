@@ -0,0 +1,48 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# commands
+import re
+from typing import List
+from lib.exceptions import SlurmError
+from lib.ssh_clients.ssh_client import BaseCommand
+
+
+class ScancelBatchCommand(BaseCommand):
+    """Cancels many jobs with a single `scancel`, reporting errors per job."""
+
+    def __init__(self, username: str, job_ids: List[str]) -> None:
+        super().__init__()
+        self.username = username
+        self.job_ids = job_ids
+
+    def get_command(self) -> str:
+        cmd = ["scancel"]
+        cmd += ["--verbose"]
+        cmd += self.job_ids
+        return " ".join(cmd)
+
+    def parse_output(self, stdout: str, stderr: str, exit_status: int = 0):
+        # e.g. "scancel: error: Kill job error on job id 124: Invalid job id specified"
+        errors = {}
+        for line in stderr.splitlines():
+            error = re.search(r"error:.*job id (\S+?):\s*(.*)", line, re.IGNORECASE)
+            if error:
+                errors[error.group(1)] = line
+        if exit_status != 0 and not errors:
+            raise SlurmError(
+                f"Unexpected Slurm command response. exit_status:{exit_status} std_err:{stderr}"
+            )
+
+        return [
+            (
+                SlurmError(
+                    f"Unexpected Slurm command response. std_err:{errors[job_id]}"
+                )
+                if job_id in errors
+                else True
+            )
+            for job_id in self.job_ids
+        ]
@@ -5,6 +5,7 @@
 
 from abc import abstractmethod
 from typing import List
+from lib.scheduler_clients.models import JobFilters
 from lib.scheduler_clients.scheduler_base_client import SchedulerBaseClient
 from lib.scheduler_clients.slurm.models import (
     SlurmJob,
@@ -53,7 +54,11 @@ class SlurmBaseClient(SchedulerBaseClient):
 
     @abstractmethod
     async def get_jobs(
-        self, username: str, jwt_token: str, allusers: bool = False
+        self,
+        username: str,
+        jwt_token: str,
+        allusers: bool = False,
+        filters: JobFilters | None = None,
     ) -> List[SlurmJob] | None:
         pass
 
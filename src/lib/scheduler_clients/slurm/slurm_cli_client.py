@@ -3,11 +3,11 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
-import asyncio
 from typing import List
 from packaging.version import Version
 
 # models
+from lib.scheduler_clients.models import JobFilters
 from lib.scheduler_clients.slurm.cli_commands.sacct_batch_script_command import (
     SacctBatchScriptCommand,
 )
@@ -16,6 +16,9 @@ from lib.scheduler_clients.slurm.cli_commands.sacct_job_metadata_command import
     SacctJobMetadataCommand,
 )
 from lib.scheduler_clients.slurm.cli_commands.sbatch_command import SbatchCommand
+from lib.scheduler_clients.slurm.cli_commands.scancel_batch_command import (
+    ScancelBatchCommand,
+)
 from lib.scheduler_clients.slurm.cli_commands.scancel_command import ScancelCommand
 from lib.scheduler_clients.slurm.cli_commands.scontrol_batch_script_command import (
     ScontrolBatchScriptCommand,
@@ -44,6 +47,7 @@ from lib.scheduler_clients.slurm.models import (
 
 # clients
 from lib.scheduler_clients.slurm.slurm_base_client import SlurmBaseClient
+from lib.ssh_clients.framed_command import FramedCommand
 from lib.ssh_clients.ssh_client import SSHClientPool
 
 
@@ -102,22 +106,19 @@ class SlurmCliClient(SlurmBaseClient):
 
         scontrol = ScontrolJobCommand(job_id if job_id else None)
         scontrol_script = ScontrolBatchScriptCommand(job_id if job_id else None)
-        commands = [
-            self.__executed_ssh_cmd(username, jwt_token, scontrol),
-            self.__executed_ssh_cmd(username, jwt_token, scontrol_script),
-        ]
+        commands = [scontrol, scontrol_script]
 
         if Version(self.slurm_version) >= Version("24.05.0"):
             sacct = SacctJobMetadataCommand(username, [job_id] if job_id else None)
             sacct_script = SacctBatchScriptCommand(
                 username, [job_id] if job_id else None
             )
-            commands += [
-                self.__executed_ssh_cmd(username, jwt_token, sacct),
-                self.__executed_ssh_cmd(username, jwt_token, sacct_script),
-            ]
+            commands += [sacct, sacct_script]
 
-        results = await asyncio.gather(*commands, return_exceptions=True)
+        # All the commands run in a single remote shell, parsing errors are
+        # returned in place of the command output
+        framed = FramedCommand(commands, continue_on_error=True)
+        results = await self.__executed_ssh_cmd(username, jwt_token, framed)
 
         cmd_result_i: int = 0
 
@@ -145,16 +146,29 @@ class SlurmCliClient(SlurmBaseClient):
         return jobs
 
     async def get_jobs(
-        self, username: str, jwt_token: str, allusers: bool = False
+        self,
+        username: str,
+        jwt_token: str,
+        allusers: bool = False,
+        filters: JobFilters | None = None,
     ) -> List[SlurmJob] | None:
-        return await self.get_job(
-            job_id=None, username=username, jwt_token=jwt_token, allusers=allusers
-        )
+        sacct = SacctCommand(username, None, allusers, filters)
+        jobs = await self.__executed_ssh_cmd(username, jwt_token, sacct)
+        if jobs:
+            # Apply Slurm model
+            jobs = [SlurmJob.model_validate(job) for job in jobs]
+        return jobs
 
     async def cancel_job(self, job_id: str, username: str, jwt_token: str) -> bool:
         scancel = ScancelCommand(username, job_id)
         return await self.__executed_ssh_cmd(username, jwt_token, scancel)
 
+    async def cancel_jobs(
+        self, job_ids: List[str], username: str, jwt_token: str
+    ) -> List[bool | Exception]:
+        scancel = ScancelBatchCommand(username, job_ids)
+        return await self.__executed_ssh_cmd(username, jwt_token, scancel)
+
     async def get_nodes(self, username: str, jwt_token: str) -> List[SlurmNode] | None:
         sinfo = SinfoCommand()
         return await self.__executed_ssh_cmd(username, jwt_token, sinfo)
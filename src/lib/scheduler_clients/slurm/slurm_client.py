@@ -1,5 +1,6 @@
 from typing import List
 
+from lib.scheduler_clients.models import JobFilters
 from lib.scheduler_clients.slurm.models import (
     SlurmJob,
     SlurmJobDescription,
@@ -73,9 +74,15 @@ class SlurmClient(SlurmBaseClient):
         )
 
     async def get_jobs(
-        self, username: str, jwt_token: str, allusers: bool = False
+        self,
+        username: str,
+        jwt_token: str,
+        allusers: bool = False,
+        filters: JobFilters | None = None,
     ) -> List[SlurmJob] | None:
-        return await self.slurm_default_client.get_jobs(username, jwt_token, allusers)
+        return await self.slurm_default_client.get_jobs(
+            username, jwt_token, allusers, filters
+        )
 
     async def get_job_metadata(
         self, job_id: str, username: str, jwt_token: str
@@ -98,5 +105,10 @@ class SlurmClient(SlurmBaseClient):
     async def cancel_job(self, job_id: str, username: str, jwt_token: str) -> bool:
         return await self.slurm_default_client.cancel_job(job_id, username, jwt_token)
 
+    async def cancel_jobs(
+        self, job_ids: List[str], username: str, jwt_token: str
+    ) -> List[bool | Exception]:
+        return await self.slurm_default_client.cancel_jobs(job_ids, username, jwt_token)
+
     async def ping(self, username: str, jwt_token: str) -> List[SlurmPing] | None:
         return await self.slurm_default_client.ping(username, jwt_token)
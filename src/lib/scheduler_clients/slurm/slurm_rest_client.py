@@ -8,6 +8,7 @@ import aiohttp
 from fastapi import status
 from socket import AF_INET
 from typing import Optional, List
+from urllib.parse import urlencode
 from jose import jwt
 from packaging.version import Version
 
@@ -15,6 +16,7 @@ from packaging.version import Version
 from lib.exceptions import SlurmAuthTokenError, SlurmError
 
 # Models
+from lib.scheduler_clients.models import JobFilters
 from lib.scheduler_clients.slurm.models import (
     SlurmJob,
     SlurmJobDescription,
@@ -50,6 +52,27 @@ def _slurm_headers(username: str, jwt_token: str):
     }
 
 
+def _slurm_job_query(username: str | None, filters: JobFilters | None):
+    params = {}
+    if username:
+        params["users"] = username
+    if filters is None:
+        return params
+    if filters.states:
+        params["state"] = ",".join(filters.states)
+    if filters.start_time is not None:
+        params["start_time"] = filters.start_time
+    if filters.end_time is not None:
+        params["end_time"] = filters.end_time
+    if filters.partition:
+        params["partition"] = filters.partition
+    if filters.name:
+        params["job_name"] = filters.name
+    if filters.account:
+        params["account"] = filters.account
+    return params
+
+
 async def _slurm_unexpected_response(response):
     message = await response.text()
     raise SlurmError(
@@ -176,12 +199,19 @@ class SlurmRestClient(SlurmBaseClient):
         raise NotImplementedError("This method is not supported by the Slurm REST API")
 
     async def get_jobs(
-        self, username: str, jwt_token: str, allusers: bool = False
+        self,
+        username: str,
+        jwt_token: str,
+        allusers: bool = False,
+        filters: JobFilters | None = None,
     ) -> List[SlurmJob] | None:
         client = await self.get_aiohttp_client()
         timeout = aiohttp.ClientTimeout(total=self.timeout)
         headers = _slurm_headers(username, jwt_token)
         url = f"{self.api_url}/slurmdb/v{self.api_version}/jobs"
+        params = _slurm_job_query(None if allusers else username, filters)
+        if params:
+            url = f"{url}?{urlencode(params)}"
         async with client.get(
             url=url,
             headers=headers,
@@ -192,7 +222,7 @@ class SlurmRestClient(SlurmBaseClient):
                 await _slurm_unexpected_response(response)
             job_result = await response.json()
 
-            # Note: starting from API version v0.0.39 this filter can be set as query param
+            # Note: the users query param is ignored before API version v0.0.39
             jobs = list(
                 filter(
                     lambda job: allusers or job["user"] == username, job_result["jobs"]
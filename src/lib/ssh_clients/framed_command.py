@@ -0,0 +1,89 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import secrets
+from typing import List, Optional, Tuple
+
+from lib.ssh_clients.ssh_client import BaseCommand
+
+
+class FramedCommand(BaseCommand):
+    """Runs a sequence of commands in a single remote shell.
+
+    After every command a frame line with its index and exit status is
+    written to both stdout and stderr, so that the output of each command
+    can be parsed by the command itself.
+    """
+
+    def __init__(
+        self, commands: List[BaseCommand], continue_on_error: bool = False
+    ) -> None:
+        super().__init__()
+        self.commands = commands
+        self.continue_on_error = continue_on_error
+        # Random, so that it can't be forged by file names in the output
+        self.frame = f"==FIRECREST-BATCH-{secrets.token_hex(8)}=="
+
+    def timeout_factor(self) -> int:
+        # Every command gets the execution time of a single command
+        return max(len(self.commands), 1)
+
+    def get_command(self) -> str:
+        script = []
+        for index, command in enumerate(self.commands):
+            script.append(
+                f"{{ {command.get_command()} ; }}; s=$?; "
+                f"printf '\\n{self.frame} {index} %d\\n' $s; "
+                f"printf '\\n{self.frame} {index}\\n' >&2"
+            )
+            if not self.continue_on_error:
+                script.append("[ $s -eq 0 ] || exit $s")
+        return "; ".join(script)
+
+    def split_frames(self, output: str):
+        # Returns the output of every command and the header of its frame.
+        # Every frame is preceded by a new line that isn't part of the output
+        parts = output.split(f"\n{self.frame} ")
+        outputs = [parts[0]]
+        headers = []
+        for part in parts[1:]:
+            header, _, rest = part.partition("\n")
+            headers.append(header.split())
+            outputs.append(rest)
+        return outputs, headers
+
+    def sections(
+        self, stdout: str, stderr: str
+    ) -> List[Optional[Tuple[str, str, int]]]:
+        # stdout, stderr and exit status of every command, None for the
+        # commands not executed because of a previous error
+        stdouts, headers = self.split_frames(stdout)
+        stderrs, _ = self.split_frames(stderr)
+        # Frame header: <command index> <exit status>
+        statuses = [int(header[1]) for header in headers]
+        return [
+            (
+                (stdouts[index], stderrs[index], statuses[index])
+                if index < len(statuses)
+                else None
+            )
+            for index in range(len(self.commands))
+        ]
+
+    def parse_output(self, stdout: str, stderr: str, exit_status: int = 0):
+        # Like asyncio.gather(return_exceptions=True), parsing errors are
+        # returned in place of the output of the command
+        results = []
+        for command, section in zip(
+            self.commands, self.sections(stdout, stderr), strict=True
+        ):
+            if section is None:
+                results.append(None)
+                continue
+            try:
+                results.append(command.parse_output(*section))
+            except Exception as e:
+                results.append(e)
+        return results
@@ -5,9 +5,15 @@
 
 import asyncio
 from time import time
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List
 import asyncssh
-from asyncssh import ChannelOpenError, ConnectionLost, SSHClientConnection
+from asyncssh import (
+    ChannelOpenError,
+    ConnectionLost,
+    SFTPClient,
+    SFTPError,
+    SSHClientConnection,
+)
 from contextlib import asynccontextmanager
 from abc import ABC, abstractmethod
 
@@ -19,6 +25,9 @@ from lib.ssh_clients.ssh_static_keys_provider import SSHStaticKeysProvider
 from lib.loggers.tracing_log import log_backend_command
 
 
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
 class BaseCommand(ABC):
 
     @abstractmethod
@@ -29,6 +38,31 @@ class BaseCommand(ABC):
     def parse_output(self, stdout: str, stderr: str, exit_status: int):
         pass
 
+    # Multiplier of the execution timeout, for commands running several
+    # remote operations
+    def timeout_factor(self) -> int:
+        return 1
+
+
+class BaseSFTPCommand(ABC):
+    # Commands that can also be executed through the SFTP subsystem, used
+    # instead of get_command/parse_output when the SSH client enables SFTP.
+
+    def sftp_supported(self) -> bool:
+        return True
+
+    # Returns the same output as parse_output. Streaming commands return an
+    # async iterator of chunks instead, or consume the given stdin chunks.
+    @abstractmethod
+    async def execute_sftp(
+        self, sftp: SFTPClient, stdin: AsyncIterator[bytes] = None
+    ):
+        pass
+
+    @abstractmethod
+    def parse_sftp_error(self, error: SFTPError):
+        pass
+
 
 class OutputLimitExceeded(Exception):
     pass
@@ -51,12 +85,24 @@ class SSHClient:
         execute_timeout: int = 5,
         keep_alive: int = 5,
         buffer_limit: int = 5 * 1024 * 1024,
+        max_channels: int = 10,
+        use_sftp: bool = False,
     ):
         self.idle_timeout = idle_timeout
         self.conn = conn
         self.conn.set_keepalive(interval=keep_alive, count_max=3)
         self.execute_timeout = execute_timeout
         self.buffer_limit = buffer_limit
+        # Number of requests currently using the connection, each one
+        # opens its own SSH channel (bounded by sshd MaxSessions)
+        self.open_channels = 0
+        self.max_channels = max_channels
+        self.use_sftp = use_sftp
+        self.sftp_client: asyncio.Future = None
+        if use_sftp:
+            # The SFTP session is shared by all requests, but permanently
+            # takes one of the channels
+            self.max_channels = max(max_channels - 1, 1)
 
     async def _read_limit(self, reader, limit):
         # Note: according to asyncssh author, the following is the
@@ -67,9 +113,78 @@ class SSHClient:
         except asyncio.IncompleteReadError as exc:
             return exc.partial
 
+    def _sftp_command(self, command: BaseCommand) -> bool:
+        return (
+            self.use_sftp
+            and isinstance(command, BaseSFTPCommand)
+            and command.sftp_supported()
+        )
+
+    async def _get_sftp_client(self) -> SFTPClient:
+        # Concurrent requests share one SFTP session per connection
+        if self.sftp_client is None:
+            self.sftp_client = asyncio.ensure_future(self.conn.start_sftp_client())
+        try:
+            return await asyncio.shield(self.sftp_client)
+        except Exception:
+            self.sftp_client = None
+            raise
+
+    async def _execute_sftp(
+        self, command: BaseSFTPCommand, stdin: AsyncIterator[bytes] = None
+    ):
+        command_name = f"sftp {command.__class__.__name__}"
+        # Uploads are not bounded by the execution timeout, a lost connection
+        # is detected by the keep alive messages instead
+        timeout = self._execute_timeout(command) if stdin is None else None
+        try:
+            async with asyncio.timeout(timeout):
+                sftp = await self._get_sftp_client()
+                output = await command.execute_sftp(sftp, stdin)
+            # Log command
+            log_backend_command(command_name, 0)
+            return output
+        except SFTPError as e:
+            log_backend_command(command_name, e.code)
+            return command.parse_sftp_error(e)
+        except TimeoutError as e:
+            raise TimeoutLimitExceeded(
+                "Command execution timeout limit exceeded."
+            ) from e
+        except ConnectionLost as e:
+            raise SSHConnectionError("Unable to establish SSH connection.") from e
+        except ChannelOpenError as e:
+            raise SSHConnectionError("Unable to open a new SSH channel.") from e
+
+    async def _stream_sftp(self, command: BaseSFTPCommand) -> AsyncIterator[bytes]:
+        stream = await self._execute_sftp(command)
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout(self.execute_timeout):
+                        chunk = await anext(stream, None)
+                except SFTPError as e:
+                    command.parse_sftp_error(e)
+                except TimeoutError as e:
+                    raise TimeoutLimitExceeded(
+                        "Command execution timeout limit exceeded."
+                    ) from e
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    def _execute_timeout(self, command) -> float:
+        if isinstance(command, BaseCommand):
+            return self.execute_timeout * command.timeout_factor()
+        return self.execute_timeout
+
     async def execute(self, command: BaseCommand, stdin: str = None):
+        if self._sftp_command(command):
+            return await self._execute_sftp(command)
         try:
-            async with asyncio.timeout(self.execute_timeout):
+            async with asyncio.timeout(self._execute_timeout(command)):
                 command_line = command.get_command()
                 process = await self.conn.create_process(command_line)
 
@@ -108,17 +223,152 @@ class SSHClient:
         except ChannelOpenError as e:
             raise SSHConnectionError("Unable to open a new SSH channel.") from e
 
+    async def execute_stream(
+        self,
+        command: BaseCommand,
+        stdin: bytes = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        # Yields the raw stdout of the command as it arrives. Chunks are only
+        # read when the consumer asks for them, so a slow consumer stops the
+        # SSH window from being replenished instead of buffering the output.
+        # The execution timeout applies to each chunk, not to the whole
+        # command, and the command's parse_output is only called, with an
+        # empty stdout, to handle a non zero exit status.
+        if self._sftp_command(command):
+            async for chunk in self._stream_sftp(command):
+                yield chunk
+            return
+
+        process = None
+        stderr_reader = None
+        try:
+            command_line = command.get_command()
+            async with asyncio.timeout(self.execute_timeout):
+                process = await self.conn.create_process(command_line, encoding=None)
+
+            if stdin:
+                process.stdin.write(stdin)
+                process.stdin.write_eof()
+
+            stderr_reader = asyncio.create_task(
+                self._read_limit(process.stderr, self.buffer_limit)
+            )
+            while True:
+                async with asyncio.timeout(self.execute_timeout):
+                    chunk = await process.stdout.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+            async with asyncio.timeout(self.execute_timeout):
+                stdout_error = await stderr_reader
+                process.close()
+                await process.wait_closed()
+            # Log command
+            log_backend_command(command_line, process.exit_status)
+            if process.exit_status != 0:
+                command.parse_output(
+                    "", stdout_error.decode(errors="replace"), process.exit_status
+                )
+
+        except TimeoutError as e:
+            if process is not None:
+                process.terminate()
+            raise TimeoutLimitExceeded(
+                "Command execution timeout limit exceeded."
+            ) from e
+        except ConnectionLost as e:
+            raise SSHConnectionError("Unable to establish SSH connection.") from e
+        except ChannelOpenError as e:
+            raise SSHConnectionError("Unable to open a new SSH channel.") from e
+        finally:
+            if stderr_reader is not None and not stderr_reader.done():
+                stderr_reader.cancel()
+            if process is not None and not process.is_closing():
+                process.close()
+
+    async def execute_stdin_stream(
+        self, command: BaseCommand, stdin: AsyncIterator[bytes]
+    ):
+        # Writes the chunks of stdin to the remote command as they are
+        # produced, waiting for the SSH window to drain before asking for the
+        # next one. The execution timeout applies to each chunk.
+        if self._sftp_command(command):
+            return await self._execute_sftp(command, stdin)
+
+        process = None
+        try:
+            command_line = command.get_command()
+            async with asyncio.timeout(self.execute_timeout):
+                process = await self.conn.create_process(command_line, encoding=None)
+
+            try:
+                async for chunk in stdin:
+                    process.stdin.write(chunk)
+                    async with asyncio.timeout(self.execute_timeout):
+                        await process.stdin.drain()
+                process.stdin.write_eof()
+            except BrokenPipeError:
+                # The remote process exited early, its exit status and
+                # error message are handled below
+                pass
+
+            async with asyncio.timeout(self.execute_timeout):
+                stdout_data, stdout_error = await asyncio.gather(
+                    self._read_limit(process.stdout, self.buffer_limit),
+                    self._read_limit(process.stderr, self.buffer_limit),
+                )
+
+                if (
+                    len(stdout_data) >= self.buffer_limit
+                    or len(stdout_error) >= self.buffer_limit
+                ):
+                    raise OutputLimitExceeded("Command output exceeded buffer limit.")
+
+                process.close()
+                await process.wait_closed()
+            # Log command
+            log_backend_command(command_line, process.exit_status)
+            return command.parse_output(
+                stdout_data.decode(errors="replace"),
+                stdout_error.decode(errors="replace"),
+                process.exit_status,
+            )
+
+        except TimeoutError as e:
+            if process is not None:
+                process.terminate()
+            raise TimeoutLimitExceeded(
+                "Command execution timeout limit exceeded."
+            ) from e
+        except ConnectionLost as e:
+            raise SSHConnectionError("Unable to establish SSH connection.") from e
+        except ChannelOpenError as e:
+            raise SSHConnectionError("Unable to open a new SSH channel.") from e
+        finally:
+            if process is not None and not process.is_closing():
+                process.close()
+
     def reset_idle(
         self,
     ) -> None:
         self.conn.set_extra_info(**{"last_used": time()})
 
+    def last_used(self) -> float:
+        return self.conn.get_extra_info("last_used")
+
     def is_idle(self) -> Any:
-        last_used = self.conn.get_extra_info("last_used")
-        return (time() - last_used) > self.idle_timeout
+        if self.open_channels > 0:
+            return False
+        return (time() - self.last_used()) > self.idle_timeout
+
+    def has_free_channel(self) -> bool:
+        return self.open_channels < self.max_channels
 
     def close(self) -> None:
         self.conn.close()
+        self.sftp_client = None
 
     def is_closed(self):
         return self.conn.is_closed()
@@ -126,8 +376,6 @@ class SSHClient:
 
 class SSHClientPool:
 
-    lock = asyncio.Lock()
-
     def __init__(
         self,
         host: str,
@@ -142,8 +390,16 @@ class SSHClientPool:
         max_clients: int = 100,
         idle_timeout: int = 60,
         keep_alive: int = 5,
+        max_clients_per_user: int = 4,
+        max_channels_per_client: int = 10,
+        queue_timeout: int = 5,
+        use_sftp: bool = False,
     ):
-        self.clients: Dict[str, SSHClient] = {}
+        self.clients: Dict[str, List[SSHClient]] = {}
+        self.connecting: Dict[str, asyncio.Task] = {}
+        self.released = asyncio.Condition()
+        self.waiting = 0
+        self.evictions = 0
         assert idle_timeout > execute_timeout
         self.host = host
         self.port = port
@@ -158,17 +414,56 @@ class SSHClientPool:
         self.max_clients = max_clients
         self.idle_timeout = idle_timeout
         self.keep_alive = keep_alive
+        self.max_clients_per_user = max_clients_per_user
+        self.max_channels_per_client = max_channels_per_client
+        self.queue_timeout = queue_timeout
+        self.use_sftp = use_sftp
 
     def prune_connection_pool(self):
-        for client in self.clients.values():
-            if client.is_idle():
-                client.close()
+        for clients in self.clients.values():
+            for client in clients:
+                if client.is_idle():
+                    client.close()
 
         # remove closed connections
-        self.clients = {
-            k: conn for k, conn in self.clients.items() if not conn.is_closed()
+        clients = {
+            k: [conn for conn in conns if not conn.is_closed()]
+            for k, conns in self.clients.items()
+        }
+        self.clients = {k: conns for k, conns in clients.items() if len(conns) > 0}
+
+    def stats(self) -> Dict[str, int]:
+        clients = [client for conns in self.clients.values() for client in conns]
+        return {
+            "users": len(self.clients),
+            "clients": len(clients),
+            "max_clients": self.max_clients,
+            "connecting": len(self.connecting),
+            "open_channels": sum(client.open_channels for client in clients),
+            "max_channels": sum(client.max_channels for client in clients),
+            "waiting": self.waiting,
+            "evictions": self.evictions,
         }
 
+    def _evict_lru_client(self) -> bool:
+        # Only connections without in-flight work can be evicted
+        candidates = [
+            (client, username)
+            for username, conns in self.clients.items()
+            for client in conns
+            if client.open_channels == 0
+        ]
+        if len(candidates) == 0:
+            return False
+
+        client, username = min(candidates, key=lambda c: c[0].last_used())
+        client.close()
+        self.clients[username].remove(client)
+        if len(self.clients[username]) == 0:
+            del self.clients[username]
+        self.evictions += 1
+        return True
+
     async def get_conn_options(self, username: str, jwt_token: str):
         try:
             keys = await self.key_provider.get_keys(username, jwt_token)
@@ -212,50 +507,115 @@ class SSHClientPool:
                 raise TypeError("Unsupported SSHKeysProvider")
         return options
 
-    @asynccontextmanager
-    async def get_client(self, username: str, jwt_token: str):
-        client: SSHClient = None
-
-        async with SSHClientPool.lock:
-            try:
-                if username in self.clients:
-                    client = self.clients[username]
-                    if client.is_closed():
-                        del self.clients[username]
-                        client = None
-
-                if client is None:
-                    if len(self.clients) >= self.max_clients:
-                        raise SSHConnectionError(
-                            "SSH connection pool capacity exceeded"
-                        )
-                    options = await self.get_conn_options(username, jwt_token)
-                    proxy = ()
-                    if self.proxy_host:
-                        proxy = await asyncssh.connect(
-                            host=self.proxy_host, port=self.proxy_port, options=options
-                        )
-
-                    conn = await asyncssh.connect(
-                        host=self.host, port=self.port, options=options, tunnel=proxy
-                    )
+    async def _connect(self, username: str, jwt_token: str) -> SSHClient:
+        try:
+            options = await self.get_conn_options(username, jwt_token)
+            proxy = ()
+            if self.proxy_host:
+                proxy = await asyncssh.connect(
+                    host=self.proxy_host, port=self.proxy_port, options=options
+                )
 
-                    client = SSHClient(
-                        conn,
-                        idle_timeout=self.idle_timeout,
-                        execute_timeout=self.execute_timeout,
-                        buffer_limit=self.buffer_limit,
-                        keep_alive=self.keep_alive,
+            conn = await asyncssh.connect(
+                host=self.host, port=self.port, options=options, tunnel=proxy
+            )
+
+            client = SSHClient(
+                conn,
+                idle_timeout=self.idle_timeout,
+                execute_timeout=self.execute_timeout,
+                buffer_limit=self.buffer_limit,
+                keep_alive=self.keep_alive,
+                max_channels=self.max_channels_per_client,
+                use_sftp=self.use_sftp,
+            )
+            client.reset_idle()
+            self.clients.setdefault(username, []).append(client)
+            return client
+        finally:
+            del self.connecting[username]
+
+    def _reserve_channel(self, username: str) -> SSHClient | None:
+        clients = [
+            client
+            for client in self.clients.get(username, [])
+            if not client.is_closed()
+        ]
+        if len(clients) > 0:
+            self.clients[username] = clients
+        else:
+            self.clients.pop(username, None)
+
+        # Pick the least loaded connection to spread channels evenly
+        client = min(clients, key=lambda c: c.open_channels, default=None)
+        if client is None or not client.has_free_channel():
+            return None
+        client.open_channels += 1
+        return client
+
+    async def _release_channel(self, client: SSHClient) -> None:
+        client.open_channels -= 1
+        client.reset_idle()
+        async with self.released:
+            self.released.notify_all()
+
+    async def _acquire_client(self, username: str, jwt_token: str) -> SSHClient:
+        deadline = asyncio.get_running_loop().time() + self.queue_timeout
+        while True:
+            client = self._reserve_channel(username)
+            if client is not None:
+                return client
+
+            # Concurrent requests of the same user share one connection
+            # attempt, while other users never wait for it.
+            connecting = self.connecting.get(username)
+            user_clients = len(self.clients.get(username, []))
+            if connecting is None and user_clients < self.max_clients_per_user:
+                pool_clients = sum(len(conns) for conns in self.clients.values())
+                if (
+                    pool_clients + len(self.connecting) < self.max_clients
+                    or self._evict_lru_client()
+                ):
+                    connecting = asyncio.create_task(
+                        self._connect(username, jwt_token)
                     )
-                    self.clients[username] = client
-
-                client.reset_idle()
-                yield client
+                    self.connecting[username] = connecting
+                elif user_clients == 0:
+                    # Every pooled connection has in-flight work
+                    raise SSHConnectionError("SSH connection pool capacity exceeded")
+
+            if connecting is not None:
+                # Shielded so that a cancelled request doesn't abort the
+                # connection other requests of the same user are waiting for.
+                await asyncio.shield(connecting)
+                continue
+
+            # All the user's connections are saturated: queue until a
+            # channel is released
+            self.waiting += 1
+            try:
+                async with asyncio.timeout_at(deadline):
+                    async with self.released:
+                        await self.released.wait()
             except TimeoutError as e:
                 raise TimeoutLimitExceeded(
-                    "SSH connection timeout limit exceeded."
+                    "Timeout waiting for a free SSH channel."
                 ) from e
-            except ConnectionResetError as e:
-                raise SSHConnectionError("Unable to establish SSH connection.") from e
-            except ConnectionLost as e:
-                raise SSHConnectionError("Unable to establish SSH connection.") from e
+            finally:
+                self.waiting -= 1
+
+    @asynccontextmanager
+    async def get_client(self, username: str, jwt_token: str):
+        try:
+            client = await self._acquire_client(username, jwt_token)
+            try:
+                client.reset_idle()
+                yield client
+            finally:
+                await self._release_channel(client)
+        except TimeoutError as e:
+            raise TimeoutLimitExceeded("SSH connection timeout limit exceeded.") from e
+        except ConnectionResetError as e:
+            raise SSHConnectionError("Unable to establish SSH connection.") from e
+        except ConnectionLost as e:
+            raise SSHConnectionError("Unable to establish SSH connection.") from e
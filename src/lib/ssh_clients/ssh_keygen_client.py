@@ -3,11 +3,15 @@
 # Please, refer to the LICENSE file in the root directory.
 # SPDX-License-Identifier: BSD-3-Clause
 
+import asyncio
 import json
 import aiohttp
+import asyncssh
+import struct
 from fastapi import status
 from socket import AF_INET
-from typing import Optional
+from time import time
+from typing import Dict, Optional, Tuple
 
 
 # exceptions
@@ -15,6 +19,30 @@ from lib.exceptions import SSHServiceError
 from lib.ssh_clients.ssh_key_provider import SSHKeysProvider
 
 SIZE_POOL_AIOHTTP = 100
+# Cached keys are refreshed in background when their certificate expires
+# within KEYS_REFRESH_MARGIN seconds, and are no longer handed out when it
+# expires within KEYS_MIN_VALIDITY seconds (the SSH login must complete
+# while the certificate is still valid).
+KEYS_REFRESH_MARGIN = 20
+KEYS_MIN_VALIDITY = 5
+
+
+def _certificate_valid_before(certificate: asyncssh.SSHCertificate) -> int:
+    # asyncssh doesn't expose the validity of an imported certificate, it is
+    # read from its OpenSSH encoding (PROTOCOL.certkeys): certificate type,
+    # nonce, public key fields, serial, type, key id, principals, valid after
+    # and valid before
+    def skip_string(data: bytes, offset: int) -> int:
+        (length,) = struct.unpack_from(">I", data, offset)
+        return offset + 4 + length
+
+    data = certificate.public_data
+    key_data = certificate.key.public_data
+    offset = skip_string(data, skip_string(data, 0))
+    offset += len(key_data) - skip_string(key_data, 0)
+    offset = skip_string(data, skip_string(data, offset + 12))
+    _valid_after, valid_before = struct.unpack_from(">QQ", data, offset)
+    return valid_before
 
 
 def _ssh_service_headers(jwt_token: str):
@@ -24,6 +52,10 @@ def _ssh_service_headers(jwt_token: str):
 class SSHKeygenClient(SSHKeysProvider):
     aiohttp_client: Optional[aiohttp.ClientSession] = None
     max_connections: int = 0
+    # Signed keys are shared by every system, since they are issued by
+    # the same SSH keys service
+    keys_cache: Dict[str, Tuple[dict, float]] = {}
+    pending: Dict[str, asyncio.Task] = {}
 
     @classmethod
     async def get_aiohttp_client(cls) -> aiohttp.ClientSession:
@@ -48,6 +80,50 @@ class SSHKeygenClient(SSHKeysProvider):
         SSHKeygenClient.max_connections = max_connections
 
     async def get_keys(self, username: str, jwt_token: str):
+        now = time()
+        cached = SSHKeygenClient.keys_cache.get(username)
+        if cached is not None:
+            keys, valid_before = cached
+            if now < valid_before - KEYS_REFRESH_MARGIN:
+                return keys
+            if now < valid_before - KEYS_MIN_VALIDITY:
+                self._refresh_keys(username, jwt_token)
+                return keys
+
+        # Shielded so that a cancelled request doesn't abort the signing
+        # request other connections of the same user are waiting for.
+        return await asyncio.shield(self._refresh_keys(username, jwt_token))
+
+    def _refresh_keys(self, username: str, jwt_token: str) -> asyncio.Task:
+        # Concurrent misses for the same user share one signing request
+        task = SSHKeygenClient.pending.get(username)
+        if task is None:
+            task = asyncio.create_task(self._fetch_keys(username, jwt_token))
+            # Background refreshes are never awaited: retrieve the exception
+            # to avoid "exception was never retrieved" warnings
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            SSHKeygenClient.pending[username] = task
+        return task
+
+    async def _fetch_keys(self, username: str, jwt_token: str):
+        try:
+            keys = await self._sign_keys(jwt_token)
+            valid_before = _certificate_valid_before(
+                asyncssh.import_certificate(keys["public"])
+            )
+
+            now = time()
+            SSHKeygenClient.keys_cache = {
+                user: entry
+                for user, entry in SSHKeygenClient.keys_cache.items()
+                if entry[1] > now
+            }
+            SSHKeygenClient.keys_cache[username] = (keys, valid_before)
+            return keys
+        finally:
+            del SSHKeygenClient.pending[username]
+
+    async def _sign_keys(self, jwt_token: str):
         client = await self.get_aiohttp_client()
         headers = _ssh_service_headers(jwt_token)
 
@@ -0,0 +1,122 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+from collections import OrderedDict
+
+import pytest
+
+from lib.scheduler_clients.coalescing_scheduler_client import (
+    CoalescingSchedulerClient,
+)
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    async def get_jobs(self, username, jwt_token, allusers=False, filters=None):
+        self.calls.append(("get_jobs", username, allusers))
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("sacct failed")
+        return [{"jobId": len(self.calls), "user": username}]
+
+    async def cancel_job(self, job_id, username, jwt_token):
+        self.calls.append(("cancel_job", username, job_id))
+        return True
+
+    async def ping(self, username, jwt_token):
+        return [{"pinged": "UP"}]
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    monkeypatch.setattr(CoalescingSchedulerClient, "queries", OrderedDict())
+    return CountingClient()
+
+
+async def test_concurrent_queries_share_one_call(backend):
+    results = await asyncio.gather(
+        *[
+            CoalescingSchedulerClient(backend, "cluster", 0).get_jobs(
+                "user1", f"token-{i}"
+            )
+            for i in range(10)
+        ]
+    )
+
+    assert backend.calls == [("get_jobs", "user1", False)]
+    assert all(result is results[0] for result in results)
+    # Only in-flight queries are shared with max_age 0
+    assert not CoalescingSchedulerClient.queries
+
+
+async def test_queries_are_keyed_by_user_and_parameters(backend):
+    client = CoalescingSchedulerClient(backend, "cluster", 60)
+
+    await asyncio.gather(
+        client.get_jobs("user1", "token"),
+        client.get_jobs("user1", "token", allusers=True),
+        client.get_jobs("user2", "token"),
+        CoalescingSchedulerClient(backend, "other", 60).get_jobs("user1", "token"),
+    )
+
+    assert len(backend.calls) == 4
+
+
+async def test_results_are_reused_until_max_age(backend, monkeypatch):
+    now = {"time": 100.0}
+    monkeypatch.setattr(
+        "lib.scheduler_clients.coalescing_scheduler_client.monotonic",
+        lambda: now["time"],
+    )
+    client = CoalescingSchedulerClient(backend, "cluster", 2)
+
+    first = await client.get_jobs("user1", "token")
+    now["time"] += 1
+    assert await client.get_jobs("user1", "token") is first
+    now["time"] += 2
+    assert await client.get_jobs("user1", "token") is not first
+    assert len(backend.calls) == 2
+
+
+async def test_cancel_drops_user_results(backend):
+    client = CoalescingSchedulerClient(backend, "cluster", 60)
+
+    first = await client.get_jobs("user1", "token")
+    other = await client.get_jobs("user2", "token")
+    assert await client.cancel_job("1", "user1", "token")
+
+    assert await client.get_jobs("user1", "token") is not first
+    assert await client.get_jobs("user2", "token") is other
+    assert len(backend.calls) == 4
+
+
+async def test_failures_are_not_cached(backend):
+    client = CoalescingSchedulerClient(backend, "cluster", 60)
+    backend.fail = True
+
+    results = await asyncio.gather(
+        *[client.get_jobs("user1", "token") for _ in range(3)],
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    backend.fail = False
+    assert await client.get_jobs("user1", "token")
+    assert len(backend.calls) == 2
+
+
+async def test_cache_is_bounded(backend, monkeypatch):
+    monkeypatch.setattr(CoalescingSchedulerClient, "max_size", 2)
+    client = CoalescingSchedulerClient(backend, "cluster", 60)
+
+    for user in ["user1", "user2", "user3"]:
+        await client.get_jobs(user, "token")
+
+    assert [key[1] for key in CoalescingSchedulerClient.queries] == ["user2", "user3"]
+    assert await client.ping("user1", "token") == [{"pinged": "UP"}]
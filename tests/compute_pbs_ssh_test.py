@@ -92,6 +92,25 @@ async def test_get_job(client, ssh_client, mocked_ssh_qstat_output, pbs_cluster)
         assert response.json()["jobs"][0]["status"]["exitCode"] == 0
 
 
+async def test_get_jobs_filters(
+    client, ssh_client, mocked_ssh_qstat_allusers_output, pbs_cluster
+):
+    # Jobs are selected with qselect before being listed by qstat
+    mocked_output = {
+        **mocked_ssh_qstat_allusers_output,
+        "command": (
+            "ids=$(qselect -x -u 'test-user' -s 'F' -q 'workq') && "
+            'if [ -n "$ids" ]; then qstat -F json -f $ids -x; '
+        ),
+    }
+    async with ssh_client.mocked_output([MockedCommand(**mocked_output)]):
+        response = client.get(
+            f"/compute/{pbs_cluster.name}/jobs",
+            params={"state": "F", "partition": "workq"},
+        )
+        assert response.status_code == 200
+
+
 async def test_get_jobs_allusers(
     client, ssh_client, mocked_ssh_qstat_allusers_output, pbs_cluster
 ):
@@ -163,3 +182,24 @@ async def test_get_partitions(
         assert response.status_code == 200
         assert response.json() is not None
         assert response.json()["partitions"] is not None
+
+
+async def test_delete_job_batch(client, ssh_client, pbs_cluster):
+    async with ssh_client.mocked_output(
+        [
+            MockedCommand(
+                command="qdel 1 2",
+                stdout="",
+                stderr="qdel: Unknown Job Id 2.pbs\n",
+                exit_code=35,
+            )
+        ]
+    ):
+        response = client.request(
+            "DELETE",
+            f"/compute/{pbs_cluster.name}/jobs:batch",
+            json={"jobIds": ["1", "2"]},
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["statusCode"] for result in results] == [204, 500]
@@ -227,3 +227,28 @@ def test_cancel_job(client, mocked_cancel_job_response, slurm_cluster_with_api_c
             },
             timeout=timeout,
         )
+
+
+async def test_get_jobs_filters(
+    client, mocked_get_jobs_allusers_response, slurm_cluster_with_api_config
+):
+    # Filters are passed as query params to slurmdbd
+    url = (
+        f"{slurm_cluster_with_api_config.scheduler.api_url}/slurmdb/"
+        f"v{slurm_cluster_with_api_config.scheduler.api_version}/jobs"
+        "?state=RUNNING&start_time=1750204800&job_name=test1"
+    )
+    with aioresponses() as mocked:
+        mocked.get(url, status=200, body=json.dumps(mocked_get_jobs_allusers_response))
+
+        response = client.get(
+            f"/compute/{slurm_cluster_with_api_config.name}/jobs",
+            params={
+                "allusers": "true",
+                "state": "RUNNING",
+                "startTime": 1750204800,
+                "name": "test1",
+            },
+        )
+        assert response.status_code == 200
+        assert len(mocked.requests) == 1
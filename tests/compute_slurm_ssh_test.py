@@ -8,6 +8,7 @@ import pytest
 from tests import mocked_ssh_outputs
 import json
 
+from lib.ssh_clients import framed_command
 from tests.mock_ssh_client import MockedCommand
 
 
@@ -136,14 +137,30 @@ async def test_get_job_metadata(
     mocked_ssh_scontrol_script_output,
     mocked_ssh_scontrol_job_output,
     slurm_cluster_with_ssh_config,
+    monkeypatch,
 ):
+    monkeypatch.setattr(framed_command.secrets, "token_hex", lambda size: "frame")
+    frame = "==FIRECREST-BATCH-frame=="
+    # scontrol show job, scontrol write batch_script, sacct metadata and
+    # sacct batch script are run with a single remote command
+    outputs = [
+        mocked_ssh_scontrol_job_output["stdout"],
+        mocked_ssh_scontrol_script_output["stdout"],
+        "1|SbatchTest|/dev/null|/home/test1/jobs.out|/home/test1/jobs.error",
+        mocked_ssh_sacct_script_output["stdout"],
+    ]
+    stdout = "".join(
+        f"{output}\n{frame} {index} 0\n" for index, output in enumerate(outputs)
+    )
+    stderr = "".join(f"\n{frame} {index}\n" for index in range(len(outputs)))
 
     async with ssh_client.mocked_output(
         [
-            MockedCommand(**mocked_ssh_sacct_output),
-            MockedCommand(**mocked_ssh_sacct_script_output),
-            MockedCommand(**mocked_ssh_scontrol_script_output),
-            MockedCommand(**mocked_ssh_scontrol_job_output),
+            MockedCommand(
+                command=mocked_ssh_scontrol_job_output["command"],
+                stdout=stdout,
+                stderr=stderr,
+            )
         ]
     ):
         response = client.get(
@@ -152,7 +169,9 @@ async def test_get_job_metadata(
             )
         )
         assert response.status_code == 200
-        assert response.json() is not None
+        job = response.json()["jobs"][0]
+        assert job["standardOutput"] == "/home/test1/jobs.out"
+        assert job["script"].startswith("#!/bin/bash")
 
 
 async def test_delete_job(
@@ -168,6 +187,50 @@ async def test_delete_job(
         assert response.status_code == 204
 
 
+async def test_submit_job_batch(
+    client, ssh_client, mocked_ssh_sbatch_output, slurm_cluster_with_ssh_config
+):
+    job = {"working_directory": "/home/test1", "script": "#!/bin/bash\nhostname"}
+
+    async with ssh_client.mocked_output([MockedCommand(**mocked_ssh_sbatch_output)]):
+        response = client.post(
+            f"/compute/{slurm_cluster_with_ssh_config.name}/jobs:batch",
+            json={"jobs": [job, {**job, "name": "second"}]},
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["statusCode"] for result in results] == [201, 201]
+        assert all(result["jobId"] is not None for result in results)
+
+
+async def test_delete_job_batch(client, ssh_client, slurm_cluster_with_ssh_config):
+    # One scancel for all the jobs, errors are reported per job
+    async with ssh_client.mocked_output(
+        [
+            MockedCommand(
+                command="scancel --verbose 1 2 3",
+                stdout="",
+                stderr=(
+                    "scancel: Terminating job 1\n"
+                    "scancel: error: Kill job error on job id 2: Invalid job id specified\n"
+                    "scancel: Terminating job 3\n"
+                ),
+                exit_code=1,
+            )
+        ]
+    ):
+        response = client.request(
+            "DELETE",
+            f"/compute/{slurm_cluster_with_ssh_config.name}/jobs:batch",
+            json={"jobIds": ["1", "2", "3"]},
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["jobId"] for result in results] == [1, 2, 3]
+        assert [result["statusCode"] for result in results] == [204, 500, 204]
+        assert "Invalid job id specified" in results[1]["error"]
+
+
 async def test_get_sinfo(
     client, ssh_client, mocked_ssh_sinfo_output, slurm_cluster_with_ssh_config
 ):
@@ -181,3 +244,60 @@ async def test_get_sinfo(
         assert response.status_code == 200
         assert response.json() is not None
         assert response.json()["nodes"] is not None
+
+
+async def test_get_jobs_filters(
+    client, ssh_client, mocked_ssh_sacct_allusers_output, slurm_cluster_with_ssh_config
+):
+    # Filters are passed to sacct
+    mocked_output = {
+        **mocked_ssh_sacct_allusers_output,
+        "command": (
+            "TZ=UTC SLURM_TIME_FORMAT='%s' sacct --allusers --noheader --parsable2 "
+            "--format='JobID,AllocNodes,Cluster,ExitCode,Group,Account,JobName,NodeList,"
+            "Partition,Priority,State,Reason,ElapsedRaw,Submit,Start,End,Suspended,"
+            "TimelimitRaw,User,WorkDir' --state='COMPLETED,FAILED' "
+            "--starttime='2025-06-18T00:00:00' --partition='part01'"
+        ),
+    }
+    async with ssh_client.mocked_output([MockedCommand(**mocked_output)]):
+        response = client.get(
+            f"/compute/{slurm_cluster_with_ssh_config.name}/jobs",
+            params={
+                "allusers": "true",
+                "state": ["COMPLETED", "FAILED"],
+                "startTime": 1750204800,
+                "partition": "part01",
+            },
+        )
+        assert response.status_code == 200
+        assert len(response.json()["jobs"]) == 2
+
+
+async def test_get_jobs_pagination(
+    client, ssh_client, mocked_ssh_sacct_allusers_output, slurm_cluster_with_ssh_config
+):
+    url = f"/compute/{slurm_cluster_with_ssh_config.name}/jobs"
+    async with ssh_client.mocked_output(
+        [MockedCommand(**mocked_ssh_sacct_allusers_output)]
+    ):
+        response = client.get(url, params={"allusers": "true", "limit": 1})
+        assert response.status_code == 200
+        assert [job["jobId"] for job in response.json()["jobs"]] == [4]
+        assert response.json()["nextCursor"] == "4"
+
+        # Served from the listing of the first page
+        response = client.get(
+            url, params={"allusers": "true", "limit": 1, "cursor": "4"}
+        )
+        assert response.status_code == 200
+        assert [job["jobId"] for job in response.json()["jobs"]] == [3]
+        assert response.json()["nextCursor"] is None
+
+
+def test_get_jobs_invalid_filter(client, slurm_cluster_with_ssh_config):
+    response = client.get(
+        f"/compute/{slurm_cluster_with_ssh_config.name}/jobs",
+        params={"partition": "part01'; rm -rf ~"},
+    )
+    assert response.status_code == 400
@@ -25,9 +25,13 @@ from lib.request_vars import g
 
 # models
 from lib.models import ApiAuthUser, ApiAuthType
+from lib.scheduler_clients.coalescing_scheduler_client import (
+    CoalescingSchedulerClient,
+)
 
 # app
 from firecrest.main import create_app
+from firecrest.filesystem.transfer import router as transfer_router
 from aiobotocore.session import get_session
 from aiobotocore.config import AioConfig
 
@@ -173,6 +177,18 @@ def client(app, s3_client, ssh_client):
     yield client
 
 
+# Scheduler results shared between requests would hide the mocked outputs
+@pytest.fixture(autouse=True)
+def clear_scheduler_queries():
+    CoalescingSchedulerClient.queries.clear()
+
+
+# Known buckets would skip the mocked bucket creation
+@pytest.fixture(autouse=True)
+def clear_known_buckets():
+    transfer_router.known_buckets.clear()
+
+
 @pytest.fixture(scope="session", autouse=True)
 def set_up_cluster_health():
     settings = get_settings()
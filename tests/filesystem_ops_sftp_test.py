@@ -0,0 +1,166 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+
+import asyncssh
+import pytest
+from fastapi import HTTPException
+
+from firecrest.filesystem.ops.commands.batch_command import BatchCommand
+from firecrest.filesystem.ops.commands.chmod_command import ChmodCommand
+from firecrest.filesystem.ops.commands.cp_command import CpCommand
+from firecrest.filesystem.ops.commands.dd_command import DdCommand
+from firecrest.filesystem.ops.commands.ls_command import LsCommand
+from firecrest.filesystem.ops.commands.mkdir_command import MkdirCommand
+from firecrest.filesystem.ops.commands.rm_command import RmCommand
+from firecrest.filesystem.ops.commands.stat_batch_command import StatBatchCommand
+from firecrest.filesystem.ops.commands.stat_command import StatCommand
+from firecrest.filesystem.ops.commands.symlink_command import SymlinkCommand
+from firecrest.filesystem.ops.commands.view_command import ViewCommand
+from lib.ssh_clients.ssh_client import SSHClient
+from tests.mock_ssh_client import simple_ssh_server
+
+
+async def no_shell(process: asyncssh.SSHServerProcess):
+    # Fail loudly if a command falls back to the CLI engine
+    process.exit(127)
+
+
+@pytest.fixture
+async def sftp_client(tmp_path):
+    async with simple_ssh_server(
+        no_shell,
+        sftp_factory=lambda chan: asyncssh.SFTPServer(chan, chroot=str(tmp_path)),
+    ) as port:
+        async with asyncssh.connect(
+            "localhost", port, username="test-user", known_hosts=None
+        ) as conn:
+            yield SSHClient(conn, use_sftp=True)
+
+
+async def test_sftp_ls(sftp_client, tmp_path):
+    (tmp_path / "dir" / "sub").mkdir(parents=True)
+    (tmp_path / "dir" / "file.txt").write_text("hello")
+    (tmp_path / "dir" / ".hidden").write_text("")
+    os.symlink(tmp_path / "dir" / "file.txt", tmp_path / "dir" / "link")
+
+    files = await sftp_client.execute(LsCommand("/dir", recursive=True))
+
+    assert [file.name for file in files] == ["file.txt", "link", "sub"]
+    file, link, sub = files
+    assert file.type == "-"
+    assert file.size == "5"
+    assert link.type == "l"
+    # Link targets are reported relative to the chroot of the test server
+    assert link.link_target == "/dir/file.txt"
+    assert sub.type == "d"
+
+
+async def test_sftp_stat(sftp_client, tmp_path):
+    (tmp_path / "file.txt").write_text("hello")
+
+    output = await sftp_client.execute(StatCommand("/file.txt"))
+
+    assert output["size"] == 5
+    assert output["uid"] == os.getuid()
+
+
+async def test_sftp_stat_batch(sftp_client, tmp_path):
+    (tmp_path / "file.txt").write_text("hello")
+
+    output = await sftp_client.execute(StatBatchCommand(["/file.txt", "/missing"]))
+
+    assert output[0]["stat"]["size"] == 5
+    assert output[1]["status_code"] == 404
+
+
+async def test_sftp_view(sftp_client, tmp_path):
+    (tmp_path / "file.txt").write_text("hello")
+
+    assert await sftp_client.execute(ViewCommand("/file.txt")) == "hello"
+
+
+async def test_sftp_not_found(sftp_client):
+    with pytest.raises(HTTPException) as exc_info:
+        await sftp_client.execute(ViewCommand("/missing.txt"))
+
+    assert exc_info.value.status_code == 404
+
+
+async def test_sftp_mkdir_chmod_symlink_rm(sftp_client, tmp_path):
+    output = await sftp_client.execute(MkdirCommand("/a/b", parent=True))
+    assert output.type == "d"
+    assert (tmp_path / "a" / "b").is_dir()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await sftp_client.execute(MkdirCommand("/a/b"))
+    assert exc_info.value.status_code == 400
+
+    output = await sftp_client.execute(ChmodCommand("/a/b", "700"))
+    assert output.permissions == "rwx------"
+
+    await sftp_client.execute(SymlinkCommand("/a/b", "/a/link"))
+    assert (tmp_path / "a" / "link").is_symlink()
+
+    await sftp_client.execute(RmCommand("/a"))
+    assert not (tmp_path / "a").exists()
+
+
+async def test_sftp_batch(sftp_client, tmp_path):
+    batch = BatchCommand(
+        [
+            MkdirCommand("/a"),
+            RmCommand("/missing"),
+            ChmodCommand("/a", "700"),
+        ]
+    )
+
+    output = await sftp_client.execute(batch)
+
+    assert [result["status_code"] for result in output] == [200, 404, None]
+    assert (tmp_path / "a").is_dir()
+
+
+async def test_sftp_dd(sftp_client, tmp_path):
+    content = os.urandom(200 * 1024)
+
+    async def chunks():
+        yield content[:100]
+        yield content[100:]
+
+    await sftp_client.execute_stdin_stream(
+        DdCommand("/file.bin", write=True), chunks()
+    )
+    assert (tmp_path / "file.bin").read_bytes() == content
+
+    read = DdCommand("/file.bin", offset=1000, length=100 * 1024)
+    data = b"".join([chunk async for chunk in sftp_client.execute_stream(read)])
+    assert data == content[1000 : 1000 + 100 * 1024]
+
+
+async def test_sftp_cp_symlink_target(sftp_client, tmp_path):
+    # The target is written through the link, keeping its mode
+    (tmp_path / "upload.tmp").write_bytes(b"new")
+    (tmp_path / "data.txt").write_bytes(b"old content")
+    (tmp_path / "data.txt").chmod(0o600)
+    os.symlink(tmp_path / "data.txt", tmp_path / "link")
+
+    await sftp_client.execute(CpCommand("/upload.tmp", "/link"))
+
+    assert (tmp_path / "link").is_symlink()
+    assert (tmp_path / "data.txt").read_bytes() == b"new"
+    assert (tmp_path / "data.txt").stat().st_mode & 0o777 == 0o600
+
+
+async def test_sftp_cp_directory_target(sftp_client, tmp_path):
+    (tmp_path / "upload.tmp").write_bytes(b"new")
+    (tmp_path / "data.txt").mkdir()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await sftp_client.execute(CpCommand("/upload.tmp", "/data.txt"))
+
+    assert exc_info.value.status_code == 400
+    assert list((tmp_path / "data.txt").iterdir()) == []
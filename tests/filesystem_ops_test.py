@@ -4,6 +4,8 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from importlib import resources as impresources
+from lib.ssh_clients import framed_command
+from firecrest.filesystem.ops.commands.ls_find_command import LsFindCommand
 from firecrest.filesystem.ops.models import File
 from tests import mocked_ssh_outputs
 import pytest
@@ -38,6 +40,11 @@ def mocked_ssh_ls_hidden_output():
     return load_ssh_output("ssh_ls_with_hidden_command.json")
 
 
+@pytest.fixture(scope="module")
+def mocked_ssh_ls_find_output():
+    return load_ssh_output("ssh_ls_find_command.json")
+
+
 @pytest.fixture(scope="module")
 def mocked_ssh_checksum_output():
     return load_ssh_output("ssh_checksum_command.json")
@@ -78,6 +85,11 @@ def mocked_ssh_stat_output():
     return load_ssh_output("ssh_stat_command.json")
 
 
+@pytest.fixture(scope="module")
+def mocked_ssh_stat_batch_output():
+    return load_ssh_output("ssh_stat_batch_command.json")
+
+
 @pytest.fixture(scope="module")
 def mocked_ssh_mkdir_output():
     return load_ssh_output("ssh_mkdir_command.json")
@@ -103,6 +115,11 @@ def mocked_ssh_mkdir_error():
     return load_ssh_output("ssh_mkdir_command_error.json")
 
 
+@pytest.fixture(scope="module")
+def mocked_ssh_dd_output():
+    return load_ssh_output("ssh_dd_command.json")
+
+
 @pytest.fixture(scope="module")
 def mocked_ssh_rm_output():
     return load_ssh_output("ssh_rm_command.json")
@@ -177,6 +194,65 @@ async def test_ls_dereference_command(client, ssh_client, mocked_ssh_ls_folllow_
         assert response.json()["output"][7]["name"] == "b/tt_link/file"
 
 
+async def test_ls_paginated_command(client, ssh_client, mocked_ssh_ls_find_output):
+
+    async with ssh_client.mocked_output([MockedCommand(**mocked_ssh_ls_find_output)]):
+
+        response = client.get(
+            "/filesystem/cluster-slurm-ssh/ops/ls?path=/home&recursive=true&limit=3"
+        )
+        assert response.status_code == 200
+        assert response.json()["nextCursor"] == "test1/link"
+        output = [File(**file) for file in response.json()["output"]]
+        assert [file.name for file in output] == [
+            "test1",
+            "test1/file with spaces.txt",
+            "test1/link",
+        ]
+        assert output[0].last_modified == "2024-04-09T11:59:43"
+        assert output[2].link_target == "/home/test1/file with spaces.txt"
+
+        response = client.get(
+            "/filesystem/cluster-slurm-ssh/ops/ls?path=/home&recursive=true&limit=3&cursor=test1/link"
+        )
+        assert response.status_code == 200
+        assert response.json()["nextCursor"] is None
+        output = [File(**file) for file in response.json()["output"]]
+        assert [file.name for file in output] == ["test2", "testuser"]
+        assert "sort -z" in ssh_client.executed[-1]
+
+
+async def test_ls_paginated_command_cursor_removed(
+    client, ssh_client, mocked_ssh_ls_find_output
+):
+    # The listing resumes after the cursor also when its entry was removed
+    async with ssh_client.mocked_output([MockedCommand(**mocked_ssh_ls_find_output)]):
+
+        response = client.get(
+            "/filesystem/cluster-slurm-ssh/ops/ls?path=/home&recursive=true&limit=3&cursor=test1/lin"
+        )
+        assert response.status_code == 200
+        output = [File(**file) for file in response.json()["output"]]
+        assert [file.name for file in output] == ["test1/link", "test2", "testuser"]
+
+
+async def test_ls_find_parse_stream(mocked_ssh_ls_find_output):
+    ls = LsFindCommand("/home", recursive=True)
+    stdout = mocked_ssh_ls_find_output["stdout"].encode()
+
+    async def chunks(size):
+        for i in range(0, len(stdout), size):
+            yield stdout[i : i + size]
+
+    expected = ls.parse_output(mocked_ssh_ls_find_output["stdout"], "", 0)
+    for size in (1, 7, len(stdout)):
+        assert [file async for file in ls.parse_stream(chunks(size))] == expected
+        # Names are compared like `sort` compares the records
+        assert [
+            file async for file in ls.parse_stream(chunks(size), after="test1")
+        ] == expected[1:]
+
+
 async def test_mkdir_command(client, ssh_client, mocked_ssh_mkdir_output):
 
     async with ssh_client.mocked_output([MockedCommand(**mocked_ssh_mkdir_output)]):
@@ -403,6 +479,251 @@ async def test_stat_command(client, ssh_client, mocked_ssh_stat_output):
         assert len(list(response_data["output"])) == 10
 
 
+async def test_stat_batch_command(client, ssh_client, mocked_ssh_stat_batch_output):
+
+    async with ssh_client.mocked_output(
+        [MockedCommand(**mocked_ssh_stat_batch_output)]
+    ):
+
+        response = client.post(
+            "/filesystem/cluster-slurm-ssh/ops/stat:batch",
+            json={
+                "paths": [
+                    "/home/test1/data.big",
+                    "/home/test1/missing",
+                    "/home/test1",
+                ]
+            },
+        )
+        assert response.status_code == 200
+        output = response.json()["output"]
+        assert [result["path"] for result in output] == [
+            "/home/test1/data.big",
+            "/home/test1/missing",
+            "/home/test1",
+        ]
+        assert output[0]["stat"]["size"] == 8
+        assert output[1]["statusCode"] == 404
+        assert output[1]["stat"] is None
+        assert "No such file or directory" in output[1]["error"]
+        assert output[2]["stat"]["mode"] == 0o40755
+
+
+async def test_batch_command(client, ssh_client, monkeypatch):
+    monkeypatch.setattr(framed_command.secrets, "token_hex", lambda size: "frame")
+    frame = "==FIRECREST-BATCH-frame=="
+    listing = 'drwxr-x--- 2 test1 test1 4096 2024-04-09T11:59:43 "/home/test1/dir"\n'
+
+    async with ssh_client.mocked_output(
+        [
+            MockedCommand(
+                command="mkdir",
+                stdout=f"{listing}\n{frame} 0 0\n{listing}\n{frame} 1 0\n\n{frame} 2 1\n",
+                stderr=(
+                    f"\n{frame} 0\n\n{frame} 1\n"
+                    "rm: cannot remove '/home/test1/missing': No such file or directory"
+                    f"\n{frame} 2\n"
+                ),
+                exit_code=1,
+            )
+        ]
+    ):
+        response = client.post(
+            "/filesystem/cluster-slurm-ssh/ops/batch",
+            json={
+                "operations": [
+                    {"operation": "mkdir", "path": "/home/test1/dir"},
+                    {"operation": "chmod", "path": "/home/test1/dir", "mode": "750"},
+                    {"operation": "rm", "path": "/home/test1/missing"},
+                    {
+                        "operation": "symlink",
+                        "path": "/home/test1/dir",
+                        "linkPath": "/home/test1/link",
+                    },
+                ]
+            },
+        )
+        assert response.status_code == 200
+        output = response.json()["output"]
+        assert [result["statusCode"] for result in output] == [200, 200, 404, None]
+        assert output[1]["output"]["permissions"] == "rwxr-x---"
+        assert "No such file or directory" in output[2]["error"]
+        assert output[3]["operation"] == "symlink"
+
+
+def mocked_file_stat(size: int, mode: str = "81a4"):
+    return MockedCommand(
+        command="stat --dereference",
+        stdout=f"{mode} 64317775 50 1 26191 1000 {size} 1689669477 1685517840 1685517840",
+        stderr="",
+    )
+
+
+async def test_download_command(client, ssh_client, mocked_ssh_dd_output):
+    content = mocked_ssh_dd_output["stdout"]
+    async with ssh_client.mocked_output(
+        [MockedCommand(**mocked_ssh_dd_output), mocked_file_stat(len(content))]
+    ):
+
+        response = client.get(
+            "/filesystem/cluster-slurm-ssh/ops/download?path={path}".format(
+                path="/home/test1/data.txt"
+            )
+        )
+        assert response.status_code == 200
+        assert response.content == content.encode()
+        assert response.headers["Content-Length"] == str(len(content))
+        assert response.headers["Accept-Ranges"] == "bytes"
+
+
+async def test_download_command_range(client, ssh_client, mocked_ssh_dd_output):
+    content = mocked_ssh_dd_output["stdout"]
+    async with ssh_client.mocked_output(
+        [
+            MockedCommand(
+                command="dd if='/home/test1/data.txt' iflag=skip_bytes,count_bytes bs=64K status=none skip=6 count=5",
+                stdout=content[6:11],
+                stderr="",
+            ),
+            mocked_file_stat(len(content)),
+        ]
+    ):
+
+        response = client.get(
+            "/filesystem/cluster-slurm-ssh/ops/download?path={path}".format(
+                path="/home/test1/data.txt"
+            ),
+            headers={"Range": "bytes=6-10"},
+        )
+        assert response.status_code == 206
+        assert response.content == b"ipsum"
+        assert response.headers["Content-Range"] == f"bytes 6-10/{len(content)}"
+
+
+async def test_download_command_range_not_satisfiable(client, ssh_client):
+    async with ssh_client.mocked_output([mocked_file_stat(10)]):
+
+        response = client.get(
+            "/filesystem/cluster-slurm-ssh/ops/download?path={path}".format(
+                path="/home/test1/data.txt"
+            ),
+            headers={"Range": "bytes=20-"},
+        )
+        assert response.status_code == 416
+        assert response.headers["Content-Range"] == "bytes */10"
+
+
+async def test_download_command_too_large(client, ssh_client):
+    async with ssh_client.mocked_output([mocked_file_stat(10 * 1024 * 1024)]):
+
+        response = client.get(
+            "/filesystem/cluster-slurm-ssh/ops/download?path={path}".format(
+                path="/home/test1/data.big"
+            )
+        )
+        assert response.status_code == 413
+
+
+def mocked_upload(**cp_output):
+    # The file is written to a temporary name next to the target, copied
+    # over the target and removed
+    return [
+        MockedCommand(
+            command="dd of='/home/test1/data.txt.",
+            stdout="",
+            stderr="",
+            swalllow_stdin=True,
+        ),
+        MockedCommand(
+            command="cp -T -- '/home/test1/data.txt.",
+            **({"stdout": "", "stderr": ""} | cp_output),
+        ),
+        MockedCommand(
+            command="rm -r --interactive=never -- '/home/test1/data.txt.",
+            stdout="",
+            stderr="",
+        ),
+    ]
+
+
+def executed_tools(ssh_client):
+    return [
+        command.removeprefix("timeout 5 ").split(" ")[0]
+        for command in ssh_client.executed
+    ]
+
+
+async def test_upload_command(client, ssh_client):
+    async with ssh_client.mocked_output(mocked_upload()):
+
+        response = client.post(
+            "/filesystem/cluster-slurm-ssh/ops/upload?path={path}".format(
+                path="/home/test1"
+            ),
+            files={"file": ("data.txt", b"Lorem ipsum dolor sit amet\n")},
+        )
+        assert response.status_code == 204
+        assert executed_tools(ssh_client) == ["dd", "cp", "rm"]
+        assert ssh_client.executed[1].endswith("'/home/test1/data.txt'")
+
+
+async def test_upload_command_failed(client, ssh_client):
+    # The partial file is removed, the target is never touched
+    async with ssh_client.mocked_output(
+        [
+            MockedCommand(
+                command="dd of='/home/test1/data.txt.",
+                stdout="",
+                stderr="dd: failed to open '/home/test1/data.txt': Permission denied",
+                exit_code=1,
+                swalllow_stdin=True,
+            ),
+            MockedCommand(
+                command="rm -r --interactive=never -- '/home/test1/data.txt.",
+                stdout="",
+                stderr="",
+            ),
+        ]
+    ):
+
+        response = client.post(
+            "/filesystem/cluster-slurm-ssh/ops/upload?path={path}".format(
+                path="/home/test1"
+            ),
+            files={"file": ("data.txt", b"Lorem ipsum dolor sit amet\n")},
+        )
+        assert response.status_code == 403
+        assert executed_tools(ssh_client) == ["dd", "rm"]
+
+
+async def test_upload_command_directory_target(client, ssh_client):
+    async with ssh_client.mocked_output(
+        mocked_upload(
+            stderr="cp: cannot overwrite directory '/home/test1/data.txt' with non-directory",
+            exit_code=1,
+        )
+    ):
+
+        response = client.post(
+            "/filesystem/cluster-slurm-ssh/ops/upload?path={path}".format(
+                path="/home/test1"
+            ),
+            files={"file": ("data.txt", b"Lorem ipsum dolor sit amet\n")},
+        )
+        assert response.status_code == 400
+        assert executed_tools(ssh_client) == ["dd", "cp", "rm"]
+
+
+async def test_upload_command_too_large(client, ssh_client):
+    response = client.post(
+        "/filesystem/cluster-slurm-ssh/ops/upload?path={path}".format(
+            path="/home/test1"
+        ),
+        files={"file": ("data.big", b"0" * (2 * 1024 * 1024))},
+    )
+    assert response.status_code == 413
+
+
 async def test_rm_command(client, ssh_client, mocked_ssh_rm_output):
 
     async with ssh_client.mocked_output([MockedCommand(**mocked_ssh_rm_output)]):
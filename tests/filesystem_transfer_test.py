@@ -5,6 +5,7 @@
 
 # Add src folder to python paths
 import json
+from urllib.parse import parse_qs, urlsplit
 
 from firecrest.filesystem.transfer.models import (
     CopyResponse,
@@ -17,6 +18,8 @@ from firecrest.filesystem.transfer.models import (
 )
 
 from importlib import resources as impresources
+from firecrest.filesystem.transfer import router as transfer_router
+from firecrest.plugins import settings
 from tests import mocked_api_responses
 
 import pytest
@@ -139,6 +142,81 @@ async def test_upload(
         stubber.deactivate()
 
 
+@pytest.mark.asyncio
+async def test_upload_paged_part_urls(
+    client,
+    s3_client,
+    ssh_client,
+    slurm_cluster_with_api_config,
+    mocked_job_submit_response,
+    mocked_create_bucket_response,
+    mocked_create_multipart_upload,
+    mocked_put_bucket_lifecycle_configuration,
+    mocked_ssh_id_output,
+    monkeypatch,
+):
+    multipart = settings.storage.multipart
+    monkeypatch.setattr(multipart, "max_part_urls", 2)
+    request_body = {
+        "path": "/home/test1/",
+        "account": "fireuser",
+        "fileName": "data.big",
+        "fileSize": str(5 * multipart.max_part_size),
+    }
+    with Stubber(s3_client) as stubber:
+        stubber.add_response("create_bucket", mocked_create_bucket_response)
+        stubber.add_response(
+            "put_bucket_lifecycle_configuration",
+            mocked_put_bucket_lifecycle_configuration,
+        )
+        stubber.add_response(
+            "create_multipart_upload", mocked_create_multipart_upload
+        )
+        stubber.activate()
+        with aioresponses() as mocked:
+            mocked.post(
+                f"{slurm_cluster_with_api_config.scheduler.api_url}/slurm/v{slurm_cluster_with_api_config.scheduler.api_version}/job/submit",
+                status=200,
+                body=json.dumps(mocked_job_submit_response),
+            )
+            async with ssh_client.mocked_output(
+                [MockedCommand(**mocked_ssh_id_output)]
+            ):
+                response = client.post(
+                    f"/filesystem/{slurm_cluster_with_api_config.name}/transfer/upload",
+                    json=request_body,
+                )
+        stubber.deactivate()
+
+    assert response.status_code == 201
+    upload = UploadFileResponse(**response.json())
+    assert len(upload.parts_upload_urls) == 2
+    assert upload.num_parts == 5
+    assert upload.next_parts_cursor == "3"
+
+    # The remaining part URLs are requested page by page
+    urls = list(upload.parts_upload_urls)
+    cursor = upload.next_parts_cursor
+    while cursor is not None:
+        response = client.get(
+            f"/filesystem/{slurm_cluster_with_api_config.name}/transfer/upload/parts",
+            params={
+                "objectKey": upload.object_key,
+                "uploadId": upload.upload_id,
+                "numParts": upload.num_parts,
+                "cursor": cursor,
+                "limit": 2,
+            },
+        )
+        assert response.status_code == 200
+        urls += response.json()["partsUploadUrls"]
+        cursor = response.json()["nextCursor"]
+
+    assert [
+        int(url.split("partNumber=")[1].split("&")[0]) for url in urls
+    ] == [1, 2, 3, 4, 5]
+
+
 @pytest.mark.asyncio
 async def test_download(
     client,
@@ -424,3 +502,182 @@ async def test_extract(
 
         assert compress.transfer_job.job_id == mocked_job_submit_response["job_id"]
         assert compress.transfer_job.system == slurm_cluster_with_api_config.name
+
+
+@pytest.mark.asyncio
+async def test_s3_clients_shared():
+    from firecrest.dependencies import S3ClientConnectionType, S3ClientDependency
+
+    try:
+        await S3ClientDependency.open_s3_clients()
+        private_client = await S3ClientDependency(
+            connection=S3ClientConnectionType.private
+        )()
+        public_client = await S3ClientDependency(
+            connection=S3ClientConnectionType.public
+        )()
+        # One client per endpoint, reused by every request
+        assert private_client is not public_client
+        assert private_client is await S3ClientDependency(
+            connection=S3ClientConnectionType.private
+        )()
+        assert len(S3ClientDependency.clients) == 2
+        assert (
+            private_client.meta.config.max_pool_connections
+            == settings.storage.max_pool_connections
+        )
+    finally:
+        await S3ClientDependency.close_s3_clients()
+    assert S3ClientDependency.clients == {}
+
+
+@pytest.mark.asyncio
+async def test_upload_known_bucket(
+    client,
+    s3_client,
+    ssh_client,
+    slurm_cluster_with_api_config,
+    mocked_job_submit_response,
+    mocked_create_bucket_response,
+    mocked_create_multipart_upload,
+    mocked_put_bucket_lifecycle_configuration,
+    mocked_ssh_id_output,
+):
+
+    request_body = {
+        "path": "/home/test1/",
+        "account": "fireuser",
+        "fileName": "data.big",
+        "fileSize": "100000",
+    }
+    url = f"/filesystem/{slurm_cluster_with_api_config.name}/transfer/upload"
+    submit_url = f"{slurm_cluster_with_api_config.scheduler.api_url}/slurm/v{slurm_cluster_with_api_config.scheduler.api_version}/job/submit"
+    with Stubber(s3_client) as stubber:
+        # First upload creates the bucket
+        stubber.add_response("create_bucket", mocked_create_bucket_response)
+        stubber.add_response(
+            "put_bucket_lifecycle_configuration",
+            mocked_put_bucket_lifecycle_configuration,
+        )
+        stubber.add_response("create_multipart_upload", mocked_create_multipart_upload)
+        # Second upload skips the bucket management calls
+        stubber.add_response("create_multipart_upload", mocked_create_multipart_upload)
+        # Third upload finds the bucket deleted and creates it again
+        stubber.add_client_error(
+            "create_multipart_upload", service_error_code="NoSuchBucket"
+        )
+        stubber.add_response("create_bucket", mocked_create_bucket_response)
+        stubber.add_response(
+            "put_bucket_lifecycle_configuration",
+            mocked_put_bucket_lifecycle_configuration,
+        )
+        stubber.add_response("create_multipart_upload", mocked_create_multipart_upload)
+
+        with aioresponses() as mocked:
+            mocked.post(
+                submit_url,
+                status=200,
+                body=json.dumps(mocked_job_submit_response),
+                repeat=True,
+            )
+            for _ in range(3):
+                async with ssh_client.mocked_output(
+                    [
+                        MockedCommand(**mocked_ssh_id_output),
+                    ]
+                ):
+                    response = client.post(url, json=request_body)
+                assert response.status_code == 201
+        stubber.assert_no_pending_responses()
+
+
+@pytest.mark.asyncio
+async def test_upload_owned_bucket_lifecycle(
+    client,
+    s3_client,
+    ssh_client,
+    slurm_cluster_with_api_config,
+    mocked_job_submit_response,
+    mocked_create_multipart_upload,
+    mocked_put_bucket_lifecycle_configuration,
+    mocked_ssh_id_output,
+):
+
+    request_body = {
+        "path": "/home/test1/",
+        "account": "fireuser",
+        "fileName": "data.big",
+        "fileSize": "100000",
+    }
+    url = f"/filesystem/{slurm_cluster_with_api_config.name}/transfer/upload"
+    submit_url = f"{slurm_cluster_with_api_config.scheduler.api_url}/slurm/v{slurm_cluster_with_api_config.scheduler.api_version}/job/submit"
+    lifecycle = settings.storage.bucket_lifecycle_configuration.to_json()
+    with Stubber(s3_client) as stubber:
+        # Existing bucket without lifecycle: the lifecycle is set
+        stubber.add_client_error(
+            "create_bucket", service_error_code="BucketAlreadyOwnedByYou"
+        )
+        stubber.add_client_error(
+            "get_bucket_lifecycle_configuration",
+            service_error_code="NoSuchLifecycleConfiguration",
+        )
+        stubber.add_response(
+            "put_bucket_lifecycle_configuration",
+            mocked_put_bucket_lifecycle_configuration,
+        )
+        stubber.add_response("create_multipart_upload", mocked_create_multipart_upload)
+        # Existing bucket with the lifecycle: nothing to set
+        stubber.add_client_error(
+            "create_bucket", service_error_code="BucketAlreadyOwnedByYou"
+        )
+        stubber.add_response("get_bucket_lifecycle_configuration", lifecycle)
+        stubber.add_response("create_multipart_upload", mocked_create_multipart_upload)
+
+        with aioresponses() as mocked:
+            mocked.post(
+                submit_url,
+                status=200,
+                body=json.dumps(mocked_job_submit_response),
+                repeat=True,
+            )
+            for _ in range(2):
+                async with ssh_client.mocked_output(
+                    [
+                        MockedCommand(**mocked_ssh_id_output),
+                    ]
+                ):
+                    response = client.post(url, json=request_body)
+                assert response.status_code == 201
+                transfer_router.known_buckets.clear()
+        stubber.assert_no_pending_responses()
+
+
+@pytest.mark.asyncio
+async def test_part_upload_urls_signed_in_bulk(s3_client):
+    def unsigned(url):
+        # The signature and its timestamp differ from call to call
+        parts = urlsplit(url)
+        query = {
+            name: value
+            for name, value in parse_qs(parts.query).items()
+            if name not in ("X-Amz-Signature", "X-Amz-Date")
+        }
+        return parts.path, query
+
+    urls = await transfer_router._generate_part_upload_urls(
+        s3_client, "test-user", "object/data.big", "upload-id", range(1, 4)
+    )
+    expected = await transfer_router._generate_presigned_url(
+        s3_client,
+        "upload_part",
+        {
+            "Bucket": "test-user",
+            "Key": "object/data.big",
+            "UploadId": "upload-id",
+            "PartNumber": 2,
+        },
+    )
+
+    assert len(urls) == 3
+    assert unsigned(urls[1]) == unsigned(expected)
+    assert unsigned(urls[0]) != unsigned(urls[1])
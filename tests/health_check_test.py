@@ -38,7 +38,7 @@ class TokenDecoderMock(OIDCTokenAuth):
     def __init__(self):
         pass
 
-    def auth_from_token(self, access_token: str):
+    async def auth_from_token(self, access_token: str):
         decoded_token = {
             "clientId": "firecrest-api",
             "preferred_username": "service-account-firecrest-api",
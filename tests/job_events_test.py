@@ -0,0 +1,97 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from time import time
+
+from firecrest.compute import job_events
+from firecrest.compute.job_events import JobEventsPoller, format_event, stream_events
+
+
+def job(job_id, state):
+    return SimpleNamespace(job_id=job_id, status=SimpleNamespace(state=state))
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.polls = []
+        self.jobs = []
+
+    async def get_jobs(self, username, jwt_token):
+        self.polls.append((username, jwt_token))
+        return list(self.jobs)
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(JobEventsPoller, "pollers", {})
+    yield FakeScheduler()
+    JobEventsPoller.stop_pollers()
+
+
+async def test_transitions_are_published(scheduler):
+    scheduler.jobs = [job(1, "PENDING"), job(2, "RUNNING")]
+    queue = JobEventsPoller.subscribe("cluster", "user1", "token", scheduler, 60)
+    poller = JobEventsPoller.pollers[("cluster", "user1")]
+    await asyncio.sleep(0)
+    # The first poll records the current states
+    assert queue.empty()
+
+    scheduler.jobs = [job(1, "RUNNING"), job(2, "RUNNING"), job(3, "PENDING")]
+    await poller.poll()
+
+    events = [queue.get_nowait() for _ in range(queue.qsize())]
+    assert [(e["data"]["jobId"], e["data"]["previousState"]) for e in events] == [
+        (1, "PENDING"),
+        (3, None),
+    ]
+    assert format_event(events[0]).startswith('event: job\ndata: {"jobId": 1,')
+
+
+async def test_one_poller_per_user(scheduler):
+    queues = [
+        JobEventsPoller.subscribe("cluster", "user1", f"token{i}", scheduler, 60)
+        for i in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    assert len(JobEventsPoller.pollers) == 1
+    # Polls are done with the most recent token
+    assert scheduler.polls == [("user1", "token2")]
+
+    for queue in queues:
+        JobEventsPoller.unsubscribe("cluster", "user1", queue)
+    assert not JobEventsPoller.pollers
+
+
+async def test_slow_subscribers_are_dropped(scheduler, monkeypatch):
+    monkeypatch.setattr(job_events, "EVENTS_QUEUE_SIZE", 2)
+    slow = JobEventsPoller.subscribe("cluster", "user1", "token", scheduler, 60)
+    fast = JobEventsPoller.subscribe("cluster", "user1", "token", scheduler, 60)
+    poller = JobEventsPoller.pollers[("cluster", "user1")]
+
+    for i in range(3):
+        poller.publish({"event": "job", "data": {"jobId": i}})
+        if i < 2:
+            fast.get_nowait()
+
+    assert poller.subscribers == {fast}
+    events = [event async for event in stream_events(slow, None, 60)]
+    assert events[0].startswith("event: job")
+    assert events[-1].startswith("event: error")
+
+
+async def test_stream_ends_when_token_expires():
+    queue = asyncio.Queue()
+    queue.put_nowait({"event": "job", "data": {"jobId": 1}})
+
+    events = [event async for event in stream_events(queue, time() + 0.05, 60)]
+
+    assert events[0].startswith("event: job")
+    assert events[-1].startswith("event: expired")
@@ -20,7 +20,7 @@ class NoAuthSSHServer(asyncssh.SSHServer):
 
 
 @asynccontextmanager
-async def simple_ssh_server(handler, port=0):
+async def simple_ssh_server(handler, port=0, sftp_factory=None):
 
     private_key = asyncssh.generate_private_key("ssh-rsa")
     server = await asyncssh.create_server(
@@ -29,6 +29,7 @@ async def simple_ssh_server(handler, port=0):
         0,
         server_host_keys=[private_key],
         process_factory=handler,
+        sftp_factory=sftp_factory,
     )
     port = next(
         socket.getsockname()[1] for socket in server.sockets if socket.family == AF_INET
@@ -54,6 +55,7 @@ class MockedSSHClient(SSHClient):
 class MockSSHClientPool(SSHClientPool):
 
     commands: List[MockedCommand] = []
+    executed: List[str] = []
 
     def __init__(
         self,
@@ -63,14 +65,12 @@ class MockSSHClientPool(SSHClientPool):
         super().__init__(host, port)
 
     async def handler(self, process: asyncssh.SSHServerProcess):
-
-        for command in self.commands:
-            if command.swalllow_stdin:
-                await process.stdin.readline()
-                break
+        self.executed.append(process.command)
 
         for command in self.commands:
             if process.command.find(command.command) >= 0:
+                if command.swalllow_stdin:
+                    await process.stdin.readline()
                 process.stdout.write(command.stdout)
                 process.stderr.write(command.stderr)
                 process.exit(command.exit_code)
@@ -82,6 +82,7 @@ class MockSSHClientPool(SSHClientPool):
     @asynccontextmanager
     async def mocked_output(self, commands: List[MockedCommand]):
         self.commands = commands
+        self.executed = []
         yield
         self.commands.clear()
 
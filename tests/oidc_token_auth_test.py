@@ -0,0 +1,151 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+import base64
+import time
+
+import pytest
+from aioresponses import aioresponses
+from fastapi import HTTPException
+from jose import jwt
+from yarl import URL
+
+from lib.auth.authN.OIDC_token_auth import OIDCTokenAuth
+from lib.auth.authN.jwks_store import JWKSStore
+
+
+CERTS_URL = "http://idp.test/certs"
+
+
+def secret_key(kid: str, secret: str):
+    return {
+        "kty": "oct",
+        "alg": "HS256",
+        "kid": kid,
+        "k": base64.urlsafe_b64encode(secret.encode()).decode().rstrip("="),
+    }
+
+
+def signed_token(kid: str, secret: str):
+    claims = {"preferred_username": "test-user", "exp": int(time.time()) + 60}
+    return jwt.encode(claims, secret, algorithm="HS256", headers={"kid": kid})
+
+
+@pytest.fixture(autouse=True)
+async def jwks_stores(monkeypatch):
+    monkeypatch.setattr(JWKSStore, "stores", {})
+    yield
+    await JWKSStore.close_stores()
+
+
+async def test_keys_are_loaded_on_first_use():
+    with aioresponses() as mocked:
+        mocked.get(CERTS_URL, payload={"keys": [secret_key("k1", "secret-1")]})
+        auth = OIDCTokenAuth([CERTS_URL])
+        # Decoders with the same certificates share the keys
+        assert OIDCTokenAuth([CERTS_URL]).jwks_store is auth.jwks_store
+
+        token = signed_token("k1", "secret-1")
+        results = await asyncio.gather(*[auth.authenticate(token) for _ in range(5)])
+
+        assert all(result.username == "test-user" for result in results)
+        assert len(mocked.requests[("GET", URL(CERTS_URL))]) == 1
+
+
+async def test_unknown_key_refreshes_keys():
+    with aioresponses() as mocked:
+        mocked.get(CERTS_URL, payload={"keys": [secret_key("k1", "secret-1")]})
+        mocked.get(CERTS_URL, payload={"keys": [secret_key("k2", "secret-2")]})
+        auth = OIDCTokenAuth([CERTS_URL], min_refresh_interval=0)
+
+        await auth.authenticate(signed_token("k1", "secret-1"))
+        # Key rotation
+        auth_model = await auth.authenticate(signed_token("k2", "secret-2"))
+
+        assert auth_model.username == "test-user"
+        assert len(mocked.requests[("GET", URL(CERTS_URL))]) == 2
+
+
+async def test_unknown_key_refreshes_are_rate_limited():
+    with aioresponses() as mocked:
+        mocked.get(
+            CERTS_URL, payload={"keys": [secret_key("k1", "secret-1")]}, repeat=True
+        )
+        auth = OIDCTokenAuth([CERTS_URL], min_refresh_interval=60)
+        await auth.authenticate(signed_token("k1", "secret-1"))
+
+        for _ in range(3):
+            with pytest.raises(HTTPException) as exc_info:
+                await auth.authenticate(signed_token("unknown", "secret"))
+            assert exc_info.value.status_code == 401
+
+        assert len(mocked.requests[("GET", URL(CERTS_URL))]) == 1
+
+
+async def test_failed_refresh_keeps_keys():
+    with aioresponses() as mocked:
+        mocked.get(CERTS_URL, payload={"keys": [secret_key("k1", "secret-1")]})
+        mocked.get(CERTS_URL, status=500)
+        auth = OIDCTokenAuth([CERTS_URL])
+
+        await auth.authenticate(signed_token("k1", "secret-1"))
+        await JWKSStore.refresh_stores()
+
+        assert (await auth.authenticate(signed_token("k1", "secret-1"))).is_active()
+
+
+async def test_verified_tokens_are_cached(monkeypatch):
+    with aioresponses() as mocked:
+        mocked.get(
+            CERTS_URL,
+            payload={"keys": [secret_key("k1", "secret-1")]},
+            repeat=True,
+        )
+        auth = OIDCTokenAuth([CERTS_URL], token_cache_size=2)
+        decode_calls = []
+        decode = jwt.decode
+        monkeypatch.setattr(
+            jwt,
+            "decode",
+            lambda **kwargs: decode_calls.append(1) or decode(**kwargs),
+        )
+
+        token = signed_token("k1", "secret-1")
+        first = await auth.authenticate(token)
+        assert await auth.authenticate(token) is first
+        assert len(decode_calls) == 1
+
+        # The least recently used token is evicted
+        other_tokens = [
+            jwt.encode(
+                {"preferred_username": f"user{i}", "exp": int(time.time()) + 60},
+                "secret-1",
+                algorithm="HS256",
+                headers={"kid": "k1"},
+            )
+            for i in range(2)
+        ]
+        for other_token in other_tokens:
+            await auth.authenticate(other_token)
+        assert await auth.authenticate(token) is not first
+
+        assert auth.cache_stats() == {"size": 2, "max_size": 2, "hits": 1, "misses": 4}
+
+
+async def test_expired_cached_tokens_are_verified(monkeypatch):
+    with aioresponses() as mocked:
+        mocked.get(CERTS_URL, payload={"keys": [secret_key("k1", "secret-1")]})
+        auth = OIDCTokenAuth([CERTS_URL])
+        token = signed_token("k1", "secret-1")
+        await auth.authenticate(token)
+        assert auth.cache_stats()["size"] == 1
+
+        monkeypatch.setattr(
+            "lib.auth.authN.OIDC_token_auth.time", lambda: time.time() + 120
+        )
+        await auth.authenticate(token)
+        assert auth.cache_stats()["hits"] == 0
+        assert auth.cache_stats()["misses"] == 2
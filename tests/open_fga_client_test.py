@@ -0,0 +1,89 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+
+import pytest
+from aioresponses import aioresponses
+from fastapi import HTTPException
+from yarl import URL
+
+from lib.auth.authZ.open_fga_client import OpenFGAClient
+
+
+FGA_URL = "http://openfga.test/stores/1/check"
+
+
+@pytest.fixture
+async def fga_client():
+    yield OpenFGAClient(FGA_URL, timeout=1, cache_ttl=60, negative_cache_ttl=60)
+    await OpenFGAClient.close_aiohttp_client()
+
+
+def checks(mocked):
+    return len(mocked.requests.get(("POST", URL(FGA_URL)), []))
+
+
+async def test_concurrent_checks_share_one_request(fga_client):
+    with aioresponses() as mocked:
+        mocked.post(FGA_URL, status=200, payload={"allowed": True})
+
+        await asyncio.gather(
+            *[fga_client.authorize("user1", "cluster", "token") for _ in range(5)]
+        )
+        # Cached decision
+        await fga_client.authorize("user1", "cluster", "token")
+
+        assert checks(mocked) == 1
+
+
+async def test_denied_access_is_cached(fga_client):
+    with aioresponses() as mocked:
+        mocked.post(FGA_URL, status=200, payload={"allowed": False})
+
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                await fga_client.authorize("user1", "cluster", "token")
+            assert exc_info.value.status_code == 403
+
+        assert checks(mocked) == 1
+
+
+async def test_decisions_expire(fga_client):
+    fga_client.cache_ttl = 0
+    with aioresponses() as mocked:
+        mocked.post(FGA_URL, status=200, payload={"allowed": True}, repeat=True)
+
+        await fga_client.authorize("user1", "cluster", "token")
+        await fga_client.authorize("user1", "cluster", "token")
+        await fga_client.authorize("user1", "other-cluster", "token")
+
+        assert checks(mocked) == 3
+
+
+async def test_failed_checks_are_not_cached(fga_client):
+    with aioresponses() as mocked:
+        mocked.post(FGA_URL, exception=TimeoutError())
+        mocked.post(FGA_URL, status=200, payload={"allowed": True})
+
+        with pytest.raises(HTTPException) as exc_info:
+            await fga_client.authorize("user1", "cluster", "token")
+        assert exc_info.value.status_code == 401
+
+        await fga_client.authorize("user1", "cluster", "token")
+        assert checks(mocked) == 2
+
+
+async def test_error_responses_are_not_cached(fga_client):
+    with aioresponses() as mocked:
+        mocked.post(FGA_URL, status=503)
+        mocked.post(FGA_URL, status=200, payload={"allowed": True})
+
+        with pytest.raises(HTTPException) as exc_info:
+            await fga_client.authorize("user1", "cluster", "token")
+        assert exc_info.value.status_code == 401
+
+        await fga_client.authorize("user1", "cluster", "token")
+        assert checks(mocked) == 2
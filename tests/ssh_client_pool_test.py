@@ -0,0 +1,205 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+
+import pytest
+
+from lib.ssh_clients import ssh_client as ssh_client_module
+from lib.ssh_clients.ssh_client import (
+    SSHClientPool,
+    SSHConnectionError,
+    TimeoutLimitExceeded,
+)
+
+
+class FakeConnection:
+
+    def __init__(self, username: str):
+        self.username = username
+        self.extra_info = {}
+        self.closed = False
+
+    def set_keepalive(self, interval, count_max):
+        pass
+
+    def set_extra_info(self, **kwargs):
+        self.extra_info.update(kwargs)
+
+    def get_extra_info(self, key):
+        return self.extra_info.get(key)
+
+    def close(self):
+        self.closed = True
+
+    def is_closed(self):
+        return self.closed
+
+
+@pytest.fixture
+def connect_calls(monkeypatch):
+    calls = []
+    delays = {}
+
+    async def fake_conn_options(self, username, jwt_token):
+        return username
+
+    async def fake_connect(host, port, options, tunnel):
+        calls.append(options)
+        await asyncio.sleep(delays.get(options, 0.01))
+        return FakeConnection(options)
+
+    monkeypatch.setattr(SSHClientPool, "get_conn_options", fake_conn_options)
+    monkeypatch.setattr(ssh_client_module.asyncssh, "connect", fake_connect)
+    return calls, delays
+
+
+async def use_client_once(pool: SSHClientPool, username: str):
+    async with pool.get_client(username, "token") as client:
+        return client
+
+
+async def test_concurrent_requests_share_one_connect(connect_calls):
+    calls, _ = connect_calls
+    pool = SSHClientPool(host="localhost", port=22)
+
+    async def use_client():
+        async with pool.get_client("user1", "token") as client:
+            return client
+
+    clients = await asyncio.gather(*[use_client() for _ in range(10)])
+
+    assert calls == ["user1"]
+    assert all(client is clients[0] for client in clients)
+    assert len(pool.connecting) == 0
+
+
+async def test_slow_user_does_not_block_other_users(connect_calls):
+    _, delays = connect_calls
+    delays["slow-user"] = 1
+    pool = SSHClientPool(host="localhost", port=22)
+
+    async def use_client(username):
+        async with pool.get_client(username, "token") as client:
+            return client
+
+    slow = asyncio.create_task(use_client("slow-user"))
+    await asyncio.sleep(0)
+
+    fast = await asyncio.wait_for(use_client("fast-user"), timeout=0.5)
+    assert fast.conn.username == "fast-user"
+    assert not slow.done()
+
+    await slow
+
+
+async def test_saturated_client_opens_new_connection(connect_calls):
+    calls, _ = connect_calls
+    pool = SSHClientPool(
+        host="localhost", port=22, max_clients_per_user=2, max_channels_per_client=2
+    )
+    release = asyncio.Event()
+
+    async def use_client():
+        async with pool.get_client("user1", "token") as client:
+            await release.wait()
+            return client
+
+    tasks = [asyncio.create_task(use_client()) for _ in range(4)]
+    await asyncio.sleep(0.1)
+
+    assert calls == ["user1", "user1"]
+    stats = pool.stats()
+    assert stats["clients"] == 2
+    assert stats["open_channels"] == 4
+    assert stats["max_channels"] == 4
+
+    release.set()
+    clients = await asyncio.gather(*tasks)
+    assert len({id(client) for client in clients}) == 2
+    assert pool.stats()["open_channels"] == 0
+
+
+async def test_saturated_pool_queues_requests(connect_calls):
+    pool = SSHClientPool(
+        host="localhost",
+        port=22,
+        max_clients_per_user=1,
+        max_channels_per_client=1,
+        queue_timeout=1,
+    )
+    release = asyncio.Event()
+
+    async def hold_client():
+        async with pool.get_client("user1", "token"):
+            await release.wait()
+
+    holder = asyncio.create_task(hold_client())
+    await asyncio.sleep(0.1)
+
+    queued = asyncio.create_task(use_client_once(pool, "user1"))
+    await asyncio.sleep(0.1)
+    assert pool.stats()["waiting"] == 1
+
+    release.set()
+    await holder
+    await asyncio.wait_for(queued, timeout=0.5)
+    assert pool.stats()["waiting"] == 0
+
+
+async def test_saturated_pool_queue_timeout(connect_calls):
+    pool = SSHClientPool(
+        host="localhost",
+        port=22,
+        max_clients_per_user=1,
+        max_channels_per_client=1,
+        queue_timeout=0.1,
+    )
+    release = asyncio.Event()
+
+    async def hold_client():
+        async with pool.get_client("user1", "token"):
+            await release.wait()
+
+    holder = asyncio.create_task(hold_client())
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(TimeoutLimitExceeded):
+        await use_client_once(pool, "user1")
+
+    release.set()
+    await holder
+
+
+async def test_full_pool_evicts_lru_idle_client(connect_calls):
+    pool = SSHClientPool(host="localhost", port=22, max_clients=2)
+
+    oldest = await use_client_once(pool, "user1")
+    await asyncio.sleep(0.01)
+    await use_client_once(pool, "user2")
+    await use_client_once(pool, "user3")
+
+    assert oldest.is_closed()
+    assert sorted(pool.clients.keys()) == ["user2", "user3"]
+    assert pool.stats()["evictions"] == 1
+
+
+async def test_full_pool_with_busy_clients_fails(connect_calls):
+    pool = SSHClientPool(host="localhost", port=22, max_clients=1)
+    release = asyncio.Event()
+
+    async def hold_client():
+        async with pool.get_client("user1", "token"):
+            await release.wait()
+
+    holder = asyncio.create_task(hold_client())
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(SSHConnectionError):
+        await use_client_once(pool, "user2")
+    assert pool.stats()["evictions"] == 0
+
+    release.set()
+    await holder
@@ -0,0 +1,85 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from firecrest.filesystem.ops.commands.batch_command import BatchCommand
+from firecrest.filesystem.ops.commands.dd_command import DdCommand
+from firecrest.filesystem.ops.commands.rm_command import RmCommand
+from firecrest.filesystem.ops.commands.view_command import ViewCommand
+from tests.mock_ssh_client import MockedCommand
+
+
+async def test_execute_stream(ssh_client):
+    content = "0123456789" * 1000
+    view = ViewCommand("/home/user/file.txt")
+
+    async with ssh_client.mocked_output(
+        [MockedCommand(command="head", stdout=content, stderr="")]
+    ):
+        async with ssh_client.get_client("test-user", "token") as client:
+            chunks = [
+                chunk async for chunk in client.execute_stream(view, chunk_size=1024)
+            ]
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1024 for chunk in chunks)
+    assert b"".join(chunks).decode() == content
+
+
+async def test_execute_stream_error(ssh_client):
+    view = ViewCommand("/home/user/missing.txt")
+
+    async with ssh_client.mocked_output(
+        [
+            MockedCommand(
+                command="head",
+                stdout="",
+                stderr="head: cannot open '/home/user/missing.txt' for reading: No such file or directory",
+                exit_code=1,
+            )
+        ]
+    ):
+        async with ssh_client.get_client("test-user", "token") as client:
+            with pytest.raises(HTTPException) as exc_info:
+                async for _chunk in client.execute_stream(view):
+                    pass
+
+    assert exc_info.value.status_code == 404
+
+
+async def test_execute_timeout_scales_with_batch_size(ssh_client):
+    batch = BatchCommand([RmCommand(f"/home/user/file{i}") for i in range(3)])
+
+    async with ssh_client.get_client("test-user", "token") as client:
+        assert client._execute_timeout(batch) == 3 * client.execute_timeout
+        assert client._execute_timeout(RmCommand("/home/user/file")) == (
+            client.execute_timeout
+        )
+
+
+async def test_execute_stream_slow_consumer(ssh_client):
+    # The timeout applies to reading each chunk, not to the whole stream
+    content = "0123456789" * 1000
+    read = DdCommand("/home/user/file.txt")
+
+    async with ssh_client.mocked_output(
+        [MockedCommand(command="dd if=", stdout=content, stderr="")]
+    ):
+        async with ssh_client.get_client("test-user", "token") as client:
+            client.execute_timeout = 0.2
+            chunks = []
+            async for chunk in client.execute_stream(read, chunk_size=2048):
+                chunks.append(chunk)
+                await asyncio.sleep(0.1)
+
+        assert ssh_client.executed == [read.get_command()]
+
+    assert len(chunks) > 2
+    assert b"".join(chunks).decode() == content
+    assert not read.get_command().startswith("timeout")
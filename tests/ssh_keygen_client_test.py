@@ -0,0 +1,82 @@
+# Copyright (c) 2025, ETH Zurich. All rights reserved.
+#
+# Please, refer to the LICENSE file in the root directory.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import asyncio
+from time import time
+
+import asyncssh
+import pytest
+
+from lib.ssh_clients.ssh_keygen_client import SSHKeygenClient
+
+
+def signed_keys(validity: int):
+    ca_key = asyncssh.generate_private_key("ssh-ed25519")
+    user_key = asyncssh.generate_private_key("ssh-ed25519")
+    certificate = ca_key.generate_user_certificate(
+        user_key, "test-user", valid_after=0, valid_before=int(time()) + validity
+    )
+    return {
+        "private": user_key.export_private_key().decode(),
+        "public": certificate.export_certificate().decode(),
+        "passphrase": None,
+    }
+
+
+@pytest.fixture
+def sign_calls(monkeypatch):
+    calls = []
+    validity = {"seconds": 60}
+
+    async def fake_sign_keys(self, jwt_token):
+        calls.append(jwt_token)
+        await asyncio.sleep(0.01)
+        return signed_keys(validity["seconds"])
+
+    monkeypatch.setattr(SSHKeygenClient, "_sign_keys", fake_sign_keys)
+    monkeypatch.setattr(SSHKeygenClient, "keys_cache", {})
+    monkeypatch.setattr(SSHKeygenClient, "pending", {})
+    return calls, validity
+
+
+async def test_keys_are_cached_until_near_expiry(sign_calls):
+    calls, _ = sign_calls
+    keygen = SSHKeygenClient("http://localhost")
+
+    keys = await asyncio.gather(*[keygen.get_keys("user1", "token") for _ in range(5)])
+
+    assert calls == ["token"]
+    assert all(key is keys[0] for key in keys)
+    assert await keygen.get_keys("user1", "token") is keys[0]
+    assert len(calls) == 1
+
+
+async def test_keys_near_expiry_are_refreshed_in_background(sign_calls):
+    calls, validity = sign_calls
+    keygen = SSHKeygenClient("http://localhost")
+
+    validity["seconds"] = 15
+    first = await keygen.get_keys("user1", "token")
+
+    validity["seconds"] = 60
+    # Still valid: returned straight away while a new certificate is signed
+    assert await keygen.get_keys("user1", "token") is first
+    await asyncio.sleep(0.05)
+
+    refreshed = await keygen.get_keys("user1", "token")
+    assert refreshed is not first
+    assert len(calls) == 2
+
+
+async def test_expiring_keys_are_not_used(sign_calls):
+    calls, validity = sign_calls
+    keygen = SSHKeygenClient("http://localhost")
+
+    validity["seconds"] = 2
+    first = await keygen.get_keys("user1", "token")
+
+    validity["seconds"] = 60
+    assert await keygen.get_keys("user1", "token") is not first
+    assert len(calls) == 2
@@ -22,8 +22,12 @@ from tests import mock_ssh_client
 import pytest
 from aioresponses import aioresponses
 
-from firecrest.config import HPCCluster, Scheduler
+from firecrest.config import HPCCluster, Scheduler, StatusSnapshots as SnapshotsConfig
+from firecrest.plugins import settings
+from firecrest.status.status_snapshots import StatusSnapshots
+from pytest_httpx import HTTPXMock
 from tests.filesystem_ops_test import load_ssh_output
+from tests.health_check_test import TokenDecoderMock, mocked_token_response
 
 
 @pytest.fixture(scope="module")
@@ -194,6 +198,60 @@ def test_systems_reservations(
         )
 
 
+async def test_systems_status_snapshots(
+    client,
+    monkeypatch,
+    httpx_mock: HTTPXMock,
+    mocked_get_nodes_response,
+    mocked_get_partitions_response,
+    mocked_get_resrvations_response,
+    slurm_cluster_with_api_config,
+):
+    cluster = slurm_cluster_with_api_config
+    monkeypatch.setattr(cluster, "status_snapshots", SnapshotsConfig())
+    monkeypatch.setattr(StatusSnapshots, "snapshots", {})
+    httpx_mock.add_response(
+        url=settings.auth.authentication.token_url, json=mocked_token_response()
+    )
+    api_url = f"{cluster.scheduler.api_url}/slurm/v{cluster.scheduler.api_version}"
+
+    with aioresponses() as mocked:
+        mocked.get(f"{api_url}/nodes", body=json.dumps(mocked_get_nodes_response))
+        mocked.get(
+            f"{api_url}/partitions", body=json.dumps(mocked_get_partitions_response)
+        )
+        mocked.get(
+            f"{api_url}/reservations", body=json.dumps(mocked_get_resrvations_response)
+        )
+        await StatusSnapshots(cluster, token_decoder=TokenDecoderMock()).refresh()
+        headers = [request[0].kwargs["headers"] for request in mocked.requests.values()]
+        assert all(
+            header["X-SLURM-USER-NAME"] == "service-account-firecrest-api"
+            for header in headers
+        )
+
+    # Served from memory, without calling the scheduler
+    with aioresponses() as mocked:
+        response = client.get(f"/status/{cluster.name}/nodes")
+        assert response.status_code == 200
+        assert response.headers["Age"] == "0"
+        assert len(GetNodesResponse(**response.json()).nodes) == 1
+
+        response = client.get(f"/status/{cluster.name}/partitions")
+        assert len(GetPartitionsResponse(**response.json()).partitions) == 3
+
+        response = client.get(f"/status/{cluster.name}/reservations")
+        assert len(GetReservationsResponse(**response.json()).reservations) == 1
+        assert len(mocked.requests) == 0
+
+    with aioresponses() as mocked:
+        mocked.get(f"{api_url}/nodes", body=json.dumps(mocked_get_nodes_response))
+        response = client.get(f"/status/{cluster.name}/nodes?fresh=true")
+        assert response.status_code == 200
+        assert "Age" not in response.headers
+        assert len(mocked.requests) == 1
+
+
 async def test_userinfo(
     client, ssh_client, mocked_ssh_id_recursive_output, slurm_cluster_with_ssh_config
 ):